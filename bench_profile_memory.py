@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Profile memory benchmark
+========================
+
+Compares the memory held by profiles loaded as plain JSON dicts against the
+compact ``ProfileRecord`` representation, using synthetic corpora.
+
+Usage:
+    python bench_profile_memory.py [--sizes 1000 10000 100000] [--json out.json]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from profile_store import ProfileRecord
+from synthetic_profiles import generate_profiles
+
+
+def measure(load):
+    """Return (bytes held, result) for the objects built by ``load``"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = load()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dict and compact record memory use")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        # Serialize first so both variants are built from fresh, un-interned strings
+        raw = json.dumps(generate_profiles(size))
+
+        dict_bytes, dicts = measure(lambda: json.loads(raw))
+        del dicts
+        record_bytes, records = measure(lambda: [ProfileRecord(p) for p in json.loads(raw)])
+        del records
+
+        saving = 1 - record_bytes / dict_bytes if dict_bytes else 0.0
+        results.append({
+            "profiles": size,
+            "dict_bytes": dict_bytes,
+            "record_bytes": record_bytes,
+            "saving": saving,
+        })
+        print(f"📊 {size:>7} profiles: dicts {dict_bytes / 1e6:8.1f} MB   "
+              f"records {record_bytes / 1e6:8.1f} MB   saving {saving:.0%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
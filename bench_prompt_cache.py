@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Prompt prefix / keep-alive benchmark
+====================================
+
+Measures time-to-first-token against a running Ollama daemon for two setups:
+
+* ``baseline``  - model unloaded after every call (keep_alive=0) and the
+  per-request text placed before the instructions, so no prefix is shared,
+* ``optimized`` - model kept resident and the static instruction block sent
+  first, byte-identical on every request (what the web app now does).
+
+Usage:
+    python bench_prompt_cache.py [--model llama3.2:1b] [--rounds 5] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+
+from ollama_client import OllamaClient
+
+QUESTIONS = [
+    "Who has Python skills?",
+    "Who knows machine learning?",
+    "Who works at NxtGen Cloud Technologies?",
+    "Find people with cloud computing experience",
+    "Who studied at Dayananda Sagar University?",
+]
+
+
+def load_prompt_prefix():
+    """Read the static prefix from the web app source without importing it"""
+    source_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linkedin_rag_webapp.py")
+    with open(source_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    start = source.index('QA_PROMPT_PREFIX = """') + len('QA_PROMPT_PREFIX = """')
+    end = source.index('"""', start)
+    return source[start:end]
+
+
+def load_contexts(json_path, count):
+    with open(json_path, "r", encoding="utf-8") as f:
+        profiles = json.load(f)
+    contexts = []
+    for i in range(count):
+        profile = profiles[i % len(profiles)] if profiles else {}
+        contexts.append(f"[{profile.get('name', 'Unknown')}]\n{profile.get('about') or ''}")
+    return contexts
+
+
+def run(client, prompts):
+    first_token, total = [], []
+    for prompt in prompts:
+        timing = client.timed_generate(prompt)
+        first_token.append(timing["first_token_seconds"])
+        total.append(timing["total_seconds"])
+    return {
+        "first_token_p50": statistics.median(first_token),
+        "first_token_mean": statistics.mean(first_token),
+        "total_p50": statistics.median(total),
+        "samples": len(prompts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark first-token latency of the QA prompt layout")
+    parser.add_argument("--model", default=os.environ.get("OLLAMA_MODEL", "llama3.2:1b"))
+    parser.add_argument("--base-url", default=os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434"))
+    parser.add_argument("--data", default="linkedin_profiless_ls3.json")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    prefix = load_prompt_prefix()
+    contexts = load_contexts(args.data, args.rounds)
+    questions = [QUESTIONS[i % len(QUESTIONS)] for i in range(args.rounds)]
+
+    baseline_prompts = [
+        f"Context: {c}\n\nQuestion: {q}\n\n{prefix}Answer:" for c, q in zip(contexts, questions)
+    ]
+    optimized_prompts = [
+        f"{prefix}Context: {c}\n\nQuestion: {q}\n\nAnswer:" for c, q in zip(contexts, questions)
+    ]
+
+    print(f"🔧 Benchmarking {args.model} at {args.base_url} ({args.rounds} rounds)")
+
+    baseline_client = OllamaClient(args.model, args.base_url, keep_alive=0, timeout=300)
+    baseline = run(baseline_client, baseline_prompts)
+
+    optimized_client = OllamaClient(args.model, args.base_url, keep_alive="30m", timeout=300)
+    optimized_client.load()
+    optimized = run(optimized_client, optimized_prompts)
+
+    results = {"model": args.model, "baseline": baseline, "optimized": optimized}
+    for name in ("baseline", "optimized"):
+        r = results[name]
+        print(f"  {name:9s} first token p50 {r['first_token_p50'] * 1000:8.1f} ms   total p50 {r['total_p50'] * 1000:8.1f} ms")
+    speedup = baseline["first_token_p50"] / max(optimized["first_token_p50"], 1e-9)
+    print(f"✅ First-token speedup: {speedup:.2f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Startup import-time benchmark
+=============================
+
+Runs ``python -X importtime -c "import linkedin_rag_webapp"`` in a fresh
+interpreter, prints the slowest top-level imports and fails (exit code 1) if
+
+* any heavy subsystem (langchain, chromadb, torch, selenium, ...) is imported
+  at startup, or
+* the total import time exceeds ``--max-ms``.
+
+Usage:
+    python bench_startup.py [--max-ms 1500] [--top 15] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+MODULE = "linkedin_rag_webapp"
+
+# Subsystems that must only be imported when first needed
+HEAVY_MODULES = (
+    "langchain", "langchain_community", "chromadb", "torch", "transformers",
+    "sentence_transformers", "selenium", "linkedin_scraper", "requests", "tiktoken",
+)
+
+LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure(module: str):
+    """Import ``module`` in a fresh interpreter and parse the -X importtime report"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000.0,
+                "cumulative_ms": int(cumulative_us) / 1000.0,
+                "depth": len(indent) // 2,
+            })
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard the web app's import time")
+    parser.add_argument("--max-ms", type=float, default=1500.0, help="Fail above this total import time")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to show")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    imports = measure(MODULE)
+    target = next((entry for entry in imports if entry["module"] == MODULE), None)
+    total_ms = target["cumulative_ms"] if target else sum(e["self_ms"] for e in imports)
+
+    top_level = sorted((e for e in imports if e["depth"] <= 1), key=lambda e: e["cumulative_ms"], reverse=True)
+    print(f"📊 import {MODULE}: {total_ms:.1f} ms total")
+    for entry in top_level[:args.top]:
+        print(f"  {entry['cumulative_ms']:9.1f} ms  {entry['module']}")
+
+    loaded = {entry["module"].split(".")[0] for entry in imports}
+    heavy_loaded = sorted(loaded.intersection(HEAVY_MODULES))
+
+    failures = []
+    if heavy_loaded:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy_loaded)}")
+    if total_ms > args.max_ms:
+        failures.append(f"import time {total_ms:.1f} ms exceeds budget of {args.max_ms:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "module": MODULE,
+                "total_ms": total_ms,
+                "heavy_modules": heavy_loaded,
+                "top_imports": top_level[:args.top],
+            }, f, indent=2)
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Startup import time within budget")
+
+
+if __name__ == "__main__":
+    main()
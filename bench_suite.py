@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+RAG benchmark suite
+===================
+
+Generates synthetic corpora in the ``linkedin_profiless_ls3.json`` schema and
+measures, per corpus size:
+
+* ``setup_vectorstore`` wall time, chunk count and peak RSS growth,
+* retrieval latency (p50/p99) for several ``k``,
+* ``_analyze_skills_by_section`` and ``get_profile_summary`` throughput,
+* end-to-end ``/api/query`` latency through the Flask app with a stub LLM.
+
+Results are written as JSON so runs can be compared over time. Embedding a
+100k-profile corpus with the default model takes a long time; pick sizes
+with ``--sizes``.
+
+Usage:
+    python bench_suite.py [--sizes 1000 10000 100000] [--k 1 3 5 10] [--json bench.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from synthetic_profiles import generate_profiles
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RETRIEVAL_QUESTIONS = [
+    "Who knows Python?",
+    "Which people have experience with machine learning and deep learning?",
+    "Who has worked at Infosys as a software engineer?",
+    "Find people with cloud computing and Kubernetes skills",
+    "Who studied at PES University?",
+    "Which candidates have built web applications with React.js and Flask?",
+]
+
+SKILL_QUESTIONS = [
+    "Who has Python skills?",
+    "Who knows machine learning?",
+    "Find people with AWS and Docker experience",
+    "Who can work with SQL?",
+]
+
+QUERY_QUESTIONS = RETRIEVAL_QUESTIONS + SKILL_QUESTIONS
+
+
+class StubLLM:
+    def __init__(self, latency: float = 0.05):
+        """Stands in for the Ollama client: sleeps ``latency`` seconds and returns a fixed answer"""
+        self.latency = latency
+        self.calls = 0
+
+    def invoke(self, prompt: str) -> str:
+        self.calls += 1
+        time.sleep(self.latency)
+        return "Based on the profiles, the best matches are listed above."
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_summary(seconds) -> dict:
+    ms = [s * 1000.0 for s in seconds]
+    return {
+        "count": len(ms),
+        "mean_ms": statistics.fmean(ms) if ms else 0.0,
+        "p50_ms": percentile(ms, 50),
+        "p99_ms": percentile(ms, 99),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 where unavailable)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def throughput(fn, items, min_seconds: float) -> dict:
+    """Call ``fn`` over ``items`` repeatedly for at least ``min_seconds``"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for item in items:
+            fn(item)
+            calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return {"calls": calls, "seconds": elapsed, "per_second": calls / elapsed}
+
+
+def bench_size(size: int, args, workdir: str) -> dict:
+    import linkedin_rag_webapp as webapp
+
+    json_path = os.path.join(workdir, f"synthetic_{size}.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(generate_profiles(size, seed=args.seed), f, ensure_ascii=False)
+
+    os.environ["CHROMA_DIR"] = os.path.join(workdir, f"chroma_{size}")
+    rag_app = webapp.LinkedInRAGApp(json_path)
+    rag_app.llm = StubLLM(args.llm_latency)
+    result = {"profiles": size}
+
+    # Index build (the embedding model is loaded first so only the build is timed)
+    rag_app._get_embeddings().embed_query("warm up")
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    if not rag_app.setup_vectorstore():
+        raise RuntimeError(f"setup_vectorstore failed for {size} profiles")
+    result["setup_vectorstore"] = {
+        "seconds": time.perf_counter() - start,
+        "chunks": rag_app.index_manager.active.chunk_count,
+        "peak_rss_growth_mb": peak_rss_mb() - rss_before,
+    }
+    rag_app.incremental_indexer.stop()
+    print(f"  🔧 setup_vectorstore: {result['setup_vectorstore']['seconds']:.1f}s, "
+          f"{result['setup_vectorstore']['chunks']} chunks")
+
+    # Retrieval latency by k (embedding the question included)
+    result["retrieval"] = {}
+    for k in args.k:
+        timings = []
+        for _ in range(args.repeats):
+            for question in RETRIEVAL_QUESTIONS:
+                start = time.perf_counter()
+                rag_app.vectorstore.similarity_search(question, k=k)
+                timings.append(time.perf_counter() - start)
+        result["retrieval"][str(k)] = latency_summary(timings)
+        print(f"  🔎 k={k}: p50 {result['retrieval'][str(k)]['p50_ms']:.1f} ms, "
+              f"p99 {result['retrieval'][str(k)]['p99_ms']:.1f} ms")
+
+    # CPU-side analysis throughput
+    result["skill_analysis"] = throughput(rag_app._analyze_skills_by_section, SKILL_QUESTIONS, args.min_seconds)
+    result["profile_summary"] = throughput(lambda _: rag_app.get_profile_summary(), [None], args.min_seconds)
+    print(f"  🧮 skill analysis {result['skill_analysis']['per_second']:.1f}/s, "
+          f"summary {result['profile_summary']['per_second']:.1f}/s")
+
+    # End to end through Flask with the stub LLM
+    webapp._rag_app = rag_app
+    client = webapp.app.test_client()
+    timings = []
+    modes = {}
+    errors = 0
+    for _ in range(args.repeats):
+        for question in QUERY_QUESTIONS:
+            start = time.perf_counter()
+            response = client.post("/api/query", json={"question": question})
+            timings.append(time.perf_counter() - start)
+            payload = response.get_json() or {}
+            if (response.status_code != 200 or not payload.get("success", True)
+                    or str(payload.get("answer", "")).startswith("❌")):
+                errors += 1
+            modes[payload.get("mode", "unknown")] = modes.get(payload.get("mode", "unknown"), 0) + 1
+    result["api_query"] = {**latency_summary(timings), "errors": errors, "modes": modes,
+                           "llm_latency_ms": args.llm_latency * 1000.0}
+    print(f"  🌐 /api/query: p50 {result['api_query']['p50_ms']:.1f} ms, "
+          f"p99 {result['api_query']['p99_ms']:.1f} ms, {errors} errors")
+
+    webapp._rag_app = None
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indexing, retrieval and querying on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--repeats", type=int, default=5, help="Passes over the question set per measurement")
+    parser.add_argument("--min-seconds", type=float, default=2.0, help="Minimum duration of throughput runs")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Stub LLM response time in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default="bench_results.json", help="Write results to this file")
+    args = parser.parse_args()
+
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"k": args.k, "repeats": args.repeats, "llm_latency": args.llm_latency, "seed": args.seed},
+        "results": [],
+    }
+
+    workdir = tempfile.mkdtemp(prefix="rag_bench_")
+    try:
+        for size in args.sizes:
+            print(f"📊 Benchmarking {size} profiles...")
+            report["results"].append(bench_size(size, args, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
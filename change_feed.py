@@ -0,0 +1,166 @@
+"""
+Profile change feed and incremental indexer
+===========================================
+
+The profile store publishes a change event (added / updated / removed
+profile ID, with a sequence number) whenever its contents change. The
+``IncrementalIndexer`` consumes the feed on a background thread in
+micro-batches and hands the affected profile IDs to an apply callback that
+re-embeds and upserts only their chunks, so new profiles become searchable
+seconds after a scrape without a full rebuild.
+
+Each index version remembers the last sequence number applied to it
+(``applied_seq``); a freshly built version starts from the sequence number it
+was snapshotted at, so changes made during a rebuild are replayed onto it.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+ADDED = "added"
+UPDATED = "updated"
+REMOVED = "removed"
+
+
+class ChangeEvent:
+    __slots__ = ("seq", "kind", "profile_id", "timestamp")
+
+    def __init__(self, seq: int, kind: str, profile_id: str):
+        self.seq = seq
+        self.kind = kind
+        self.profile_id = profile_id
+        self.timestamp = time.time()
+
+    def to_dict(self) -> Dict:
+        return {"seq": self.seq, "kind": self.kind, "profile_id": self.profile_id, "timestamp": self.timestamp}
+
+
+class ChangeFeed:
+    def __init__(self, max_events: int = 100000):
+        """An in-memory, sequence-numbered log of profile changes"""
+        self._events = deque(maxlen=max_events)
+        self._condition = threading.Condition()
+        self.latest_seq = 0
+
+    def publish(self, kind: str, profile_ids: Iterable[str]) -> int:
+        """Append one event per profile ID; returns the latest sequence number"""
+        with self._condition:
+            for profile_id in profile_ids:
+                self.latest_seq += 1
+                self._events.append(ChangeEvent(self.latest_seq, kind, profile_id))
+            self._condition.notify_all()
+            return self.latest_seq
+
+    def read_since(self, seq: int, limit: Optional[int] = None) -> List[ChangeEvent]:
+        """Events with a sequence number greater than ``seq``, oldest first"""
+        with self._condition:
+            events = [event for event in self._events if event.seq > seq]
+        return events[:limit] if limit else events
+
+    @property
+    def oldest_seq(self) -> int:
+        with self._condition:
+            return self._events[0].seq if self._events else self.latest_seq + 1
+
+    def wait_for(self, seq: int, timeout: float) -> bool:
+        """Block until an event newer than ``seq`` exists (or the timeout expires)"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.latest_seq > seq, timeout=timeout)
+
+
+def collapse(events: List[ChangeEvent]) -> Tuple[Set[str], Set[str]]:
+    """Reduce events to (profile IDs to upsert, profile IDs to remove); the last event per profile wins"""
+    latest: Dict[str, str] = {}
+    for event in events:
+        latest[event.profile_id] = event.kind
+    upserts = {pid for pid, kind in latest.items() if kind != REMOVED}
+    removals = {pid for pid, kind in latest.items() if kind == REMOVED}
+    return upserts, removals
+
+
+class IncrementalIndexer:
+    def __init__(self, feed: ChangeFeed, get_target: Callable, apply_fn: Callable,
+                 batch_window: float = 1.0, batch_size: int = 64, on_gap: Optional[Callable] = None):
+        """Apply feed events to the active index in micro-batches.
+
+        ``get_target()`` returns a context manager yielding the index version to
+        update (or None); ``apply_fn(version, upserts, removals)`` updates it.
+        ``on_gap(version)`` is called if the feed no longer holds the events a
+        version needs (it must then be rebuilt).
+        """
+        self.feed = feed
+        self.get_target = get_target
+        self.apply_fn = apply_fn
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.on_gap = on_gap
+
+        self._thread = None
+        self._stop = threading.Event()
+        self.batches_applied = 0
+        self.profiles_applied = 0
+        self.last_error = None
+
+    def start(self):
+        """Start the background thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="incremental-indexer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if not self.run_once():
+                    with self.get_target() as version:
+                        seq = version.applied_seq if version is not None else self.feed.latest_seq
+                    self.feed.wait_for(seq, timeout=self.batch_window * 5)
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"⚠️ Incremental indexing failed, will retry: {e}")
+                self._stop.wait(self.batch_window * 5)
+
+    def run_once(self) -> bool:
+        """Apply one micro-batch to the active version; returns True if anything was applied"""
+        with self.get_target() as version:
+            if version is None or version.applied_seq >= self.feed.latest_seq:
+                return False
+
+            if version.applied_seq + 1 < self.feed.oldest_seq:
+                # Events this version needs were dropped from the feed
+                if self.on_gap is not None:
+                    self.on_gap(version)
+                version.applied_seq = self.feed.latest_seq
+                return False
+
+            # Give a scrape a moment to finish publishing so changes batch together
+            newest = self.feed.read_since(version.applied_seq)
+            if newest and time.time() - newest[-1].timestamp < self.batch_window:
+                time.sleep(self.batch_window)
+
+            events = self.feed.read_since(version.applied_seq, limit=self.batch_size)
+            if not events:
+                return False
+            upserts, removals = collapse(events)
+            self.apply_fn(version, upserts, removals)
+            version.applied_seq = events[-1].seq
+
+            self.batches_applied += 1
+            self.profiles_applied += len(upserts) + len(removals)
+            self.last_error = None
+            return True
+
+    def stats(self) -> Dict:
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "feed_seq": self.feed.latest_seq,
+            "batches_applied": self.batches_applied,
+            "profiles_applied": self.profiles_applied,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,152 @@
+"""
+Circuit breaker for the LLM backend
+===================================
+
+Wraps calls to the Ollama LLM so that a slow or unavailable daemon does not
+hang every query. After ``failure_threshold`` consecutive failures (errors or
+timeouts) the circuit opens and callers are told to use the retrieval-only
+fallback. Once ``recovery_timeout`` seconds have passed a single probe call is
+let through (half-open); if it succeeds the circuit closes again.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+
+class CallTimeoutError(Exception):
+    """Raised when a guarded call does not finish within the call timeout"""
+
+
+class LLMUnavailableError(Exception):
+    """Raised when generation failed or was rejected by every breaker-guarded model"""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str = "llm", failure_threshold: int = 3,
+                 recovery_timeout: float = 30.0, call_timeout: Optional[float] = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """Create a breaker that opens after ``failure_threshold`` consecutive failures"""
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.recovery_timeout = float(recovery_timeout)
+        self.call_timeout = call_timeout
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.total_calls = 0
+        self.total_failures = 0
+        self.total_rejections = 0
+
+        # Worker threads used to enforce the overall call deadline. A call that
+        # overruns keeps running in the background, so allow a few of them.
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix=f"{name}-breaker")
+
+    @property
+    def state(self) -> str:
+        """Current state, moving OPEN -> HALF_OPEN once the recovery timeout has elapsed"""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go through; in HALF_OPEN only one probe is allowed"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.total_rejections += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                print(f"✅ Circuit '{self.name}' closed again after successful probe")
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.total_failures += 1
+            self._consecutive_failures += 1
+            was_probe = self._state == HALF_OPEN
+            self._probe_in_flight = False
+            if was_probe or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    print(f"⚠️ Circuit '{self.name}' opened after {self._consecutive_failures} failure(s)")
+                self._state = OPEN
+                self._opened_at = self._clock()
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Run ``func`` through the breaker.
+
+        Raises CircuitOpenError if the circuit is open, CallTimeoutError if the
+        call exceeds ``call_timeout``, or re-raises the call's own exception.
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+
+        with self._lock:
+            self.total_calls += 1
+
+        try:
+            if self.call_timeout:
+                future = self._executor.submit(func, *args, **kwargs)
+                try:
+                    result = future.result(timeout=self.call_timeout)
+                except FutureTimeoutError:
+                    future.cancel()
+                    raise CallTimeoutError(
+                        f"Call through circuit '{self.name}' exceeded {self.call_timeout}s"
+                    )
+            else:
+                result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+
+        self.record_success()
+        return result
+
+    def reset(self):
+        """Force the circuit back to CLOSED"""
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self._current_state(),
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout": self.recovery_timeout,
+                "call_timeout": self.call_timeout,
+                "total_calls": self.total_calls,
+                "total_failures": self.total_failures,
+                "total_rejections": self.total_rejections,
+            }
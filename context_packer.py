@@ -0,0 +1,157 @@
+"""
+Context packing for the RAG prompt
+==================================
+
+Takes the chunks returned by the retriever (best first) and packs them into a
+single context string that fits a token budget:
+
+* overlapping text between neighbouring chunks of the same profile (left by the
+  splitter's ``chunk_overlap``) is removed,
+* chunks belonging to the same person are collapsed into one block,
+* people are added in order of their best chunk's relevance until the budget
+  is used up.
+"""
+
+import importlib.util
+import re
+from typing import Dict, List, Optional, Tuple
+
+TIKTOKEN_AVAILABLE = importlib.util.find_spec("tiktoken") is not None
+_encoding = None
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def _get_encoding():
+    """Load the tiktoken encoding on first use (it is slow to import and load)"""
+    global _encoding, TIKTOKEN_AVAILABLE
+    if _encoding is None and TIKTOKEN_AVAILABLE:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            TIKTOKEN_AVAILABLE = False
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text (tiktoken when installed, otherwise a word/punctuation estimate)"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # Sub-word tokenizers split long words; charge one extra token per 6 characters
+    return sum(1 + len(token) // 6 for token in _TOKEN_PATTERN.findall(text))
+
+
+def strip_overlap(previous: str, current: str, min_overlap: int = 20) -> str:
+    """Remove the prefix of ``current`` that repeats the end of ``previous``"""
+    if not previous or not current:
+        return current
+    if current in previous:
+        return ""
+    max_len = min(len(previous), len(current))
+    for size in range(max_len, min_overlap - 1, -1):
+        if previous.endswith(current[:size]):
+            return current[size:].lstrip()
+    return current
+
+
+class PackedContext:
+    __slots__ = ("text", "tokens", "people", "chunks_used", "chunks_dropped")
+
+    def __init__(self, text: str, tokens: int, people: List[str], chunks_used: int, chunks_dropped: int):
+        self.text = text
+        self.tokens = tokens
+        self.people = people
+        self.chunks_used = chunks_used
+        self.chunks_dropped = chunks_dropped
+
+    def to_dict(self) -> Dict:
+        return {
+            "context_tokens": self.tokens,
+            "people": self.people,
+            "chunks_used": self.chunks_used,
+            "chunks_dropped": self.chunks_dropped,
+        }
+
+
+class ContextPacker:
+    def __init__(self, token_budget: int = 1000, max_chunks_per_person: Optional[int] = None):
+        """Pack retrieved chunks into at most ``token_budget`` tokens"""
+        self.token_budget = token_budget
+        self.max_chunks_per_person = max_chunks_per_person
+
+    @staticmethod
+    def _person_key(metadata: Dict) -> str:
+        return metadata.get("profile_id") or metadata.get("linkedin_url") or metadata.get("name", "Unknown")
+
+    def pack(self, scored_docs: List[Tuple]) -> PackedContext:
+        """Pack (document, relevance score) pairs, ordered best first, into a context string"""
+        # Group chunks per person, remembering the best score and rank of each group
+        groups: Dict[str, Dict] = {}
+        for rank, (doc, score) in enumerate(scored_docs):
+            key = self._person_key(doc.metadata)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {
+                    "name": doc.metadata.get("name", "Unknown"),
+                    "best_score": score,
+                    "best_rank": rank,
+                    "chunks": []
+                }
+            group["chunks"].append((rank, doc))
+
+        ordered_groups = sorted(groups.values(), key=lambda g: g["best_rank"])
+
+        blocks = []
+        people = []
+        used_tokens = 0
+        chunks_used = 0
+        chunks_dropped = 0
+
+        for group in ordered_groups:
+            header = f"[{group['name']}]"
+            header_tokens = count_tokens(header) + 1
+            if used_tokens + header_tokens >= self.token_budget:
+                chunks_dropped += len(group["chunks"])
+                continue
+
+            # Most relevant chunks of this person first, then restore document order
+            chunks = sorted(group["chunks"], key=lambda item: item[0])
+            if self.max_chunks_per_person:
+                chunks_dropped += max(0, len(chunks) - self.max_chunks_per_person)
+                chunks = chunks[:self.max_chunks_per_person]
+
+            selected = []
+            group_tokens = header_tokens
+            for _, doc in chunks:
+                chunk_tokens = count_tokens(doc.page_content)
+                if used_tokens + group_tokens + chunk_tokens > self.token_budget:
+                    chunks_dropped += 1
+                    continue
+                selected.append(doc)
+                group_tokens += chunk_tokens
+
+            if not selected:
+                continue
+
+            selected.sort(key=lambda d: d.metadata.get("start_index", 0))
+            parts = []
+            previous = ""
+            for doc in selected:
+                text = strip_overlap(previous, doc.page_content)
+                if text:
+                    parts.append(text)
+                previous = doc.page_content
+
+            block = header + "\n" + "\n".join(parts)
+            block_tokens = count_tokens(block)
+            blocks.append(block)
+            people.append(group["name"])
+            used_tokens += block_tokens + 1
+            chunks_used += len(selected)
+
+        text = "\n\n".join(blocks)
+        return PackedContext(text, count_tokens(text), people, chunks_used, chunks_dropped)
@@ -0,0 +1,190 @@
+"""
+Named corpora in one process
+============================
+
+Each candidate pool (corpus) has its own profile JSON, profile store, vector
+index versions and caches, while the embedding model, the Ollama clients and
+the LLM circuit breaker live once per process in ``SharedModels``.
+
+``CorpusManager`` loads corpora on first use and keeps them in LRU order.
+After every load it evicts the least recently used idle corpora until the
+estimated memory of the loaded ones fits the budget (and no more than
+``max_loaded`` stay loaded). Corpora serving a request are never evicted.
+
+Corpora are configured with ``CORPORA="pool-a=/data/a.json,pool-b=/data/b.json"``
+and/or ``CORPORA_DIR`` (every ``<name>.json`` in it).
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+CORPUS_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class SharedModels:
+    def __init__(self):
+        """Process-wide models, filled in lazily by the first corpus that needs them"""
+        self.embeddings = None
+        self.llm = None
+        self.large_llm = None
+        self.llm_breaker = None
+        self.large_llm_breaker = None
+        self.lock = threading.RLock()
+
+
+def load_corpus_configs(spec: Optional[str] = None, directory: Optional[str] = None) -> Dict[str, str]:
+    """Corpus name -> profiles JSON path, from a ``name=path,...`` spec and a directory of ``<name>.json``"""
+    configs = {}
+    if directory and os.path.isdir(directory):
+        for entry in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(entry)
+            if extension == ".json" and CORPUS_NAME_PATTERN.match(name):
+                configs[name] = os.path.join(directory, entry)
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        name, _, path = item.partition("=")
+        name = name.strip()
+        if not CORPUS_NAME_PATTERN.match(name) or not path.strip():
+            raise ValueError(f"Invalid corpus spec '{item.strip()}' (expected name=path/to/profiles.json)")
+        configs[name] = path.strip()
+    return configs
+
+
+class CorpusManager:
+    def __init__(self, configs: Dict[str, str], load_fn: Callable[[str, str], object],
+                 memory_budget: int, max_loaded: int = 8,
+                 size_fn: Callable[[object], int] = lambda corpus: corpus.memory_estimate(),
+                 close_fn: Callable[[object], None] = lambda corpus: corpus.close()):
+        """Corpora named in ``configs`` (name -> profiles JSON), created with ``load_fn(name, path)``"""
+        self.configs = dict(configs)
+        self.load_fn = load_fn
+        self.memory_budget = memory_budget
+        self.max_loaded = max(1, max_loaded)
+        self.size_fn = size_fn
+        self.close_fn = close_fn
+
+        self._lock = threading.Lock()
+        self._loaded: "OrderedDict[str, object]" = OrderedDict()  # least recently used first
+        self._in_use: Dict[str, int] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.configs
+
+    def names(self) -> List[str]:
+        return sorted(self.configs)
+
+    def acquire(self, name: str):
+        """The corpus, loading it if needed and pinning it against eviction until ``release``"""
+        return self._get(name, pin=True)
+
+    def release(self, name: str):
+        with self._lock:
+            if self._in_use.get(name, 0) > 0:
+                self._in_use[name] -= 1
+
+    def get(self, name: str):
+        """The corpus, loading it if needed, without pinning it"""
+        return self._get(name, pin=False)
+
+    def _get(self, name: str, pin: bool):
+        if name not in self.configs:
+            raise KeyError(f"Unknown corpus '{name}'")
+        with self._lock:
+            corpus = self._loaded.get(name)
+            if corpus is not None:
+                self._pin(name, pin)
+                return corpus
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # One loader per corpus; other requests for it wait instead of loading a second copy
+        with load_lock:
+            with self._lock:
+                corpus = self._loaded.get(name)
+                if corpus is not None:
+                    self._pin(name, pin)
+            if corpus is None:
+                print(f"📂 Loading corpus '{name}'")
+                corpus = self.load_fn(name, self.configs[name])
+                # Inserted and pinned at once: no eviction can slip in between
+                with self._lock:
+                    self._loaded[name] = corpus
+                    self.loads += 1
+                    self._pin(name, pin)
+        self.enforce_budget(keep=name)
+        return corpus
+
+    def _pin(self, name: str, pin: bool):
+        # Called with self._lock held and the corpus loaded
+        self._loaded.move_to_end(name)
+        if pin:
+            self._in_use[name] = self._in_use.get(name, 0) + 1
+
+    def enforce_budget(self, keep: Optional[str] = None):
+        """Evict idle corpora, least recently used first, until the loaded ones fit the budget"""
+        with self._lock:
+            loaded = list(self._loaded.items())
+        sizes = {}
+        for name, corpus in loaded:
+            try:
+                sizes[name] = self.size_fn(corpus)
+            except Exception:
+                sizes[name] = 0
+        total = sum(sizes.values())
+
+        for name, _ in loaded:
+            if total <= self.memory_budget and len(self._loaded) <= self.max_loaded:
+                break
+            if name == keep:
+                continue
+            with self._lock:
+                if self._in_use.get(name, 0) > 0 or name not in self._loaded:
+                    continue
+                corpus = self._loaded.pop(name)
+                self.evictions += 1
+            total -= sizes.get(name, 0)
+            print(f"♻️ Evicting corpus '{name}' ({sizes.get(name, 0) / 1e6:.1f} MB)")
+            try:
+                self.close_fn(corpus)
+            except Exception as e:
+                print(f"⚠️ Error closing corpus '{name}': {e}")
+
+    def evict(self, name: str) -> bool:
+        """Unload a corpus now; False if it is not loaded or is serving a request"""
+        with self._lock:
+            if name not in self._loaded or self._in_use.get(name, 0) > 0:
+                return False
+            corpus = self._loaded.pop(name)
+            self.evictions += 1
+        self.close_fn(corpus)
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            loaded = list(self._loaded.items())
+            in_use = dict(self._in_use)
+        corpora = {}
+        for name in self.names():
+            entry = {"path": self.configs[name], "loaded": False}
+            corpus = dict(loaded).get(name)
+            if corpus is not None:
+                try:
+                    size = self.size_fn(corpus)
+                except Exception:
+                    size = None
+                entry.update(loaded=True, memory_bytes=size, in_use=in_use.get(name, 0))
+            corpora[name] = entry
+        return {
+            "corpora": corpora,
+            "lru_order": [name for name, _ in loaded],
+            "memory_budget_bytes": self.memory_budget,
+            "max_loaded": self.max_loaded,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,254 @@
+"""
+Entity normalization
+====================
+
+The scraper glues employment types onto company names ("NxtGen Cloud
+Technologies Pvt Ltd · Internship") and the same organization or place shows
+up under several spellings ("Bangalore", "Bengaluru", "Infosys Ltd"). At
+ingest every company, school and experience location is reduced to a
+normalized key, mapped through a precomputed alias table and, failing that,
+fuzzily matched (``difflib``) against the entities already seen, where only
+typos inside words count ("IIT Madras" and "IIT Mandi" never merge). Each
+canonical entity gets a stable ID, and ``EntityIndex`` maps IDs to the
+profiles that mention them, so lookups are dictionary hits instead of
+substring scans.
+"""
+
+import difflib
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+KIND_COMPANY = "company"
+KIND_SCHOOL = "school"
+KIND_LOCATION = "location"
+KINDS = (KIND_COMPANY, KIND_SCHOOL, KIND_LOCATION)
+
+# Suffixes LinkedIn appends to the company name ("Infosys · Full-time")
+EMPLOYMENT_TYPES = {
+    "full-time": "Full-time", "part-time": "Part-time", "internship": "Internship",
+    "self-employed": "Self-employed", "freelance": "Freelance", "contract": "Contract",
+    "apprenticeship": "Apprenticeship", "seasonal": "Seasonal", "trainee": "Trainee",
+}
+
+# Durations that the scraper sometimes puts where the company name belongs
+DURATION_PATTERN = re.compile(r"^\d+\s+(?:yrs?|mos?)(?:\s+\d+\s+mos?)?$", re.IGNORECASE)
+
+# Legal-form words dropped from the end of organization names
+LEGAL_SUFFIXES = frozenset((
+    "pvt", "private", "ltd", "limited", "inc", "incorporated", "incorporation", "llc", "llp",
+    "co", "corp", "corporation", "plc", "gmbh", "sa", "ag", "bv",
+))
+
+# Words of a fuzzy match must each be at least this similar to their
+# counterpart; a different whole word ("Madras" vs "Mandi") is a different entity
+WORD_TYPO_CUTOFF = 0.8
+
+# Known alternative spellings -> canonical name, per kind
+ALIASES = {
+    KIND_COMPANY: {
+        "TCS": "Tata Consultancy Services",
+        "E-Cell DSU": "Entrepreneurship-Cell @DSU",
+        "Bosch": "Robert Bosch Engineering and Business Solutions Private Limited",
+        "HAL": "Hindustan Aeronautics Limited",
+    },
+    KIND_SCHOOL: {
+        "DSU": "Dayananda Sagar University",
+        "DSCE": "Dayananda Sagar College of Engineering, BANGALORE",
+        "Dayananda Sagar College of Engineering": "Dayananda Sagar College of Engineering, BANGALORE",
+        "IIT Hyderabad": "Indian Institute of Technology Hyderabad",
+        "IITH": "Indian Institute of Technology Hyderabad",
+        "IISc": "Indian Institute of Science (IISc)",
+        "Indian Institute of Science": "Indian Institute of Science (IISc)",
+        "UT Dallas": "The University of Texas at Dallas",
+        "UTD": "The University of Texas at Dallas",
+        "LDRP ITR": "LDRP Institute of Technology & Research, Gujarat Technological University",
+        "LDRP Institute of Technology and Research": "LDRP Institute of Technology & Research, Gujarat Technological University",
+        "PESU": "PES University",
+        "RVCE": "RV College of Engineering",
+        "BMSCE": "BMS College of Engineering",
+    },
+    KIND_LOCATION: {
+        "Bangalore": "Bengaluru",
+        "Bangalore Urban": "Bengaluru",
+        "Bengaluru Area": "Bengaluru",
+        "Gurgaon": "Gurugram",
+        "Bombay": "Mumbai",
+        "Madras": "Chennai",
+        "Calcutta": "Kolkata",
+        "Mysore": "Mysuru",
+        "Taipei City": "Taipei",
+    },
+}
+
+
+def split_employment_type(institution_name: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """"Infosys · Full-time" -> ("Infosys", "Full-time"); durations are not names"""
+    if not institution_name:
+        return None, None
+    name = None
+    employment_type = None
+    for part in institution_name.split(" · "):
+        part = part.strip()
+        known = EMPLOYMENT_TYPES.get(part.lower())
+        if known:
+            employment_type = employment_type or known
+        elif name is None and part and not DURATION_PATTERN.match(part):
+            name = part
+    return name, employment_type
+
+
+def location_parts(location: Optional[str]) -> List[str]:
+    """"Bengaluru, Karnataka, India · On-site" -> ["Bengaluru", "Karnataka", "India"]"""
+    place = (location or "").split(" · ")[0]
+    return [part.strip() for part in place.split(",") if part.strip()]
+
+
+def normalize_key(name: Optional[str]) -> str:
+    """Case-, accent-, punctuation- and legal-form-insensitive matching key"""
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    text = text.replace("&", " and ")
+    words = re.sub(r"[^\w]+", " ", text).split()
+    if words and words[0] == "the" and len(words) > 1:
+        words = words[1:]
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def is_typo_variant(key: str, candidate: str) -> bool:
+    """Whether two normalized keys differ only by typos inside words, not by a whole word"""
+    words, other_words = key.split(), candidate.split()
+    if len(words) != len(other_words):
+        return False
+    for word, other in zip(words, other_words):
+        if word == other:
+            continue
+        # Short words (numbers, initials, "iit" vs "iim") are never typo-folded
+        if min(len(word), len(other)) < 4 or difflib.SequenceMatcher(None, word, other).ratio() < WORD_TYPO_CUTOFF:
+            return False
+    return True
+
+
+class EntityIndex:
+    def __init__(self, aliases: Optional[Dict[str, Dict[str, str]]] = None, fuzzy_cutoff: float = 0.92):
+        """An empty index; names within ``fuzzy_cutoff`` similarity of a known entity join it"""
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._aliases = {kind: {normalize_key(alias): canonical for alias, canonical in table.items()}
+                         for kind, table in (ALIASES if aliases is None else aliases).items()}
+        # entity ID -> {"kind", "name", "variants"}
+        self.entities: Dict[str, Dict] = {}
+        self._profiles: Dict[str, Set[str]] = {}
+        # (kind, normalized key of any known spelling) -> entity ID
+        self._ids: Dict[Tuple[str, str], str] = {}
+        # (kind, raw spelling seen at ingest) -> entity ID, to skip normalizing repeats
+        self._raw: Dict[Tuple[str, str], str] = {}
+        # (kind, first three key characters) -> canonical keys, the fuzzy match candidates
+        self._blocks: Dict[Tuple[str, str], List[str]] = {}
+
+    @classmethod
+    def build(cls, records: Iterable, **kwargs) -> "EntityIndex":
+        """Index the companies, schools and locations of ``records``"""
+        index = cls(**kwargs)
+        for record in records:
+            index.add_record(record)
+        return index
+
+    def add_record(self, record):
+        profile_id = record.profile_id
+        for experience in record.experiences:
+            self._link(self.resolve(KIND_COMPANY, experience.organization, create=True), profile_id)
+            for place in location_parts(experience.location):
+                self._link(self.resolve(KIND_LOCATION, place, create=True), profile_id)
+        for education in record.education:
+            self._link(self.resolve(KIND_SCHOOL, education.organization, create=True), profile_id)
+
+    def _link(self, entity_id: Optional[str], profile_id: str):
+        if entity_id is not None:
+            self._profiles[entity_id].add(profile_id)
+
+    def resolve(self, kind: str, name: Optional[str], create: bool = False) -> Optional[str]:
+        """The entity ID for a spelling of a name (a new entity when ``create``); None if unknown"""
+        entity_id = self._raw.get((kind, name))
+        if entity_id is not None:
+            return entity_id
+        key = normalize_key(name)
+        if not key:
+            return None
+        entity_id = self._ids.get((kind, key))
+
+        canonical = self._aliases.get(kind, {}).get(key) if entity_id is None else None
+        if canonical is not None:
+            entity_id = self._ids.get((kind, normalize_key(canonical)))
+            if entity_id is None and create:
+                entity_id = self._create(kind, normalize_key(canonical), canonical)
+        if entity_id is None and canonical is None:
+            entity_id = self._fuzzy_match(kind, key)
+        if entity_id is None and create:
+            entity_id = self._create(kind, key, name.strip())
+
+        # Remember spellings seen at ingest so the next lookup is a dictionary hit
+        if entity_id is not None and create:
+            self._ids[(kind, key)] = entity_id
+            self._raw[(kind, name)] = entity_id
+            self.entities[entity_id]["variants"].add(name.strip())
+        return entity_id
+
+    def _create(self, kind: str, key: str, name: str) -> str:
+        entity_id = f"{kind}:{key.replace(' ', '-')}"
+        self.entities[entity_id] = {"kind": kind, "name": name, "variants": {name}}
+        self._profiles[entity_id] = set()
+        self._ids[(kind, key)] = entity_id
+        self._blocks.setdefault((kind, key[:3]), []).append(key)
+        return entity_id
+
+    def _fuzzy_match(self, kind: str, key: str) -> Optional[str]:
+        # Only names sharing the first three characters are compared, which
+        # keeps ingest linear in practice while still catching typos later on
+        candidates = self._blocks.get((kind, key[:3]))
+        if not candidates:
+            return None
+        for close in difflib.get_close_matches(key, candidates, n=3, cutoff=self.fuzzy_cutoff):
+            if is_typo_variant(key, close):
+                return self._ids[(kind, close)]
+        return None
+
+    def search(self, kind: str, name: str) -> List[str]:
+        """Entity IDs for a query: the resolved entity, otherwise every entity whose
+        name contains the query as whole words ("infosys" -> "Infosys Springboard")"""
+        entity_id = self.resolve(kind, name)
+        if entity_id is not None:
+            return [entity_id]
+        key = normalize_key(name)
+        if not key:
+            return []
+        pattern = re.compile(r"(?<![\w])" + re.escape(key) + r"(?![\w])")
+        matches = (entity_id for (entity_kind, variant), entity_id in self._ids.items()
+                   if entity_kind == kind and pattern.search(variant))
+        return list(dict.fromkeys(matches))
+
+    def name(self, entity_id: str) -> Optional[str]:
+        entity = self.entities.get(entity_id)
+        return entity["name"] if entity else None
+
+    def profile_ids(self, entity_id: str) -> Set[str]:
+        return self._profiles.get(entity_id, set())
+
+    def describe(self, entity_id: str) -> Dict:
+        entity = self.entities[entity_id]
+        return {
+            "id": entity_id,
+            "kind": entity["kind"],
+            "name": entity["name"],
+            "variants": sorted(entity["variants"]),
+            "profiles": len(self._profiles[entity_id]),
+        }
+
+    def stats(self) -> Dict:
+        counts = {kind: 0 for kind in KINDS}
+        for entity in self.entities.values():
+            counts[entity["kind"]] = counts.get(entity["kind"], 0) + 1
+        return {"entities": counts, "spellings": len(self._ids)}
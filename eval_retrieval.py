@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Offline retrieval evaluation
+============================
+
+Scores retrieval against a labeled set of questions and the people who
+should be found for them (``eval_questions.json``), sweeping
+
+* chunking strategies (``size:overlap`` pairs, or ``profile`` for one chunk
+  per profile),
+* ``k`` (chunks retrieved, as passed to the vector store),
+* retrieval modes: ``dense`` (vector search), ``hybrid`` (vector and BM25
+  rankings fused with reciprocal rank fusion) and ``rerank`` (a vector
+  search candidate pool re-scored by a cross-encoder),
+* embedding models.
+
+For each combination it reports person-level recall@k and MRR next to index
+size, build time and query latency, and names the cheapest configuration
+that reaches ``--min-recall`` (smallest ``k`` first, then lowest latency,
+then smallest index). The winner maps onto the app's ``CHUNK_SIZE``,
+``CHUNK_OVERLAP`` and ``RETRIEVAL_FETCH_K`` settings.
+
+Usage:
+    python eval_retrieval.py [--labels eval_questions.json] [--chunking 500:100 1000:200 profile]
+                             [--k 1 3 5 10] [--modes dense hybrid rerank] [--json eval_results.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import shutil
+import statistics
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+MODES = ("dense", "hybrid", "rerank")
+
+# Candidate pool for hybrid and rerank, as a multiple of the largest k
+POOL_FACTOR = 4
+RRF_K = 60
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#.]+")
+
+
+class BM25:
+    def __init__(self, texts: List[str], k1: float = 1.5, b: float = 0.75):
+        """Minimal Okapi BM25 over ``texts`` for the keyword half of hybrid retrieval"""
+        self.k1 = k1
+        self.b = b
+        self.docs = [Counter(self.tokenize(text)) for text in texts]
+        self.lengths = [sum(doc.values()) for doc in self.docs]
+        self.avg_length = statistics.fmean(self.lengths) if self.lengths else 0.0
+        document_frequency = Counter(term for doc in self.docs for term in doc)
+        n = len(self.docs)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return TOKEN_PATTERN.findall(text.lower())
+
+    def top(self, query: str, n: int) -> List[int]:
+        """Indices of the ``n`` best-scoring documents"""
+        terms = [term for term in self.tokenize(query) if term in self.idf]
+        scores = []
+        for index, doc in enumerate(self.docs):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[index] / (self.avg_length or 1.0))
+            for term in terms:
+                tf = doc.get(term)
+                if tf:
+                    score += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            if score > 0:
+                scores.append((score, index))
+        scores.sort(reverse=True)
+        return [index for _, index in scores[:n]]
+
+
+def parse_chunking(spec: str) -> Optional[tuple]:
+    """``"1000:200"`` -> (1000, 200); ``"profile"`` -> None (one chunk per profile)"""
+    if spec == "profile":
+        return None
+    size, _, overlap = spec.partition(":")
+    return int(size), int(overlap or 0)
+
+
+def directory_bytes(path: Optional[str]) -> int:
+    if not path or not os.path.isdir(path):
+        return 0
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def people_in_order(chunks) -> List[str]:
+    """Distinct person names in ranking order"""
+    seen = []
+    for chunk in chunks:
+        name = chunk.metadata.get("name")
+        if name and name not in seen:
+            seen.append(name)
+    return seen
+
+
+def score(ranked_chunks, expected: List[str], k: int) -> Dict[str, float]:
+    """Person-level recall and reciprocal rank over the top ``k`` chunks"""
+    people = people_in_order(ranked_chunks[:k])
+    found = [name for name in expected if name in people]
+    ranks = [people.index(name) + 1 for name in found]
+    return {
+        "recall": len(found) / len(expected) if expected else 0.0,
+        "rr": 1.0 / min(ranks) if ranks else 0.0,
+    }
+
+
+def load_reranker(model_name: str):
+    try:
+        from sentence_transformers import CrossEncoder
+    except ImportError:
+        print("⚠️ sentence-transformers CrossEncoder not available, skipping rerank mode")
+        return None
+    return CrossEncoder(model_name)
+
+
+def retrieve(mode: str, question: str, vectorstore, chunks, bm25: BM25, reranker, pool: int):
+    """Return chunks ranked best first for one question"""
+    if mode == "dense":
+        return vectorstore.similarity_search(question, k=pool)
+
+    dense = vectorstore.similarity_search(question, k=pool)
+    if mode == "rerank":
+        scores = reranker.predict([(question, chunk.page_content) for chunk in dense])
+        return [chunk for _, chunk in sorted(zip(scores, dense), key=lambda pair: -pair[0])]
+
+    # Hybrid: reciprocal rank fusion of the dense and BM25 rankings
+    fused: Dict[str, float] = {}
+    by_id = {}
+    for rank, chunk in enumerate(dense):
+        chunk_id = chunk.metadata["chunk_id"]
+        by_id[chunk_id] = chunk
+        fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank + 1)
+    for rank, index in enumerate(bm25.top(question, pool)):
+        chunk = chunks[index]
+        chunk_id = chunk.metadata["chunk_id"]
+        by_id.setdefault(chunk_id, chunk)
+        fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank + 1)
+    return [by_id[chunk_id] for chunk_id, _ in sorted(fused.items(), key=lambda item: -item[1])]
+
+
+def build_index(chunks, embeddings, path: str):
+    from langchain_community.vectorstores import Chroma
+    import chromadb
+
+    return Chroma.from_documents(
+        documents=chunks,
+        embedding=embeddings,
+        ids=[chunk.metadata["chunk_id"] for chunk in chunks],
+        collection_name="linkedin_profiles_eval",
+        persist_directory=path,
+        client_settings=chromadb.config.Settings(anonymized_telemetry=False, allow_reset=True)
+    )
+
+
+def evaluate(args) -> Dict:
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    from linkedin_rag_webapp import LinkedInRAGApp
+
+    with open(args.labels, "r", encoding="utf-8") as f:
+        labels = json.load(f)
+
+    workdir = tempfile.mkdtemp(prefix="rag_eval_")
+    os.environ["CHROMA_DIR"] = os.path.join(workdir, "app")
+    rag_app = LinkedInRAGApp(args.profiles)
+    documents = rag_app._prepare_documents()
+    reranker = load_reranker(args.rerank_model) if "rerank" in args.modes else None
+    modes = [mode for mode in args.modes if mode != "rerank" or reranker is not None]
+    max_k = max(args.k)
+
+    rows = []
+    try:
+        for model_name in args.embedding_models:
+            embeddings = HuggingFaceEmbeddings(model_name=model_name, model_kwargs={"device": "cpu"})
+            embeddings.embed_query("warm up")
+
+            for spec in args.chunking:
+                chunking = parse_chunking(spec)
+                if chunking is None:
+                    chunks = rag_app._split_documents(documents, chunk_size=10 ** 9, chunk_overlap=0)
+                else:
+                    chunks = rag_app._split_documents(documents, chunk_size=chunking[0], chunk_overlap=chunking[1])
+
+                path = os.path.join(workdir, f"index_{len(rows)}")
+                start = time.perf_counter()
+                vectorstore = build_index(chunks, embeddings, path)
+                build_seconds = time.perf_counter() - start
+                index_bytes = directory_bytes(path)
+                bm25 = BM25([chunk.page_content for chunk in chunks])
+
+                for mode in modes:
+                    pool = max_k if mode == "dense" else max_k * POOL_FACTOR
+                    latencies = []
+                    per_k = {k: {"recall": [], "rr": []} for k in args.k}
+                    for item in labels:
+                        start = time.perf_counter()
+                        ranked = retrieve(mode, item["question"], vectorstore, chunks, bm25, reranker, pool)
+                        latencies.append((time.perf_counter() - start) * 1000.0)
+                        for k in args.k:
+                            result = score(ranked, item["expected"], k)
+                            per_k[k]["recall"].append(result["recall"])
+                            per_k[k]["rr"].append(result["rr"])
+
+                    latencies.sort()
+                    for k in args.k:
+                        row = {
+                            "embedding_model": model_name,
+                            "chunking": spec,
+                            "mode": mode,
+                            "k": k,
+                            "recall": statistics.fmean(per_k[k]["recall"]),
+                            "mrr": statistics.fmean(per_k[k]["rr"]),
+                            "index_chunks": len(chunks),
+                            "index_bytes": index_bytes,
+                            "build_seconds": build_seconds,
+                            "query_p50_ms": latencies[len(latencies) // 2],
+                            "query_p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+                        }
+                        rows.append(row)
+                        print(f"  {model_name.split('/')[-1]:<22} {spec:<10} {mode:<7} k={k:<3} "
+                              f"recall {row['recall']:.2f}  MRR {row['mrr']:.2f}  "
+                              f"{row['index_chunks']:>5} chunks  build {build_seconds:6.1f}s  "
+                              f"p50 {row['query_p50_ms']:6.1f} ms")
+
+                vectorstore.delete_collection()
+                shutil.rmtree(path, ignore_errors=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    passing = [row for row in rows if row["recall"] >= args.min_recall]
+    best = min(passing, key=lambda row: (row["k"], row["query_p50_ms"], row["index_bytes"])) if passing else None
+    return {"labels": len(labels), "min_recall": args.min_recall, "results": rows, "cheapest_passing": best}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate retrieval quality and cost across configurations")
+    parser.add_argument("--labels", default="eval_questions.json", help="Labeled questions: [{question, expected: [names]}]")
+    parser.add_argument("--profiles", default="linkedin_profiless_ls3.json")
+    parser.add_argument("--chunking", nargs="+", default=["500:100", "1000:200", "2000:200", "profile"])
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--embedding-models", nargs="+", default=[DEFAULT_EMBEDDING_MODEL])
+    parser.add_argument("--rerank-model", default=DEFAULT_RERANK_MODEL)
+    parser.add_argument("--min-recall", type=float, default=0.8)
+    parser.add_argument("--json", default="eval_results.json", help="Write results to this file")
+    args = parser.parse_args()
+
+    report = evaluate(args)
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    best = report["cheapest_passing"]
+    if best:
+        print(f"🏆 Cheapest configuration with recall >= {args.min_recall}: {best['embedding_model']}, "
+              f"chunking {best['chunking']}, {best['mode']}, k={best['k']} "
+              f"(recall {best['recall']:.2f}, MRR {best['mrr']:.2f})")
+    else:
+        print(f"⚠️ No configuration reached recall {args.min_recall}")
+    print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
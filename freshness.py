@@ -0,0 +1,114 @@
+"""
+Profile freshness and refresh scheduling
+========================================
+
+Every scraped profile records when it was scraped (``scraped_at``). The
+``RefreshScheduler`` periodically picks the stalest profiles, at most
+``batch_size`` per run and within a wall-clock budget, and hands them to a
+refresh callback that re-scrapes them. The callback writes a profile back
+only when its content hash changed, so unchanged profiles never cause
+reindex work.
+"""
+
+import heapq
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+def stalest(records: Iterable, limit: int, min_age: Optional[float] = None,
+            now: Optional[float] = None) -> List:
+    """The ``limit`` least recently scraped records older than ``min_age`` seconds.
+
+    Records that were never timestamped count as the oldest.
+    """
+    now = now if now is not None else time.time()
+    candidates = (
+        record for record in records
+        if record.linkedin_url and (min_age is None or record.scraped_at is None
+                                    or now - record.scraped_at > min_age)
+    )
+    return heapq.nsmallest(limit, candidates, key=lambda record: record.scraped_at or 0.0)
+
+
+class RefreshScheduler:
+    def __init__(self, get_records: Callable[[], Iterable], refresh_fn: Callable,
+                 batch_size: int = 10, budget_seconds: float = 600.0,
+                 interval: Optional[float] = None, min_age: Optional[float] = None):
+        """Re-scrape the stalest profiles in bounded runs.
+
+        ``refresh_fn(records, deadline)`` re-scrapes the given records, stops
+        once ``time.time()`` passes ``deadline`` and returns a dict of counts.
+        With an ``interval`` (seconds), ``start()`` runs it periodically.
+        """
+        self.get_records = get_records
+        self.refresh_fn = refresh_fn
+        self.batch_size = batch_size
+        self.budget_seconds = budget_seconds
+        self.interval = interval
+        self.min_age = min_age
+
+        self._run_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.runs = 0
+        self.last_run: Optional[Dict] = None
+
+    def start(self):
+        """Start periodic runs (no-op without an interval; idempotent)"""
+        if not self.interval or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profile-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ Profile refresh failed: {e}")
+
+    def run_once(self, limit: Optional[int] = None, budget_seconds: Optional[float] = None) -> Dict:
+        """Refresh the stalest profiles once; raises RuntimeError if a run is already in progress"""
+        if not self._run_lock.acquire(blocking=False):
+            raise RuntimeError("A profile refresh is already in progress")
+        try:
+            started = time.time()
+            budget = budget_seconds if budget_seconds is not None else self.budget_seconds
+            candidates = stalest(self.get_records(), limit or self.batch_size, self.min_age, now=started)
+            result = {"selected": len(candidates)}
+            if candidates:
+                result.update(self.refresh_fn(candidates, started + budget))
+            result["seconds"] = time.time() - started
+            result["finished_at"] = time.time()
+            self.runs += 1
+            self.last_run = result
+            return result
+        finally:
+            self._run_lock.release()
+
+    @property
+    def running(self) -> bool:
+        return self._run_lock.locked()
+
+    def stats(self, records: Optional[Iterable] = None) -> Dict:
+        stats = {
+            "scheduled": self._thread is not None and self._thread.is_alive(),
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "budget_seconds": self.budget_seconds,
+            "running": self.running,
+            "runs": self.runs,
+            "last_run": self.last_run,
+        }
+        if records is not None:
+            timestamps = [record.scraped_at for record in records]
+            known = [ts for ts in timestamps if ts is not None]
+            stats["profiles"] = len(timestamps)
+            stats["never_timestamped"] = len(timestamps) - len(known)
+            stats["oldest_scraped_at"] = min(known) if known else None
+        return stats
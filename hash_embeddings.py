@@ -0,0 +1,47 @@
+"""
+Deterministic hash embeddings
+=============================
+
+A drop-in replacement for the sentence-transformers embedding model for load
+tests and benchmarks: tokens and token bigrams are feature-hashed into a
+fixed-size signed vector and L2-normalized. No model download, no GPU, the
+same text always gives the same vector, and texts sharing words still land
+near each other so retrieval behaves plausibly.
+
+Enable in the app with ``EMBEDDING_BACKEND=hash``.
+"""
+
+import hashlib
+import math
+import re
+from typing import List
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:
+    Embeddings = object
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+
+class HashEmbeddings(Embeddings):
+    def __init__(self, dimensions: int = 384):
+        """Embeddings of ``dimensions`` floats (384 matches all-MiniLM-L6-v2)"""
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector] if norm else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
@@ -0,0 +1,318 @@
+"""
+Versioned vector index management
+=================================
+
+Rebuilding the vector store used to tear down ``./chroma_db`` in place, so
+queries arriving mid-rebuild failed or saw a half-built store. The manager
+here double-buffers the index instead:
+
+* every build goes into its own versioned directory under ``base_dir``,
+* a build is validated before it is used,
+* the new version (with its own QA chain) is swapped in atomically,
+* queries pin the version they started on (``acquire``); a replaced version
+  is only deleted once its in-flight queries have drained,
+* the last ``keep_versions`` replaced versions stay loaded for instant
+  rollback,
+* ``close(keep_active=True)`` releases the stores but leaves the active
+  version on disk with a manifest, so ``reopen`` can serve it again without
+  re-embedding (e.g. when an evicted corpus is loaded again). A build still
+  running at that point is cancelled: its version is deleted when it
+  finishes instead of being swapped in.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Written by close(keep_active=True) next to the version directories
+MANIFEST_FILE = "manifest.json"
+
+
+class IndexVersion:
+    def __init__(self, version_id: str, path: Optional[str], vectorstore, chunk_count: int = 0):
+        """A built vector store living in its own directory"""
+        self.version_id = version_id
+        self.path = path
+        self.vectorstore = vectorstore
+        self.chunk_count = chunk_count
+        self.qa_chain = None
+        # Per-profile centroid matrix for similarity search (see profile_similarity)
+        self.centroids = None
+        self.created_at = time.time()
+        self.in_flight = 0
+        self.retiring = False
+        # Last profile change-feed sequence number reflected in this version
+        self.applied_seq = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.version_id,
+            "path": self.path,
+            "chunks": self.chunk_count,
+            "created_at": self.created_at,
+            "in_flight": self.in_flight,
+            "applied_seq": self.applied_seq,
+            "centroids": len(self.centroids) if self.centroids is not None else None,
+        }
+
+
+class IndexManager:
+    def __init__(self, base_dir: str = "./chroma_db", keep_versions: int = 2,
+                 on_built: Optional[Callable[[IndexVersion], None]] = None):
+        """Manage index versions under ``base_dir``, keeping ``keep_versions`` old ones for rollback.
+
+        ``on_built(version)`` is called after a build has been swapped in
+        (e.g. to re-check a memory budget the new version counts towards).
+        """
+        self.base_dir = base_dir
+        self.keep_versions = max(0, keep_versions)
+        self.on_built = on_built
+
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self.active: Optional[IndexVersion] = None
+        self.standby: List[IndexVersion] = []  # replaced versions, newest first
+        self.build_status: Dict = {"state": "idle", "error": None}
+        self._counter = 0
+        self.closed = False
+
+    def new_version_path(self) -> Tuple[str, str]:
+        """Reserve a fresh version ID and directory for a build"""
+        with self._lock:
+            while True:
+                self._counter += 1
+                version_id = time.strftime("v%Y%m%d-%H%M%S") + f"-{self._counter}"
+                # A version reopened from disk may already use the name
+                if not os.path.exists(os.path.join(self.base_dir, version_id)):
+                    break
+        return version_id, os.path.join(self.base_dir, version_id)
+
+    @contextmanager
+    def acquire(self):
+        """Pin the active version for the duration of a query (yields None if there is none)"""
+        with self._lock:
+            version = self.active
+            if version is not None:
+                version.in_flight += 1
+        try:
+            yield version
+        finally:
+            if version is not None:
+                with self._lock:
+                    version.in_flight -= 1
+                    retire_now = version.retiring and version.in_flight == 0
+                if retire_now:
+                    self._delete(version)
+
+    def build(self, build_fn: Callable[[str, str], IndexVersion],
+              validate_fn: Callable[[IndexVersion], None],
+              prepare_fn: Optional[Callable[[IndexVersion], None]] = None) -> IndexVersion:
+        """Build a new version, validate it and swap it in.
+
+        ``build_fn(version_id, path)`` returns the new IndexVersion,
+        ``validate_fn`` raises if it is unusable and ``prepare_fn`` attaches
+        whatever must go live with it (the QA chain). The active version keeps
+        serving queries throughout. Raises RuntimeError if a build is already
+        running or the manager is closed (also when it is closed mid-build).
+        """
+        if self.closed:
+            raise RuntimeError("The index manager is closed")
+        if not self._build_lock.acquire(blocking=False):
+            raise RuntimeError("An index build is already in progress")
+        try:
+            self.build_status = {"state": "building", "error": None, "started_at": time.time()}
+            self._prune_untracked()
+            version_id, path = self.new_version_path()
+            version = None
+            try:
+                version = build_fn(version_id, path)
+                validate_fn(version)
+                if prepare_fn is not None:
+                    prepare_fn(version)
+            except Exception as e:
+                self.build_status = {"state": "failed", "error": str(e), "finished_at": time.time()}
+                if version is not None:
+                    self._delete(version)
+                elif os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                raise
+            if not self.swap(version):
+                self.build_status = {"state": "cancelled", "error": None, "finished_at": time.time()}
+                self._delete(version)
+                raise RuntimeError(f"Index version {version.version_id} discarded: the index manager was closed")
+            self.build_status = {"state": "idle", "error": None, "finished_at": time.time(),
+                                 "last_version": version.version_id}
+        finally:
+            self._build_lock.release()
+        if self.on_built is not None:
+            try:
+                self.on_built(version)
+            except Exception as e:
+                print(f"⚠️ Index build callback failed: {e}")
+        return version
+
+    def build_in_background(self, build_fn, validate_fn, prepare_fn=None) -> bool:
+        """Start ``build`` on a background thread; returns False if a build is already running"""
+        if self._build_lock.locked():
+            return False
+
+        def run():
+            try:
+                self.build(build_fn, validate_fn, prepare_fn)
+            except Exception as e:
+                print(f"❌ Background index build failed: {e}")
+
+        threading.Thread(target=run, name="index-build", daemon=True).start()
+        return True
+
+    @property
+    def building(self) -> bool:
+        return self._build_lock.locked()
+
+    def swap(self, version: IndexVersion) -> bool:
+        """Make ``version`` active; the previous one goes to standby for rollback.
+
+        Returns False (and changes nothing) once the manager is closed.
+        """
+        with self._lock:
+            if self.closed:
+                return False
+            previous = self.active
+            if version in self.standby:
+                self.standby.remove(version)
+            self.active = version
+            if previous is not None:
+                self.standby.insert(0, previous)
+            expired = self.standby[self.keep_versions:]
+            self.standby = self.standby[:self.keep_versions]
+        print(f"🔁 Index version {version.version_id} is now active")
+        for old in expired:
+            self._retire(old)
+        return True
+
+    def rollback(self, version_id: Optional[str] = None) -> IndexVersion:
+        """Swap back to a standby version (the most recent one by default)"""
+        with self._lock:
+            candidates = [v for v in self.standby if version_id is None or v.version_id == version_id]
+        if not candidates:
+            raise ValueError(f"No standby index version {version_id or ''}".strip())
+        self.swap(candidates[0])
+        return candidates[0]
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.base_dir, MANIFEST_FILE)
+
+    def close(self, keep_active: bool = False, metadata: Optional[Dict] = None):
+        """Release every version, e.g. when the corpus owning this index is unloaded.
+
+        With ``keep_active`` the active version's directory stays on disk and is
+        described, together with ``metadata``, in a manifest for ``reopen``;
+        every other version is deleted, and a build still running is
+        discarded when it finishes.
+        """
+        with self._lock:
+            self.closed = True
+            active = self.active
+            versions = [v for v in self.standby if v is not None]
+            self.active = None
+            self.standby = []
+        if active is not None and keep_active and active.path and os.path.isdir(active.path):
+            manifest = {**(metadata or {}), "version": active.version_id, "path": active.path,
+                        "chunks": active.chunk_count, "created_at": active.created_at}
+            try:
+                os.makedirs(self.base_dir, exist_ok=True)
+                tmp_path = self.manifest_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f)
+                os.replace(tmp_path, self.manifest_path)
+                # Dropping the references releases the Chroma client; the files stay
+                active.vectorstore = None
+                active.qa_chain = None
+                active.centroids = None
+                print(f"💾 Kept index version {active.version_id} on disk")
+                active = None
+            except OSError as e:
+                print(f"⚠️ Could not write index manifest {self.manifest_path}: {e}")
+        if active is not None:
+            versions.insert(0, active)
+        for version in versions:
+            self._retire(version)
+
+    def reopen(self, open_fn: Callable[[str, str, Dict], IndexVersion],
+               accept: Callable[[Dict], bool] = lambda manifest: True) -> Optional[IndexVersion]:
+        """Make the version kept by ``close(keep_active=True)`` active again.
+
+        ``open_fn(version_id, path, manifest)`` opens, validates and prepares
+        it. Returns None (and deletes the kept version) if there is none, it
+        is not ``accept``-ed (e.g. the profiles changed since) or it fails to open.
+        """
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # One chance only: a kept version is either reopened now or rebuilt
+        os.remove(self.manifest_path)
+        path = manifest.get("path")
+        if not path or not os.path.isdir(path):
+            return None
+        if not accept(manifest):
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        try:
+            version = open_fn(manifest["version"], path, manifest)
+        except Exception as e:
+            print(f"⚠️ Could not reopen index version {manifest.get('version')}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        if not self.swap(version):
+            self._delete(version)
+            return None
+        return version
+
+    def _retire(self, version: IndexVersion):
+        """Delete a version once its in-flight queries have drained"""
+        with self._lock:
+            version.retiring = True
+            drained = version.in_flight == 0
+        if drained:
+            self._delete(version)
+
+    def _delete(self, version: IndexVersion):
+        try:
+            if version.vectorstore is not None and version.path:
+                version.vectorstore.delete_collection()
+        except Exception:
+            pass
+        version.vectorstore = None
+        version.qa_chain = None
+        version.centroids = None
+        if version.path and os.path.isdir(version.path):
+            shutil.rmtree(version.path, ignore_errors=True)
+        print(f"🗑️ Retired index version {version.version_id}")
+
+    def _prune_untracked(self):
+        """Remove version directories left behind by earlier processes"""
+        if not os.path.isdir(self.base_dir):
+            return
+        with self._lock:
+            tracked = {v.path for v in [self.active] + self.standby if v is not None and v.path}
+        for entry in os.listdir(self.base_dir):
+            path = os.path.join(self.base_dir, entry)
+            if entry.startswith("v") and os.path.isdir(path) and path not in tracked:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                "active": self.active.to_dict() if self.active else None,
+                "standby": [v.to_dict() for v in self.standby],
+                "building": self.building,
+                "build": dict(self.build_status),
+                "keep_versions": self.keep_versions,
+            }
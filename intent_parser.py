@@ -0,0 +1,164 @@
+"""
+Intent parser
+=============
+
+Recognises deterministic questions that can be answered exactly from the
+profile indexes instead of the RAG chain:
+
+* "who works at X" / "who worked for X"            -> company lookup
+* "who studied at Y" / "alumni of Y"               -> school lookup
+* "who knows Z" / "how many people know Z"         -> skill lookup
+* "list people in Bengaluru" / "who is based in X" -> location lookup
+* "who is currently employed at X"                 -> current position lookup
+* "who has more than 2 years of ML experience",
+  "who worked at X for at least 1 year",
+  "people with over 5 years of experience"         -> tenure range lookups
+
+Prefixing any of them with "how many" asks for the count only. Anything
+else (comparisons, explanations, open-ended questions) returns None and is
+left to the LLM.
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+INTENT_COMPANY = "company"
+INTENT_SCHOOL = "school"
+INTENT_SKILL = "skill"
+INTENT_LOCATION = "location"
+INTENT_CURRENT_COMPANY = "current_company"
+INTENT_SKILL_TENURE = "skill_tenure"
+INTENT_COMPANY_TENURE = "company_tenure"
+INTENT_TOTAL_TENURE = "total_tenure"
+TENURE_INTENTS = (INTENT_SKILL_TENURE, INTENT_COMPANY_TENURE, INTENT_TOTAL_TENURE)
+
+_SUBJECT = r"(?:who|which people|which candidates|list (?:all )?(?:the )?people|show (?:all )?(?:the )?people|" \
+           r"find (?:all )?(?:the )?people|people|anyone|everyone|profiles)"
+_COUNT_SUBJECT = r"how many(?: people| profiles| candidates| persons| of them)?"
+_QUANTITY = r"(?P<operator>more than|over|at least|a minimum of|minimum|less than|under|fewer than|up to|at most)?\s*" \
+            r"(?P<number>\d+(?:\.\d+)?|an?|one|two|three|four|five|six|seven|eight|nine|ten)\s*(?P<plus>\+)?\s*" \
+            r"(?P<unit>years?|yrs?|months?|mos?)"
+
+NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+                "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10}
+
+# Checked in order: current-position and tenure questions first, since their
+# phrasing also fits the plain company and skill patterns
+PATTERNS = (
+    (INTENT_CURRENT_COMPANY, re.compile(
+        r"^(?:(?:{subject}|{count})\s+)?(?:who\s+|that\s+)?(?:(?:is|are)\s+)?currently\s+"
+        r"(?:works?|working|employed|interning|interns?)\s+(?:at|for|with|by)\s+(?P<argument>.+)$")),
+    (INTENT_CURRENT_COMPANY, re.compile(
+        r"^(?:{subject}|{count})\s+(?:who\s+|that\s+)?(?:(?:is|are)\s+)?(?:works?|working|employed)\s+"
+        r"(?:at|for|with|by)\s+(?P<argument>.+?)\s+(?:currently|now|right now|at present|today)$")),
+    (INTENT_COMPANY_TENURE, re.compile(
+        r"^(?:{subject}|{count})\s+(?:who\s+|that\s+)?(?:(?:has|have)\s+)?(?:worked|been working|been|was|were|works?)\s+"
+        r"(?:at|for|with)\s+(?P<argument>.+?)\s+for\s+{quantity}$")),
+    (INTENT_COMPANY_TENURE, re.compile(
+        r"^(?:{subject}|{count})\s+(?:who\s+|that\s+)?(?:has|have|with)\s+{quantity}\s+(?:of\s+)?"
+        r"(?:experience\s+)?at\s+(?P<argument>.+)$")),
+    (INTENT_SKILL_TENURE, re.compile(
+        r"^(?:{subject}|{count})\s+(?:who\s+|that\s+)?(?:has|have|with)\s+{quantity}\s+(?:of\s+)?"
+        r"(?:(?P<argument>.+?)\s+)?(?:work\s+)?(?:experience|exp)(?:\s+(?:in|with|of)\s+(?P<argument2>.+))?$")),
+    (INTENT_SKILL_TENURE, re.compile(
+        r"^(?:{subject}|{count})\s+(?:who\s+|that\s+)?(?:has|have|with)\s+{quantity}\s+(?:of|in|with)\s+(?P<argument>.+)$")),
+    (INTENT_COMPANY, re.compile(
+        r"^(?:{subject}|{count})\s+(?:who\s+|that\s+)?(?:works?|worked|is working|are working|"
+        r"has worked|have worked|is employed|are employed|was employed|were employed|interned|interns?)"
+        r"\s+(?:at|for|with)\s+(?P<argument>.+)$")),
+    (INTENT_SCHOOL, re.compile(
+        r"^(?:{subject}|{count})\s+(?:who\s+|that\s+)?(?:studied|study|studies|is studying|are studying|"
+        r"went to|go to|goes to|graduated from|attended|attends|attend)\s+(?:at\s+|in\s+|from\s+)?(?P<argument>.+)$")),
+    (INTENT_SCHOOL, re.compile(
+        r"^(?:(?:{subject}|{count})\s+(?:are\s+|is\s+)?)?(?:alumni|graduates|students)\s+(?:of|from)\s+(?P<argument>.+)$")),
+    (INTENT_SKILL, re.compile(
+        r"^(?:{subject}|{count})\s+(?:who\s+|that\s+)?(?:(?:has|have) experience (?:in|with)|"
+        r"(?:is|are) skilled in|knows?|has|have|uses?|works? with|worked with|with)\s+(?P<argument>.+?)(?:\s+skills?)?$")),
+    (INTENT_LOCATION, re.compile(
+        r"^(?:{subject}|{count})\s+(?:who\s+|that\s+)?(?:(?:is|are|lives?|live|works?)\s+)?"
+        r"(?:based in|located in|living in|in|from)\s+(?P<argument>.+)$")),
+)
+PATTERNS = tuple(
+    (kind, re.compile(pattern.pattern.format(subject=_SUBJECT, count=_COUNT_SUBJECT, quantity=_QUANTITY)))
+    for kind, pattern in PATTERNS
+)
+
+# Arguments that signal an open-ended question rather than a lookup
+OPEN_ENDED = re.compile(r"\b(why|how|best|better|compare|most|least|similar|more than|less than|years?)\b")
+
+
+class Intent:
+    __slots__ = ("kind", "argument", "count_only", "min_months", "max_months", "quantity")
+
+    def __init__(self, kind: str, argument: str, count_only: bool = False, min_months: Optional[int] = None,
+                 max_months: Optional[int] = None, quantity: Optional[str] = None):
+        """A lookup; tenure intents bound the months of experience (inclusive) and keep
+        the question's wording of the bound in ``quantity`` ("more than 2 years")"""
+        self.kind = kind
+        self.argument = argument
+        self.count_only = count_only
+        self.min_months = min_months
+        self.max_months = max_months
+        self.quantity = quantity
+
+    def to_dict(self) -> Dict:
+        data = {"kind": self.kind, "argument": self.argument, "count_only": self.count_only}
+        if self.kind in TENURE_INTENTS:
+            data.update(min_months=self.min_months, max_months=self.max_months, quantity=self.quantity)
+        return data
+
+    def __repr__(self) -> str:
+        bounds = f", months={self.min_months}..{self.max_months}" if self.kind in TENURE_INTENTS else ""
+        return f"Intent({self.kind!r}, {self.argument!r}, count_only={self.count_only}{bounds})"
+
+
+def _clean_argument(argument: str) -> str:
+    argument = argument.strip().strip("\"'").strip()
+    return re.sub(r"^the\s+", "", argument, flags=re.IGNORECASE)
+
+
+def _month_bounds(match) -> Tuple[Optional[int], Optional[int]]:
+    """(min, max) months for "more than 2 years", "at least 18 months", "3+ yrs", ..."""
+    number = match.group("number")
+    amount = NUMBER_WORDS[number] if number in NUMBER_WORDS else float(number)
+    months = int(round(amount * (12 if match.group("unit").startswith("y") else 1)))
+    operator = match.group("operator")
+    if operator in ("more than", "over"):
+        return months + 1, None
+    if operator in ("less than", "under", "fewer than"):
+        return None, max(0, months - 1)
+    if operator in ("up to", "at most"):
+        return None, months
+    # "at least", "3+ years" and a bare "2 years of X experience"
+    return months, None
+
+
+def parse_intent(question: str) -> Optional[Intent]:
+    """Return the lookup a question asks for, or None if it needs the LLM"""
+    original = re.sub(r"\s+", " ", question).strip().rstrip("?.! ")
+    text = original.lower()
+    for kind, pattern in PATTERNS:
+        match = pattern.match(text)
+        if not match:
+            continue
+        group = next((name for name in ("argument", "argument2")
+                      if name in pattern.groupindex and match.group(name)), None)
+        argument = ""
+        if group is not None:
+            # Keep the argument as the user wrote it (for the answer) when lowercasing kept offsets
+            argument = original[match.start(group):match.end(group)] if len(original) == len(text) else match.group(group)
+            argument = _clean_argument(argument)
+        if OPEN_ENDED.search(argument.lower()):
+            return None
+
+        count_only = text.startswith("how many")
+        if kind in TENURE_INTENTS:
+            if kind == INTENT_SKILL_TENURE and not argument:
+                kind = INTENT_TOTAL_TENURE
+            min_months, max_months = _month_bounds(match)
+            quantity = text[match.start("operator") if match.group("operator") else match.start("number"):match.end("unit")]
+            return Intent(kind, argument, count_only, min_months, max_months, quantity)
+        if not argument:
+            return None
+        return Intent(kind, argument, count_only)
+    return None
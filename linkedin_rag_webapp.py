@@ -2,30 +2,95 @@ import json
 import os
 import time
 import hashlib
-from typing import List, Dict, Optional
-from flask import Flask, render_template, request, jsonify
+import hmac
+import importlib.util
+import threading
+from typing import TYPE_CHECKING, List, Dict, Optional
+from flask import Flask, Response, g, has_request_context, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import Chroma
-import chromadb
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.llms import Ollama
-from langchain.chains import RetrievalQA
-from langchain.prompts import PromptTemplate
-from langchain.schema import Document
-
-# LinkedIn scraping imports
-try:
-    from linkedin_scraper import Person, actions
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.common.exceptions import WebDriverException
-    LINKEDIN_AVAILABLE = True
-except ImportError:
-    LINKEDIN_AVAILABLE = False
+from circuit_breaker import CircuitBreaker, CircuitOpenError, CallTimeoutError, LLMUnavailableError
+from context_packer import ContextPacker, count_tokens
+from ollama_client import OllamaClient
+from metrics import REGISTRY, QUERY_SECONDS, SCRAPE_JOBS, SCRAPED_PROFILES, record_cache, stage_timer
+from query_router import QueryRouter, ROUTE_INTENT, ROUTE_INDEX, ROUTE_SMALL, ROUTE_LARGE
+from profile_store import ProfileStore, ProfileRecord, ProfileTextCache, to_record
+from index_manager import IndexManager, IndexVersion
+from change_feed import ADDED, UPDATED, IncrementalIndexer
+from freshness import RefreshScheduler
+from url_index import canonicalize_linkedin_url
+from request_profiler import SamplingProfiler, TraceStore, follow
+from profile_similarity import NUMPY_AVAILABLE, ProfileCentroids
+from skill_matrix import SKILL_VOCABULARY, SkillMatrix, canonical_skill
+from entity_normalizer import KINDS as ENTITY_KINDS, KIND_COMPANY
+from intent_parser import (INTENT_COMPANY, INTENT_SCHOOL, INTENT_SKILL, INTENT_LOCATION, INTENT_CURRENT_COMPANY,
+                           INTENT_SKILL_TENURE, INTENT_COMPANY_TENURE, INTENT_TOTAL_TENURE, TENURE_INTENTS,
+                           Intent, parse_intent)
+from response_encoding import (COMPRESSIBLE_MIMETYPES, ORJSON_AVAILABLE, compress_body, dumps_bytes,
+                               negotiate_encoding, parse_fields, project)
+from corpus_manager import CorpusManager, SharedModels, load_corpus_configs
+from pagination import ProfileOrder, decode_cursor, encode_cursor, parse_limit
+from tenure_index import SCOPE_COMPANY, SCOPE_SKILL, SCOPE_TOTAL, TenureIndex, current_month, format_months
+
+# Heavy dependencies (langchain, chromadb, sentence-transformers/torch, selenium)
+# are imported inside the methods that need them, so importing this module and
+# serving endpoints such as /api/summary stays fast.
+if TYPE_CHECKING:
+    from langchain.schema import Document
+
+# LinkedIn scraping dependencies are only checked for here, not imported
+LINKEDIN_AVAILABLE = all(
+    importlib.util.find_spec(module) is not None for module in ("linkedin_scraper", "selenium")
+)
+if not LINKEDIN_AVAILABLE:
     print("⚠️ LinkedIn scraping dependencies not available. Scraping feature will be disabled.")
 
+class ApiJSONProvider(DefaultJSONProvider):
+    """jsonify() through orjson when it is installed, with ?fields= projection of list items"""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs or not ORJSON_AVAILABLE:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj, default=self.default).decode("utf-8")
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        fields = parse_fields(request.args.get("fields")) if has_request_context() else None
+        if fields:
+            obj = project(obj, fields)
+        return self._app.response_class(dumps_bytes(obj, default=self.default), mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = ApiJSONProvider(app)
+
+# Responses of at least this many bytes are gzip/brotli-compressed when the
+# client accepts it (negative: never)
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "5"))
+
+# Flask runs after_request hooks in reverse order of registration: this one is
+# registered first (before CORS(app) below adds its own) so that it runs last,
+# on the final headers and body
+@app.after_request
+def compress_response(response):
+    if (COMPRESS_MIN_BYTES < 0 or response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        return response
+    with stage_timer("response_compression"):
+        response.set_data(compress_body(data, encoding, gzip_level=GZIP_LEVEL, brotli_quality=BROTLI_QUALITY))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
 CORS(app)
 
 def create_html_template():
@@ -516,7 +581,7 @@ def create_html_template():
                      linkedinUrlsInput.value = '';
                      // Refresh the system if it was already set up
                      if (systemReady) {
-                         setupStatus.innerHTML = '<span class="info">ℹ️ New data added. Consider re-setting up the system for updated results.</span>';
+                         setupStatus.innerHTML = '<span class="info">ℹ️ New data added. New profiles will be searchable in a few seconds.</span>';
                      }
                      
                      // Automatically update the database summary
@@ -783,42 +848,314 @@ def create_html_template():
     
     print("✅ HTML template created successfully!")
 
+# Static instruction block. It always comes first and never changes, so every
+# prompt starts with the same bytes and Ollama can reuse the cached prefix.
+QA_PROMPT_PREFIX = """You are a helpful assistant that answers questions about LinkedIn profiles and professional skills.
+Use the following context to answer the question. If you cannot find the answer in the context, say "I don't have enough information to answer this question."
+
+IMPORTANT: When asked about skills, technologies, or specific qualifications:
+1. Always list the NAMES of people who have them
+2. Provide specific evidence from their experience, about section, or education
+3. Be specific about where/how they acquired these skills
+4. If multiple people have the skill, mention ALL of them
+
+Format your response to clearly show who has what skills with evidence. For example:
+- "Neha M has Python skills based on her work as a Developer at Tech Company"
+- "Amee Popat mentions AI/ML in her about section and studied Computer Science"
+- "John Doe has machine learning experience from his role as Data Scientist at AI Corp"
+
+Always mention the person's name when discussing their skills or experience.
+
+"""
+
+def build_qa_prompt(context: str, question: str) -> str:
+    """Build the QA prompt: static prefix first, then the per-request context and question"""
+    return f"{QA_PROMPT_PREFIX}Context: {context}\n\nQuestion: {question}\n\nAnswer:"
+
 class LinkedInRAGApp:
-    def __init__(self, json_file_path: str):
-        """Initialize the RAG application with LinkedIn profiles data"""
+    def __init__(self, json_file_path: str, chroma_dir: Optional[str] = None,
+                 shared: Optional[SharedModels] = None, name: str = "default"):
+        """Initialize the RAG application with LinkedIn profiles data.
+        
+        Corpora in the same process pass the same ``shared`` models and their own ``chroma_dir``.
+        """
+        self.name = name
         self.json_file_path = json_file_path
-        self.profiles_data = self._load_profiles()
-        self.vectorstore = None
-        self.qa_chain = None
-        self.embeddings = None
+        self.shared = shared or SharedModels()
+        self.profile_store = ProfileStore(json_file_path)
+        self.profile_text_cache = ProfileTextCache(on_lookup=lambda hit: record_cache("profile_text", hit))
+        self._load_profiles()
+        self.embeddings = self.shared.embeddings
+        # "hash" uses deterministic hash embeddings instead of the sentence-transformers model
+        self.embedding_backend = os.environ.get("EMBEDDING_BACKEND", "huggingface")
+        
+        # Versioned vector indexes: rebuilds happen beside the live index and
+        # are swapped in once validated, so queries never see a half-built store
+        self.index_manager = IndexManager(
+            base_dir=chroma_dir or os.environ.get("CHROMA_DIR", "./chroma_db"),
+            keep_versions=int(os.environ.get("INDEX_KEEP_VERSIONS", "2"))
+        )
+        self.fallback_chain = self._create_fallback_chain()
+        self._fallback_only = False
+        
+        # Re-embed only the profiles a scrape added, changed or removed
+        self.incremental_indexer = IncrementalIndexer(
+            feed=self.profile_store.change_feed,
+            get_target=self.index_manager.acquire,
+            apply_fn=self._apply_profile_changes,
+            batch_window=float(os.environ.get("INDEXER_BATCH_WINDOW", "1.0")),
+            batch_size=int(os.environ.get("INDEXER_BATCH_SIZE", "64")),
+            on_gap=lambda version: self.setup_vectorstore(background=True)
+        )
+        self.llm = None
+        self.large_llm = None
+        
+        # LLM configuration (override with environment variables)
+        self.ollama_model = os.environ.get("OLLAMA_MODEL", "llama3.2:1b")
+        self.ollama_base_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.llm_request_timeout = float(os.environ.get("LLM_REQUEST_TIMEOUT", "30"))
+        # Keep the model loaded between sporadic queries instead of Ollama's 5m default
+        self.ollama_keep_alive = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+        # Optional larger model for complex questions (e.g. "llama3.1:8b")
+        self.ollama_large_model = os.environ.get("OLLAMA_LARGE_MODEL") or None
+        
+        # Circuit breaker around the LLM so a slow or stopped Ollama daemon
+        # routes queries to the retrieval-only fallback instead of hanging
+        # (one per process: every corpus talks to the same daemon)
+        with self.shared.lock:
+            if self.shared.llm_breaker is None:
+                self.shared.llm_breaker = CircuitBreaker(
+                    name="ollama",
+                    failure_threshold=int(os.environ.get("LLM_FAILURE_THRESHOLD", "3")),
+                    recovery_timeout=float(os.environ.get("LLM_RECOVERY_TIMEOUT", "30")),
+                    call_timeout=float(os.environ.get("LLM_CALL_TIMEOUT", "60"))
+                )
+            # The large model gets its own circuit, so its failures do not cut off the small model
+            if self.ollama_large_model and self.shared.large_llm_breaker is None:
+                self.shared.large_llm_breaker = CircuitBreaker(
+                    name="ollama-large",
+                    failure_threshold=int(os.environ.get("LLM_FAILURE_THRESHOLD", "3")),
+                    recovery_timeout=float(os.environ.get("LLM_RECOVERY_TIMEOUT", "30")),
+                    call_timeout=float(os.environ.get("LARGE_LLM_CALL_TIMEOUT", os.environ.get("LLM_CALL_TIMEOUT", "60")))
+                )
+        self.llm_breaker = self.shared.llm_breaker
+        self.large_llm_breaker = self.shared.large_llm_breaker
+        
+        # Retrieval and context packing: fetch a few more chunks than before and
+        # let the packer fit them to the token budget
+        self.retrieval_fetch_k = int(os.environ.get("RETRIEVAL_FETCH_K", "8"))
+        self.chunk_size = int(os.environ.get("CHUNK_SIZE", "1000"))
+        self.chunk_overlap = int(os.environ.get("CHUNK_OVERLAP", "200"))
+        self.context_packer = ContextPacker(
+            token_budget=int(os.environ.get("CONTEXT_TOKEN_BUDGET", "1000")),
+            max_chunks_per_person=int(os.environ.get("CONTEXT_MAX_CHUNKS_PER_PERSON", "3"))
+        )
+        
+        # Route exact lookups to the indexes and hard questions to the large model
+        self.query_router = QueryRouter(
+            extract_skills=self._extract_skills_from_question,
+            large_model_available=bool(self.ollama_large_model),
+            parse_intent=parse_intent
+        )
+        # People named in full in an intent answer; larger results are counted and truncated
+        self.intent_max_listed = int(os.environ.get("INTENT_MAX_LISTED", "50"))
+        
+        # Skill x profile bitsets, rebuilt on first use after the profiles change
+        self._skill_matrix = None
+        self._skill_matrix_records = None
+        self._skill_matrix_lock = threading.Lock()
+        
+        # Experience tenure index, rebuilt after the profiles change and when the month turns
+        self._tenure_index = None
+        self._tenure_index_records = None
+        self._tenure_index_lock = threading.Lock()
+        
+        # Name-sorted order of the profiles for cursor-paginated listings
+        self._profile_order = None
+        self._profile_order_lock = threading.Lock()
+        
+        # Warm-up state, reported by /readyz
+        self.warmup_state = {"status": "not_started", "steps": {}, "error": None}
         
         # LinkedIn scraping configuration
         self.linkedin_email = "YOUR_LINKEDIN_EMAIL"
         self.linkedin_password = "YOUR_LINKEDIN_PASSWORD"
-        
-    def _load_profiles(self) -> List[Dict]:
+        # "stub" swaps Selenium/linkedin_scraper for synthetic profiles (load tests)
+        self.scraper_backend = os.environ.get("SCRAPER_BACKEND", "selenium")
+        # Profiles already in the store are only re-scraped once they are older
+        # than this many days (unset: never, unless the request forces it)
+        refresh_days = os.environ.get("SCRAPE_REFRESH_MAX_AGE_DAYS")
+        self.scrape_refresh_max_age = float(refresh_days) * 86400 if refresh_days else None
+        
+        # Periodically re-scrape the stalest profiles (REFRESH_INTERVAL_HOURS unset: only on demand)
+        refresh_hours = os.environ.get("REFRESH_INTERVAL_HOURS")
+        self.refresh_scheduler = RefreshScheduler(
+            get_records=lambda: self.profiles_data,
+            refresh_fn=self._refresh_profiles,
+            batch_size=int(os.environ.get("REFRESH_BATCH_SIZE", "10")),
+            budget_seconds=float(os.environ.get("REFRESH_BUDGET_SECONDS", "600")),
+            interval=float(refresh_hours) * 3600 if refresh_hours else None,
+            min_age=self.scrape_refresh_max_age
+        )
+        if self.scraping_available:
+            self.refresh_scheduler.start()
+        
+    def memory_estimate(self) -> int:
+        """Rough bytes held by this corpus: profiles, index chunks and centroids (for eviction)"""
+        size = os.path.getsize(self.json_file_path) if os.path.exists(self.json_file_path) else 0
+        with self.index_manager.acquire() as version:
+            if version is not None:
+                centroids = version.centroids
+                dimensions = centroids.dimensions if centroids is not None else 384
+                size += version.chunk_count * (dimensions * 4 + self.chunk_size)
+                if centroids is not None:
+                    size += centroids.stats()["bytes"]
+        return size
+    
+    def close(self):
+        """Stop background work and release the vector indexes (the corpus is being unloaded).
+        
+        The active index stays on disk for ``reopen_vectorstore`` unless it is
+        behind the profiles (changes not yet indexed), in which case it is deleted.
+        A background build still running is cancelled: its version is deleted
+        when it finishes instead of being swapped into the closed manager.
+        """
+        self.refresh_scheduler.stop()
+        self.incremental_indexer.stop()
+        active = self.index_manager.active
+        up_to_date = active is not None and active.applied_seq >= self.profile_store.change_feed.latest_seq
+        self.index_manager.close(keep_active=up_to_date, metadata=self._index_fingerprint())
+    
+    def _index_fingerprint(self) -> Dict:
+        """What an index kept on disk must match to be reused: the profiles and the chunking"""
+        digest = hashlib.sha1()
+        for profile_id, profile_hash in sorted((record.profile_id, record.content_hash) for record in self.profiles_data):
+            digest.update(f"{profile_id}:{profile_hash};".encode("utf-8"))
+        return {"profiles": digest.hexdigest(), "embedding_backend": self.embedding_backend,
+                "chunk_size": self.chunk_size, "chunk_overlap": self.chunk_overlap}
+    
+    def reopen_vectorstore(self) -> bool:
+        """Serve the index kept on disk when this corpus was last unloaded, if it still
+        matches the profiles; False if it has to be rebuilt"""
+        fingerprint = self._index_fingerprint()
+        self._ensure_llm_clients()
+        version = self.index_manager.reopen(
+            self._open_index_version,
+            accept=lambda manifest: all(manifest.get(key) == value for key, value in fingerprint.items())
+        )
+        if version is None:
+            return False
+        self.incremental_indexer.start()
+        return True
+    
+    def _open_index_version(self, version_id: str, path: str, manifest: Dict) -> IndexVersion:
+        """Open a kept Chroma store without re-embedding, then validate and prepare it like a new build"""
+        from langchain_community.vectorstores import Chroma
+        import chromadb
+        
+        vectorstore = Chroma(
+            collection_name="linkedin_profiles",
+            embedding_function=self._get_embeddings(),
+            persist_directory=path,
+            client_settings=chromadb.config.Settings(
+                anonymized_telemetry=False,
+                allow_reset=True
+            )
+        )
+        version = IndexVersion(version_id, path, vectorstore, chunk_count=manifest.get("chunks", 0))
+        version.applied_seq = self.profile_store.change_feed.latest_seq
+        self._validate_index_version(version)
+        self._prepare_index_version(version)
+        print(f"♻️ Reopened index version {version_id} ({version.chunk_count} chunks)")
+        return version
+    
+    @property
+    def scraping_available(self) -> bool:
+        """Whether profiles can be scraped with the configured scraper backend"""
+        return self.scraper_backend == "stub" or LINKEDIN_AVAILABLE
+    
+    @property
+    def skill_matrix(self) -> SkillMatrix:
+        """The skill incidence matrix for the current profiles"""
+        records = self.profiles_data
+        with self._skill_matrix_lock:
+            if self._skill_matrix_records is not records:
+                with stage_timer("skill_matrix_build"):
+                    self._skill_matrix = SkillMatrix.build(records, self._get_profile_text_lower,
+                                                           entities=self.profile_store.entities)
+                self._skill_matrix_records = records
+            return self._skill_matrix
+    
+    @property
+    def tenure_index(self) -> TenureIndex:
+        """Months of experience per skill, company and overall for the current profiles"""
+        matrix = self.skill_matrix
+        records = self.profiles_data
+        entities = self.profile_store.entities
+        with self._tenure_index_lock:
+            # "Present" roles grow every month, so a new month also means a rebuild
+            if self._tenure_index_records is not records or self._tenure_index.now_month != current_month():
+                with stage_timer("tenure_index_build"):
+                    self._tenure_index = TenureIndex.build(
+                        records, lambda organization: entities.resolve(KIND_COMPANY, organization), matrix.skills_in
+                    )
+                self._tenure_index_records = records
+            return self._tenure_index
+    
+    @property
+    def profile_order(self) -> ProfileOrder:
+        """The current profiles sorted by name, for paging through them"""
+        records = self.profiles_data
+        with self._profile_order_lock:
+            if self._profile_order is None or self._profile_order.records is not records:
+                with stage_timer("profile_order_build"):
+                    self._profile_order = ProfileOrder(records)
+            return self._profile_order
+    
+    @property
+    def vectorstore(self):
+        """Vector store of the active index version"""
+        active = self.index_manager.active
+        return active.vectorstore if active else None
+    
+    @property
+    def qa_chain(self):
+        """QA chain of the active index version (or the fallback chain in fallback-only mode)"""
+        if self._fallback_only:
+            return self.fallback_chain
+        active = self.index_manager.active
+        return active.qa_chain if active else None
+    
+    @property
+    def profiles_data(self) -> List[ProfileRecord]:
+        """All profiles, as compact records with a dict-like get() interface"""
+        return self.profile_store.records
+    
+    def _load_profiles(self) -> List[ProfileRecord]:
         """Load the LinkedIn profiles from JSON file"""
         try:
-            with open(self.json_file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                print(f"✅ Loaded {len(data)} LinkedIn profiles")
-                return data
+            records = self.profile_store.load()
+            print(f"✅ Loaded {len(records)} LinkedIn profiles")
+            return records
         except Exception as e:
             print(f"❌ Error loading JSON file: {e}")
             return []
     
-    def _prepare_documents(self) -> List[Document]:
-        """Convert LinkedIn profiles into LangChain documents"""
+    def _prepare_documents(self, profiles: Optional[List[ProfileRecord]] = None) -> List["Document"]:
+        """Convert LinkedIn profiles (all of them by default) into LangChain documents"""
+        from langchain.schema import Document
+        
         documents = []
         
-        for profile in self.profiles_data:
+        for profile in (self.profiles_data if profiles is None else profiles):
             # Create a comprehensive text representation of each profile
-            profile_text = self._profile_to_text(profile)
+            profile_text = self._get_profile_text(profile)
             
             # Create metadata for the document
             metadata = {
                 "name": profile.get("name", "Unknown"),
                 "linkedin_url": profile.get("linkedin_url", ""),
+                "profile_id": profile.profile_id,
                 "profile_type": "linkedin_profile"
             }
             
@@ -829,6 +1166,14 @@ class LinkedInRAGApp:
         print(f"✅ Created {len(documents)} documents from profiles")
         return documents
     
+    def _get_profile_text(self, profile: ProfileRecord) -> str:
+        """Rendered profile text, rendered once per content hash"""
+        return self.profile_text_cache.get(profile, self._profile_to_text)
+    
+    def _get_profile_text_lower(self, profile: ProfileRecord) -> str:
+        """Lowercased profile text for the skill matchers, rendered once per content hash"""
+        return self.profile_text_cache.get_lower(profile, self._profile_to_text)
+    
     def _profile_to_text(self, profile: Dict) -> str:
         """Convert a LinkedIn profile to searchable text"""
         text_parts = []
@@ -883,73 +1228,189 @@ class LinkedInRAGApp:
         
         return "\n".join(text_parts)
     
-    def setup_vectorstore(self):
-        """Set up the vector store with embeddings"""
-        try:
-            print("🔧 Setting up vector store...")
-            
-            # Initialize embeddings
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2",
-                model_kwargs={'device': 'cpu'}
+    def _get_embeddings(self):
+        """Load the sentence-transformers embedding model on first use (once per process)"""
+        shared = self.shared
+        with shared.lock:
+            if shared.embeddings is None and self.embedding_backend == "hash":
+                # Deterministic stand-in for load tests: no model download
+                from hash_embeddings import HashEmbeddings
+                shared.embeddings = HashEmbeddings()
+            if shared.embeddings is None:
+                from langchain_community.embeddings import HuggingFaceEmbeddings
+                
+                shared.embeddings = HuggingFaceEmbeddings(
+                    model_name="sentence-transformers/all-MiniLM-L6-v2",
+                    model_kwargs={'device': 'cpu'}
+                )
+        self.embeddings = shared.embeddings
+        return self.embeddings
+    
+    def setup_vectorstore(self, background: bool = False) -> bool:
+        """Build a new vector store version and swap it in once it is validated.
+        
+        The current index keeps serving queries while the new one is built. With
+        ``background=True`` the build runs on a separate thread and this returns
+        immediately (False if a build is already running).
+        """
+        self.incremental_indexer.start()
+        if background:
+            return self.index_manager.build_in_background(
+                self._build_index_version, self._validate_index_version, self._prepare_index_version
             )
-            
-            # Prepare documents
-            documents = self._prepare_documents()
-            
-            # Split documents into chunks
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
-                length_function=len,
+        
+        try:
+            self.index_manager.build(
+                self._build_index_version, self._validate_index_version, self._prepare_index_version
             )
-            chunks = text_splitter.split_documents(documents)
-            print(f"✅ Split into {len(chunks)} chunks")
-            
-            # Clear existing ChromaDB directory to avoid compatibility issues
-            import shutil
-            import os
-            if os.path.exists("./chroma_db"):
-                print("🗑️ Removing existing ChromaDB directory...")
-                shutil.rmtree("./chroma_db")
-            
+            return True
+        except Exception as e:
+            print(f"❌ Error setting up vector store: {e}")
+            return False
+    
+    def _build_index_version(self, version_id: str, path: str) -> IndexVersion:
+        """Embed all profiles into a new Chroma store in its own directory"""
+        from langchain_community.vectorstores import Chroma
+        import chromadb
+        import shutil
+        
+        print(f"🔧 Setting up vector store version {version_id}...")
+        
+        # Changes published after this point are replayed onto the new version
+        snapshot_seq = self.profile_store.change_feed.latest_seq
+        
+        # Initialize embeddings (loaded once and reused across rebuilds)
+        self.embeddings = self._get_embeddings()
+        
+        # Prepare documents
+        documents = self._prepare_documents()
+        
+        # Split documents into chunks
+        chunks = self._split_documents(documents)
+        print(f"✅ Split into {len(chunks)} chunks")
+        
+        try:
             # Create vector store with specific ChromaDB settings
-            self.vectorstore = Chroma.from_documents(
+            vectorstore = Chroma.from_documents(
                 documents=chunks,
                 embedding=self.embeddings,
-                persist_directory="./chroma_db",
+                ids=[chunk.metadata["chunk_id"] for chunk in chunks],
+                collection_name="linkedin_profiles",
+                persist_directory=path,
                 client_settings=chromadb.config.Settings(
                     anonymized_telemetry=False,
                     allow_reset=True
                 )
             )
-            
             print("✅ Vector store created successfully!")
-            return True
-            
         except Exception as e:
             print(f"❌ Error setting up vector store: {e}")
             print("🔄 Trying alternative approach...")
+            if os.path.exists(path):
+                shutil.rmtree(path)
             
-            try:
-                # Alternative approach: Create a new ChromaDB instance
-                import shutil
-                import os
-                if os.path.exists("./chroma_db"):
-                    shutil.rmtree("./chroma_db")
-                
-                # Create vector store without persist_directory first
-                self.vectorstore = Chroma.from_documents(
-                    documents=chunks,
-                    embedding=self.embeddings
-                )
-                
-                print("✅ Vector store created successfully (alternative method)!")
-                return True
-                
-            except Exception as e2:
-                print(f"❌ Alternative approach also failed: {e2}")
-                return False
+            # Alternative approach: in-memory store, one collection per version
+            vectorstore = Chroma.from_documents(
+                documents=chunks,
+                embedding=self.embeddings,
+                ids=[chunk.metadata["chunk_id"] for chunk in chunks],
+                collection_name=f"linkedin_profiles_{version_id}"
+            )
+            path = None
+            print("✅ Vector store created successfully (alternative method)!")
+        
+        version = IndexVersion(version_id, path, vectorstore, chunk_count=len(chunks))
+        version.applied_seq = snapshot_seq
+        return version
+    
+    def _split_documents(self, documents: List["Document"], chunk_size: Optional[int] = None,
+                         chunk_overlap: Optional[int] = None) -> List["Document"]:
+        """Split profile documents into overlapping chunks with stable per-profile IDs"""
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size or self.chunk_size,
+            chunk_overlap=self.chunk_overlap if chunk_overlap is None else chunk_overlap,
+            length_function=len,
+            add_start_index=True,
+        )
+        chunks = text_splitter.split_documents(documents)
+        
+        chunk_numbers = {}
+        for chunk in chunks:
+            profile_id = chunk.metadata.get("profile_id", "")
+            chunk_numbers[profile_id] = chunk_numbers.get(profile_id, -1) + 1
+            chunk.metadata["chunk_id"] = f"{profile_id}:{chunk_numbers[profile_id]}"
+        return chunks
+    
+    def _apply_profile_changes(self, version: IndexVersion, upserts, removals):
+        """Replace the chunks of changed profiles in an index version without a full rebuild"""
+        changed_ids = sorted(set(upserts) | set(removals))
+        if not changed_ids:
+            return
+        
+        # Drop every existing chunk of the affected profiles, then embed their new text
+        collection = version.vectorstore._collection
+        collection.delete(where={"profile_id": {"$in": changed_ids}})
+        
+        records = [record for record in (self.profile_store.get(pid) for pid in upserts) if record]
+        chunks = self._split_documents(self._prepare_documents(records)) if records else []
+        if chunks:
+            version.vectorstore.add_documents(chunks, ids=[chunk.metadata["chunk_id"] for chunk in chunks])
+        
+        if version.centroids is not None:
+            self._update_centroids(version, upserts, removals)
+        
+        version.chunk_count = collection.count()
+        print(f"🔄 Incrementally indexed {len(records)} profile(s), removed {len(removals)} "
+              f"(index {version.version_id}: {version.chunk_count} chunks)")
+    
+    def _validate_index_version(self, version: IndexVersion):
+        """Raise if a freshly built index is incomplete or cannot answer a probe search"""
+        stored = version.vectorstore._collection.count()
+        if stored == 0 or stored != version.chunk_count:
+            raise RuntimeError(f"Index has {stored} chunks, expected {version.chunk_count}")
+        if not version.vectorstore.similarity_search("python", k=1):
+            raise RuntimeError("Index returned no results for a probe query")
+    
+    def _prepare_index_version(self, version: IndexVersion):
+        """Give a new index version its own QA chain and centroids so they go live together"""
+        if self.llm is not None:
+            version.qa_chain = self._create_packed_qa_chain(version.vectorstore)
+        self._build_centroids(version)
+    
+    def _build_centroids(self, version: IndexVersion, page_size: int = 5000):
+        """Compute per-profile centroids from the chunk embeddings stored in an index version"""
+        if not NUMPY_AVAILABLE:
+            return
+        collection = version.vectorstore._collection
+        
+        def pages():
+            offset = 0
+            while True:
+                page = collection.get(include=["embeddings", "metadatas"], limit=page_size, offset=offset)
+                if not len(page["ids"]):
+                    return
+                yield [metadata.get("profile_id", "") for metadata in page["metadatas"]], page["embeddings"]
+                offset += len(page["ids"])
+        
+        with stage_timer("centroid_build"):
+            version.centroids = ProfileCentroids.from_chunks(pages())
+    
+    def _update_centroids(self, version: IndexVersion, upserts, removals):
+        """Recompute the centroids of changed profiles from their new chunk embeddings"""
+        for profile_id in removals:
+            version.centroids.remove(profile_id)
+        if not upserts:
+            return
+        page = version.vectorstore._collection.get(
+            where={"profile_id": {"$in": sorted(upserts)}}, include=["embeddings", "metadatas"]
+        )
+        grouped = {profile_id: [] for profile_id in upserts}
+        for metadata, embedding in zip(page["metadatas"], page["embeddings"]):
+            grouped.setdefault(metadata.get("profile_id", ""), []).append(embedding)
+        for profile_id, embeddings in grouped.items():
+            version.centroids.upsert(profile_id, embeddings)
     
     def setup_qa_chain(self):
         """Set up the question-answering chain"""
@@ -957,12 +1418,12 @@ class LinkedInRAGApp:
             print("🔧 Setting up QA chain...")
             
             # Check if vector store is properly initialized
-            if not self.vectorstore:
+            active = self.index_manager.active
+            if active is None:
                 print("❌ Vector store not initialized. Cannot create QA chain.")
                 return False
 
-                 # Initialize Ollama LLM
-            llm = Ollama(model="llama3.2:1b")
+            self._ensure_llm_clients()
             
             # Initialize Ollama LLM with CPU-only model to avoid GPU memory issues
             # try:
@@ -992,41 +1453,12 @@ class LinkedInRAGApp:
             #                 # Create a simple fallback that doesn't require Ollama
             #                 return self._setup_fallback_qa_chain()
             
-            # Create custom prompt template
-            prompt_template = """You are a helpful assistant that answers questions about LinkedIn profiles and professional skills. 
-            Use the following context to answer the question. If you cannot find the answer in the context, say "I don't have enough information to answer this question."
-
-            IMPORTANT: When asked about skills, technologies, or specific qualifications:
-            1. Always list the NAMES of people who have them
-            2. Provide specific evidence from their experience, about section, or education
-            3. Be specific about where/how they acquired these skills
-            4. If multiple people have the skill, mention ALL of them
-
-            Format your response to clearly show who has what skills with evidence. For example:
-            - "Neha M has Python skills based on her work as a Developer at Tech Company"
-            - "Amee Popat mentions AI/ML in her about section and studied Computer Science"
-            - "John Doe has machine learning experience from his role as Data Scientist at AI Corp"
-
-            Always mention the person's name when discussing their skills or experience.
-
-            Context: {context}
-
-            Question: {question}
-
-            Answer:"""
-            
-            prompt = PromptTemplate(
-                template=prompt_template,
-                input_variables=["context", "question"]
-            )
-            
-            # Create QA chain
-            self.qa_chain = RetrievalQA.from_chain_type(
-                llm=llm,
-                chain_type="stuff",
-                retriever=self.vectorstore.as_retriever(search_kwargs={"k": 3}),
-                chain_type_kwargs={"prompt": prompt}
-            )
+            # Create QA chain: retrieve, pack the context to the token budget, generate
+            active.qa_chain = self._create_packed_qa_chain(active.vectorstore)
+            self._fallback_only = False
+            self.llm_breaker.reset()
+            if self.large_llm_breaker is not None:
+                self.large_llm_breaker.reset()
             
             print("✅ QA chain created successfully!")
             return True
@@ -1035,13 +1467,101 @@ class LinkedInRAGApp:
             print(f"❌ Error setting up QA chain: {e}")
             return False
     
+    def _ensure_llm_clients(self):
+        """Create the Ollama clients once per process and reuse their pooled HTTP sessions"""
+        # The request timeout makes a stuck daemon fail fast and trip the circuit breaker
+        shared = self.shared
+        with shared.lock:
+            if shared.llm is None:
+                shared.llm = self._create_llm_client(self.ollama_model)
+            if self.ollama_large_model and shared.large_llm is None:
+                shared.large_llm = self._create_llm_client(self.ollama_large_model)
+                print(f"✅ Using {self.ollama_large_model} for complex questions")
+        self.llm = shared.llm
+        self.large_llm = shared.large_llm
+    
+    def _create_llm_client(self, model: str) -> OllamaClient:
+        """Create an Ollama client with explicit keep-alive and a pooled session"""
+        return OllamaClient(
+            model=model,
+            base_url=self.ollama_base_url,
+            keep_alive=self.ollama_keep_alive,
+            timeout=self.llm_request_timeout
+        )
+    
+    def warm_up(self) -> bool:
+        """Load the embedding model, build the index and ping the LLM so the first request is fast"""
+        state = self.warmup_state
+        state.update({"status": "running", "steps": {}, "error": None, "started_at": time.time()})
+        print("🔥 Warming up RAG system...")
+        
+        try:
+            # Embedding model and a dummy embed
+            step_start = time.perf_counter()
+            self._get_embeddings().embed_query("warm up")
+            state["steps"]["embedding_model"] = round(time.perf_counter() - step_start, 3)
+            
+            # Vector store and QA chain (built unless already set up)
+            step_start = time.perf_counter()
+            if self.vectorstore is None and not self.setup_vectorstore():
+                raise RuntimeError("Failed to setup vector store")
+            if self.qa_chain is None and not self.setup_qa_chain():
+                raise RuntimeError("Failed to setup QA chain")
+            self.vectorstore.similarity_search_by_vector(self._get_embeddings().embed_query("python"), k=1)
+            state["steps"]["vector_search"] = round(time.perf_counter() - step_start, 3)
+        except Exception as e:
+            state.update({"status": "failed", "error": str(e), "finished_at": time.time()})
+            print(f"❌ Warm-up failed: {e}")
+            return False
+        
+        # Load the model into Ollama and run a trivial generation. A failure here
+        # does not block readiness: queries fall back to retrieval-only answers.
+        step_start = time.perf_counter()
+        try:
+            self.llm.load()
+            self.llm_breaker.call(self.llm.invoke, "Reply with OK.")
+            state["steps"]["llm"] = round(time.perf_counter() - step_start, 3)
+        except Exception as e:
+            state["steps"]["llm"] = None
+            state["llm_error"] = str(e)
+            print(f"⚠️ LLM warm-up failed, continuing in fallback mode: {e}")
+        
+        state.update({"status": "ready", "finished_at": time.time()})
+        print("✅ Warm-up complete!")
+        return True
+    
+    def warm_up_with_retries(self, attempts: int = 5, delay: float = 5.0, max_delay: float = 300.0) -> bool:
+        """Retry a failed warm-up after ``delay`` seconds, doubling up to ``max_delay``; stops once the app is ready"""
+        state = self.warmup_state
+        for attempt in range(1, attempts + 1):
+            # A successful /api/setup may have made the app ready in the meantime
+            if attempt > 1 and state["status"] == "ready":
+                return True
+            state.pop("next_retry_at", None)
+            state["attempt"] = attempt
+            if self.warm_up():
+                return True
+            if attempt == attempts:
+                break
+            wait = min(delay * 2 ** (attempt - 1), max_delay)
+            state["next_retry_at"] = time.time() + wait
+            print(f"🔁 Retrying warm-up in {wait:.0f}s (attempt {attempt + 1}/{attempts})")
+            time.sleep(wait)
+        return False
+    
+    def mark_ready(self, via: str):
+        """Report the app as ready after a successful manual setup, even if warm-up failed"""
+        state = self.warmup_state
+        if state["status"] != "ready":
+            state.update({"status": "ready", "error": None, "ready_via": via, "finished_at": time.time()})
+    
     def _setup_fallback_qa_chain(self):
         """Setup a fallback QA chain that doesn't require Ollama"""
         try:
             print("🔧 Setting up fallback QA chain (no LLM required)...")
             
             # Create a simple fallback that uses direct text search
-            self.qa_chain = self._create_fallback_chain()
+            self._fallback_only = True
             
             print("✅ Fallback QA chain created successfully!")
             return True
@@ -1100,30 +1620,249 @@ class LinkedInRAGApp:
     
     def query(self, question: str) -> str:
         """Query the RAG system with a question"""
+        return self.query_with_details(question)["answer"]
+    
+    def query_with_details(self, question: str) -> Dict:
+        """Query the RAG system and return the answer with prompt statistics"""
+        route, intent = self.query_router.classify_with_intent(question)
+        start_time = time.perf_counter()
         try:
-            if not self.qa_chain:
-                return "❌ QA chain not initialized. Please set up the system first."
-            
-            if not self.vectorstore:
-                return "❌ Vector store not initialized. Please set up the system first."
-            
-            # Get answer from the chain
-            result = self.qa_chain.run(question)
+            # Deterministic lookups get exact answers from the indexes
+            if route == ROUTE_INTENT:
+                details = self._answer_from_intent(intent)
+                if details:
+                    return details
+                # Nothing indexed under that name: route it as an ordinary question
+                route = self.query_router.classify(question, intents=False)
+            
+            # Simple skill lookups are answered from the profiles directly
+            if route == ROUTE_INDEX:
+                answer = self._answer_from_index(question)
+                if answer:
+                    return {"answer": answer, "mode": "index", "route": route, "prompt_tokens": 0}
+                route = ROUTE_SMALL
+            
+            # Pin the active index version so a concurrent swap cannot retire it mid-query
+            with self.index_manager.acquire() as version:
+                if version is None:
+                    return {"answer": "❌ Vector store not initialized. Please set up the system first.", "route": route, "prompt_tokens": 0}
+                
+                qa_chain = self.fallback_chain if self._fallback_only else version.qa_chain
+                if not qa_chain:
+                    return {"answer": "❌ QA chain not initialized. Please set up the system first.", "route": route, "prompt_tokens": 0}
+                
+                # Get answer from the chain
+                llm = self.large_llm if route == ROUTE_LARGE else None
+                details = self._run_qa_chain(question, qa_chain, llm=llm)
+                details["route"] = route
+                details["index_version"] = version.version_id
             
             # Enhance the response to highlight names for skill-based questions
             if any(keyword in question.lower() for keyword in ['who has', 'who knows', 'who can', 'find people', 'people with', 'who works with']):
-                result = self._enhance_response_with_names(result, question)
+                with stage_timer("response_enhancement"):
+                    details["answer"] = self._enhance_response_with_names(details["answer"], question)
             
-            return result
+            return details
             
         except Exception as e:
-            return f"❌ Error processing query: {str(e)}"
+            return {"answer": f"❌ Error processing query: {str(e)}", "route": route, "prompt_tokens": 0}
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.query_router.record(route, elapsed)
+            QUERY_SECONDS.observe(elapsed, route=route)
+    
+    def _answer_from_intent(self, intent: Intent) -> Optional[Dict]:
+        """Answer a parsed "who works at X" / "who studied at Y" / "how many people know Z" /
+        "list people in L" / tenure question exactly from the indexes; None if it cannot"""
+        with stage_timer("intent_lookup"):
+            if intent.kind in TENURE_INTENTS or intent.kind == INTENT_CURRENT_COMPANY:
+                matches = self._tenure_matches(intent)
+            else:
+                matches = self._entity_matches(intent)
+        if matches is None:
+            return None
+        
+        count = len(matches)
+        singular, plural = {
+            INTENT_COMPANY: ("works or has worked at {argument}", "work or have worked at {argument}"),
+            INTENT_SCHOOL: ("studied at {argument}", "studied at {argument}"),
+            INTENT_SKILL: ("knows {argument}", "know {argument}"),
+            INTENT_LOCATION: ("is or was based in {argument}", "are or were based in {argument}"),
+            INTENT_CURRENT_COMPANY: ("currently works at {argument}", "currently work at {argument}"),
+            INTENT_SKILL_TENURE: ("has {quantity} of {argument} experience", "have {quantity} of {argument} experience"),
+            INTENT_COMPANY_TENURE: ("has worked at {argument} for {quantity}", "have worked at {argument} for {quantity}"),
+            INTENT_TOTAL_TENURE: ("has {quantity} of experience", "have {quantity} of experience"),
+        }[intent.kind]
+        if count == 1:
+            answer = "✅ 1 person " + singular.format(argument=intent.argument, quantity=intent.quantity)
+        else:
+            answer = f"✅ {count} people " + plural.format(argument=intent.argument, quantity=intent.quantity)
+        
+        if intent.count_only or not count:
+            answer += "."
+        else:
+            lines = []
+            for profile_id, months in matches[:self.intent_max_listed]:
+                record = self.profile_store.get(profile_id)
+                if record is not None:
+                    lines.append(f"• {record.name or 'Unknown'}" + (f" — {format_months(months)}" if months is not None else ""))
+            answer += ":\n" + "\n".join(lines)
+            if count > len(lines):
+                answer += f"\n… and {count - len(lines)} more"
+        
+        return {
+            "answer": answer,
+            "mode": "intent",
+            "route": ROUTE_INTENT,
+            "prompt_tokens": 0,
+            "intent": {**intent.to_dict(), "count": count, "profile_ids": [profile_id for profile_id, _ in matches]}
+        }
+    
+    def _entity_matches(self, intent) -> Optional[List[tuple]]:
+        """(profile ID, None) for people matching a company, school, location or skill intent"""
+        matrix = self.skill_matrix
+        if intent.kind == INTENT_SKILL:
+            try:
+                bits = matrix.query(intent.argument)
+            except ValueError:
+                return None
+        else:
+            bits = matrix.entity_bits(intent.kind, intent.argument)
+            if bits is None:
+                return None
+        return [(profile_id, None) for profile_id in matrix.members(bits)]
+    
+    def _tenure_matches(self, intent) -> Optional[List[tuple]]:
+        """(profile ID, months) for current-position and tenure intents, most experienced first"""
+        tenure = self.tenure_index
+        if intent.kind == INTENT_TOTAL_TENURE:
+            return tenure.months(SCOPE_TOTAL, "", intent.min_months, intent.max_months)
+        
+        if intent.kind == INTENT_SKILL_TENURE:
+            skill = canonical_skill(intent.argument)
+            if skill not in self.skill_matrix.skill_bits:
+                return None
+            return tenure.months(SCOPE_SKILL, skill, intent.min_months, intent.max_months)
+        
+        entity_ids = self.profile_store.entities.search(KIND_COMPANY, intent.argument)
+        if not entity_ids:
+            return None
+        if intent.kind == INTENT_CURRENT_COMPANY:
+            current = set()
+            for entity_id in entity_ids:
+                current |= tenure.current_at(entity_id)
+            names = {profile_id: (self.profile_store.get(profile_id) or {}).get("name") or "" for profile_id in current}
+            return [(profile_id, None) for profile_id in sorted(current, key=names.get)]
+        
+        # Several entities can match ("infosys" -> "Infosys Springboard"); keep each person's longest tenure
+        best = {}
+        for entity_id in entity_ids:
+            for profile_id, months in tenure.months(SCOPE_COMPANY, entity_id, intent.min_months, intent.max_months):
+                best[profile_id] = max(months, best.get(profile_id, 0))
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)
+    
+    def _answer_from_index(self, question: str) -> Optional[str]:
+        """Answer a simple skill lookup from the skill analysis without calling the LLM"""
+        with stage_timer("skill_analysis"):
+            skill_analysis = self._analyze_skills_by_section(question)
+        if not skill_analysis:
+            return None
+        return self._format_skill_analysis(skill_analysis, "").rstrip()
+    
+    def _run_qa_chain(self, question: str, qa_chain, llm=None) -> Dict:
+        """Run the QA chain, falling back to retrieval-only answers when the LLM is unavailable.
+        
+        Retrieval errors are not LLM failures: they propagate instead of opening the circuit.
+        """
+        if qa_chain is self.fallback_chain:
+            return {"answer": qa_chain.run(question), "mode": "fallback", "prompt_tokens": 0}
+        
+        try:
+            return qa_chain.run_with_details(question, llm)
+        except LLMUnavailableError as e:
+            print(f"⚠️ {e}, answering in fallback mode")
+        
+        return {"answer": self.fallback_chain.run(question), "mode": "fallback", "prompt_tokens": 0}
+    
+    def _generate(self, prompt_text: str, llm=None) -> str:
+        """Generate through the circuit breaker of the model; only this call counts towards
+        opening a circuit. Raises LLMUnavailableError if no model answered."""
+        if llm is not None and llm is self.large_llm and self.large_llm_breaker is not None:
+            try:
+                return self.large_llm_breaker.call(follow(llm.invoke), prompt_text)
+            except CircuitOpenError:
+                print("⚠️ Large LLM circuit open, answering with the small model")
+            except CallTimeoutError as e:
+                print(f"⚠️ Large LLM call timed out, answering with the small model: {e}")
+            except Exception as e:
+                print(f"⚠️ Large LLM call failed, answering with the small model: {e}")
+        
+        try:
+            # follow(): the breaker runs the call on its executor, out of the request profiler's sight otherwise
+            return self.llm_breaker.call(follow(self.llm.invoke), prompt_text)
+        except CircuitOpenError as e:
+            raise LLMUnavailableError("LLM circuit open") from e
+        except CallTimeoutError as e:
+            raise LLMUnavailableError(f"LLM call timed out: {e}") from e
+        except Exception as e:
+            raise LLMUnavailableError(f"LLM call failed: {e}") from e
+    
+    def _answer_with_llm(self, question: str, llm=None, vectorstore=None) -> Dict:
+        """Retrieve chunks, pack them into the token budget and ask the LLM"""
+        vectorstore = vectorstore or self.vectorstore
+        
+        with stage_timer("embed_question"):
+            question_embedding = self.embeddings.embed_query(question)
+        
+        # Results come back best first (smallest distance)
+        with stage_timer("vector_search"):
+            scored_docs = vectorstore.similarity_search_by_vector_with_relevance_scores(
+                question_embedding, k=self.retrieval_fetch_k
+            )
+        
+        with stage_timer("prompt_construction"):
+            packed = self.context_packer.pack(scored_docs)
+            prompt_text = build_qa_prompt(packed.text, question)
+            prompt_tokens = count_tokens(prompt_text)
+        
+        with stage_timer("llm_generation"):
+            answer = self._generate(prompt_text, llm)
+        
+        return {
+            "answer": answer,
+            "mode": "llm",
+            "prompt_tokens": prompt_tokens,
+            "context": packed.to_dict()
+        }
+    
+    def _create_packed_qa_chain(self, vectorstore):
+        """Create the retrieval QA chain that packs context to the token budget"""
+        class PackedQAChain:
+            def __init__(self, rag_app, vectorstore):
+                self.rag_app = rag_app
+                self.vectorstore = vectorstore
+            
+            def run(self, question):
+                return self.run_with_details(question)["answer"]
+            
+            def run_with_details(self, question, llm=None):
+                return self.rag_app._answer_with_llm(question, llm=llm, vectorstore=self.vectorstore)
+        
+        return PackedQAChain(self, vectorstore)
     
     def _enhance_response_with_names(self, response: str, question: str) -> str:
         """Enhance response to better highlight names and skills with evidence"""
         # Get detailed skill analysis for the question
-        skill_analysis = self._analyze_skills_by_section(question)
+        with stage_timer("skill_analysis"):
+            skill_analysis = self._analyze_skills_by_section(question)
         
+        if skill_analysis:
+            return self._format_skill_analysis(skill_analysis, response)
+        
+        return response
+    
+    def _format_skill_analysis(self, skill_analysis: Dict, response: str) -> str:
+        """The names per skill and section from ``_analyze_skills_by_section``, followed by ``response``"""
         if skill_analysis:
             # Build simplified response with just names
             result = f"📋 Skills Analysis:\n\n"
@@ -1179,6 +1918,10 @@ class LinkedInRAGApp:
             }
             
             for profile in self.profiles_data:
+                # Skip profiles whose rendered text never mentions the skill
+                if skill.lower() not in self._get_profile_text_lower(profile):
+                    continue
+                
                 name = profile.get("name", "Unknown")
                 
                 # Check experience section
@@ -1224,21 +1967,8 @@ class LinkedInRAGApp:
         """Extract skills mentioned in the question"""
         question_lower = question.lower()
         
-        # Common skills to look for
-        skills = [
-            'python', 'java', 'javascript', 'ai', 'ml', 'machine learning',
-            'deep learning', 'data science', 'web development', 'cloud',
-            'sql', 'react', 'angular', 'node.js', 'django', 'flask',
-            'artificial intelligence', 'neural networks', 'computer vision',
-            'natural language processing', 'big data', 'hadoop', 'spark',
-            'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'devops',
-            'c++', 'c#', 'php', 'ruby', 'swift', 'kotlin', 'scala',
-            'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-            'matplotlib', 'seaborn', 'plotly', 'jupyter', 'git', 'github'
-        ]
-        
         found_skills = []
-        for skill in skills:
+        for skill in SKILL_VOCABULARY:
             if skill in question_lower:
                 found_skills.append(skill)
         
@@ -1246,44 +1976,177 @@ class LinkedInRAGApp:
     
 
     
+    def query_skills(self, expression: str) -> Dict:
+        """People matching a boolean skill expression (e.g. "python AND aws"), without the LLM"""
+        matrix = self.skill_matrix
+        bits = matrix.query(expression)
+        people = []
+        for profile_id in matrix.members(bits):
+            record = self.profile_store.get(profile_id)
+            if record is not None:
+                people.append({"profile_id": profile_id, "name": record.name, "linkedin_url": record.linkedin_url})
+        return {"query": expression, "count": matrix.count(bits), "people": people}
+    
+    def query_tenure(self, skill: Optional[str] = None, company: Optional[str] = None, min_months: Optional[int] = None,
+                     max_months: Optional[int] = None, current: bool = False) -> Optional[Dict]:
+        """People by months of experience in a skill, at a company or overall (or currently at a
+        company); None if the skill or company is unknown"""
+        if current:
+            intent = Intent(INTENT_CURRENT_COMPANY, company or "")
+        elif skill:
+            intent = Intent(INTENT_SKILL_TENURE, skill, min_months=min_months, max_months=max_months)
+        elif company:
+            intent = Intent(INTENT_COMPANY_TENURE, company, min_months=min_months, max_months=max_months)
+        else:
+            intent = Intent(INTENT_TOTAL_TENURE, "", min_months=min_months, max_months=max_months)
+        matches = self._tenure_matches(intent)
+        if matches is None:
+            return None
+        people = []
+        for profile_id, months in matches:
+            record = self.profile_store.get(profile_id)
+            if record is not None:
+                people.append({"profile_id": profile_id, "name": record.name, "linkedin_url": record.linkedin_url,
+                               "months": months})
+        return {"count": len(matches), "people": people}
+    
+    def list_profiles(self, limit: int, cursor: Optional[str] = None, skills: Optional[str] = None,
+                      **entities: Optional[str]) -> Dict:
+        """A page of profiles in name order, optionally only those matching a skill expression and
+        working at ``company``, studying at ``school`` or located in ``location`` (any spelling).
+        Raises ValueError for an invalid cursor or skill expression."""
+        filters = {name: value for name, value in (("skills", skills), *sorted(entities.items())) if value}
+        scope = "&".join(f"{name}={value}" for name, value in filters.items())
+        after = decode_cursor(cursor, scope) if cursor else None
+        
+        order = self.profile_order
+        within = None
+        count = len(order)
+        if filters:
+            matrix = self.skill_matrix
+            if self._skill_matrix_records is not order.records:
+                # The profiles changed in between; fetch both again for the new records
+                order, matrix = self.profile_order, self.skill_matrix
+            within = matrix.query(skills) if skills else matrix.all_bits
+            for kind, name in entities.items():
+                if name:
+                    within &= matrix.entity_bits(kind, name) or 0
+            count = matrix.count(within)
+        
+        records, last_key = order.page(after, limit, within)
+        people = []
+        for record in records:
+            latest = record.experiences[0] if record.experiences else None
+            people.append({"profile_id": record.profile_id, "name": record.name, "linkedin_url": record.linkedin_url,
+                           "title": latest.position_title if latest else None,
+                           "company": latest.organization if latest else None})
+        return {
+            "count": count,
+            "limit": limit,
+            "profiles": people,
+            "next_cursor": encode_cursor(last_key, scope) if last_key is not None else None,
+        }
+    
+    def find_entities(self, kind: str, name: str) -> List[Dict]:
+        """Canonical companies, schools or locations matching ``name`` (any spelling), with their people"""
+        entities = self.profile_store.entities
+        matches = []
+        for entity_id in entities.search(kind, name):
+            people = []
+            for profile_id in sorted(entities.profile_ids(entity_id)):
+                record = self.profile_store.get(profile_id)
+                if record is not None:
+                    people.append({"profile_id": profile_id, "name": record.name, "linkedin_url": record.linkedin_url})
+            matches.append({**entities.describe(entity_id), "people": people})
+        return matches
+    
+    def resolve_profile(self, profile_id: Optional[str] = None, linkedin_url: Optional[str] = None,
+                        name: Optional[str] = None) -> Optional[ProfileRecord]:
+        """Find a profile by ID, any variant of its LinkedIn URL, or (case-insensitive) name"""
+        if profile_id:
+            return self.profile_store.get(profile_id)
+        if linkedin_url:
+            return self.profile_store.get_by_url(linkedin_url)
+        if name:
+            wanted = name.strip().lower()
+            return next((record for record in self.profiles_data if (record.name or "").lower() == wanted), None)
+        return None
+    
+    def find_similar_profiles(self, record: ProfileRecord, k: int = 5) -> List[Dict]:
+        """The ``k`` people whose profiles are closest to ``record``, by centroid cosine similarity"""
+        with self.index_manager.acquire() as version:
+            if version is None or version.centroids is None:
+                raise RuntimeError("Similarity index not available. Please set up the system first.")
+            matches = version.centroids.similar(record.profile_id, k)
+        
+        results = []
+        for profile_id, score in matches:
+            match = self.profile_store.get(profile_id)
+            if match is not None:
+                results.append({
+                    "profile_id": profile_id,
+                    "name": match.name,
+                    "linkedin_url": match.linkedin_url,
+                    "score": round(score, 4)
+                })
+        return results
+    
     def get_profile_summary(self) -> Dict:
         """Get a summary of all profiles in the database"""
         if not self.profiles_data:
             return {"error": "No profiles loaded."}
         
-        # Count skills and technologies mentioned
-        skill_counts = {}
-        for profile in self.profiles_data:
-            profile_text = self._profile_to_text(profile).lower()
-            
-            # Count common skills
-            skills = [
-                'python', 'java', 'javascript', 'ai', 'ml', 'machine learning',
-                'deep learning', 'data science', 'web development', 'cloud',
-                'sql', 'react', 'angular', 'node.js', 'django', 'flask'
-            ]
-            
-            for skill in skills:
-                if skill in profile_text:
-                    skill_counts[skill] = skill_counts.get(skill, 0) + 1
+        # Count skills and technologies mentioned (popcounts over the skill matrix)
+        skill_counts = self.skill_matrix.skill_counts()
         
         summary = {
             "total_profiles": len(self.profiles_data),
-            "top_skills": dict(sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:10])
+            "top_skills": dict(list(skill_counts.items())[:10])
         }
         
         return summary
     
-    def scrape_linkedin_profiles(self, profile_urls: List[str]) -> Dict:
-        """Scrape LinkedIn profiles and add to the database"""
-        if not LINKEDIN_AVAILABLE:
+    def _plan_scrape(self, profile_urls: List[str], force: bool = False) -> tuple:
+        """Canonicalize URLs, drop repeats and skip profiles already stored and fresh.
+        
+        Returns (canonical URLs to scrape, number of URLs skipped).
+        """
+        url_index = self.profile_store.url_index
+        scheduled = []
+        seen = set()
+        skipped = 0
+        for url in profile_urls:
+            canonical = canonicalize_linkedin_url(url)
+            if not canonical or canonical in seen:
+                skipped += 1
+                continue
+            seen.add(canonical)
+            if not force and not url_index.needs_scrape(canonical, self.scrape_refresh_max_age):
+                skipped += 1
+                continue
+            scheduled.append(canonical)
+        return scheduled, skipped
+    
+    def scrape_linkedin_profiles(self, profile_urls: List[str], force: bool = False) -> Dict:
+        """Scrape LinkedIn profiles and add to the database.
+        
+        URLs of profiles already in the database are skipped unless they are
+        due a refresh (``SCRAPE_REFRESH_MAX_AGE_DAYS``) or ``force`` is set.
+        """
+        if not self.scraping_available:
             return {"success": False, "message": "LinkedIn scraping dependencies not available"}
         
+        profile_urls, skipped = self._plan_scrape(profile_urls, force)
+        if not profile_urls:
+            return {"success": True, "message": f"All {skipped} profiles are already in the database, nothing to scrape"}
+        
+        Person, actions = self._scraper_api()
+        
         try:
             print(f"🔍 Starting to scrape {len(profile_urls)} LinkedIn profiles...")
             
             # Create a robust Chrome driver with multiple fallback options
-            driver = self._create_robust_chrome_driver()
+            driver = self._create_scraper_driver()
             if not driver:
                 return {"success": False, "message": "Failed to create Chrome driver. Please check Chrome installation and try again."}
             
@@ -1304,75 +2167,24 @@ class LinkedInRAGApp:
             failed_scrapes = 0
             
             for i, profile_url in enumerate(profile_urls, 1):
-                try:
-                    print(f"📊 Scraping Profile {i}/{len(profile_urls)}: {profile_url}")
-                    
-                    # Use a new driver for each profile
-                    driver = self._create_robust_chrome_driver()
-                    if not driver:
-                        failed_scrapes += 1
-                        print(f"  ⚠️ Failed to create driver for {profile_url}")
-                        continue
-                    
-                    # Login for each profile
-                    try:
-                        actions.login(driver, self.linkedin_email, self.linkedin_password)
-                    except Exception as login_error:
-                        print(f"  ⚠️ Login failed for {profile_url}: {login_error}")
-                        driver.quit()
-                        failed_scrapes += 1
-                        continue
-                    person = Person(profile_url, driver=driver)
-                    
-                    # Process education data and remove duplicates
-                    education_data = [{k: self._clean_text(v) for k, v in edu.__dict__.items()} for edu in person.educations]
-                    education_data = self._remove_duplicate_education(education_data)
-                    
-                    data = {
-                        "name": self._clean_text(person.name),
-                        "about": self._clean_text(person.about),
-                        "experiences": [{k: self._clean_text(v) for k, v in exp.__dict__.items()} for exp in person.experiences],
-                        "education": education_data,
-                        "linkedin_url": self._clean_text(person.linkedin_url)
-                    }
-                    new_profiles.append(data)
-                    successful_scrapes += 1
-                    print(f"  ✅ Successfully scraped: {data['name']}")
-                    driver.quit()
-                    
-                except Exception as e:
+                print(f"📊 Scraping Profile {i}/{len(profile_urls)}: {profile_url}")
+                data = self._scrape_profile(profile_url, Person, actions)
+                if data is None:
                     failed_scrapes += 1
-                    print(f"  ⚠️ Failed to scrape {profile_url}: {e}")
-                    if 'driver' in locals():
-                        driver.quit()
-            
-            # Load existing data and combine
-            existing_data = self.profiles_data.copy()
-            combined_data = existing_data + new_profiles
-            
-            # Remove duplicate profiles based on LinkedIn URL
-            seen_urls = set()
-            unique_data = []
-            duplicates_removed = 0
-            
-            for profile in combined_data:
-                linkedin_url = profile.get('linkedin_url', '')
-                if linkedin_url and linkedin_url not in seen_urls:
-                    seen_urls.add(linkedin_url)
-                    unique_data.append(profile)
-                else:
-                    duplicates_removed += 1
+                    continue
+                new_profiles.append(data)
+                successful_scrapes += 1
             
-            # Save combined results to JSON file
-            with open(self.json_file_path, "w", encoding="utf-8") as f:
-                json.dump(unique_data, f, indent=4, ensure_ascii=False)
+            SCRAPED_PROFILES.inc(successful_scrapes, outcome="success")
+            SCRAPED_PROFILES.inc(failed_scrapes, outcome="failed")
             
-            # Update the profiles data
-            self.profiles_data = unique_data
+            merge = self._merge_scraped_profiles(new_profiles)
             
-            message = f"Successfully scraped {successful_scrapes} profiles, {failed_scrapes} failed. Total profiles: {len(unique_data)}"
-            if duplicates_removed > 0:
-                message += f" ({duplicates_removed} duplicates removed)"
+            message = f"Successfully scraped {successful_scrapes} profiles, {failed_scrapes} failed. Total profiles: {len(self.profiles_data)}"
+            if merge["updated"] or merge["unchanged"]:
+                message += f" ({merge['updated']} refreshed with changes, {merge['unchanged']} unchanged)"
+            if skipped > 0:
+                message += f". Skipped {skipped} already in the database"
             
             return {"success": True, "message": message}
             
@@ -1391,6 +2203,108 @@ class LinkedInRAGApp:
             else:
                 return {"success": False, "message": f"Scraping failed: {error_msg}"}
     
+    def _scraper_api(self) -> tuple:
+        """The (Person, actions) pair of the configured scraper backend"""
+        if self.scraper_backend == "stub":
+            from stub_scraper import Person, actions
+        else:
+            from linkedin_scraper import Person, actions
+        return Person, actions
+    
+    def _create_scraper_driver(self):
+        """A browser driver for the configured scraper backend (None if Chrome cannot start)"""
+        if self.scraper_backend == "stub":
+            from stub_scraper import StubDriver
+            return StubDriver()
+        return self._create_robust_chrome_driver()
+    
+    def _scrape_profile(self, profile_url: str, Person, actions) -> Optional[Dict]:
+        """Scrape one profile with its own logged-in driver; returns None if it fails"""
+        driver = None
+        try:
+            driver = self._create_scraper_driver()
+            if not driver:
+                print(f"  ⚠️ Failed to create driver for {profile_url}")
+                return None
+            
+            try:
+                actions.login(driver, self.linkedin_email, self.linkedin_password)
+            except Exception as login_error:
+                print(f"  ⚠️ Login failed for {profile_url}: {login_error}")
+                return None
+            person = Person(profile_url, driver=driver)
+            
+            # Process education data and remove duplicates
+            education_data = [{k: self._clean_text(v) for k, v in edu.__dict__.items()} for edu in person.educations]
+            education_data = self._remove_duplicate_education(education_data)
+            
+            data = {
+                "name": self._clean_text(person.name),
+                "about": self._clean_text(person.about),
+                "experiences": [{k: self._clean_text(v) for k, v in exp.__dict__.items()} for exp in person.experiences],
+                "education": education_data,
+                "linkedin_url": self._clean_text(person.linkedin_url) or profile_url,
+                "scraped_at": time.time()
+            }
+            print(f"  ✅ Successfully scraped: {data['name']}")
+            return data
+        except Exception as e:
+            print(f"  ⚠️ Failed to scrape {profile_url}: {e}")
+            return None
+        finally:
+            if driver:
+                driver.quit()
+    
+    def _merge_scraped_profiles(self, new_profiles: List[Dict]) -> Dict[str, int]:
+        """Merge freshly scraped profiles into the store by canonical URL and save.
+        
+        A profile whose content hash is unchanged keeps its stored record and
+        only gets a new ``scraped_at``, so it causes no reindex work.
+        """
+        new_records = list(map(to_record, new_profiles))
+        # /api/scrape and the refresh scheduler both merge; each must see the other's result
+        with self.profile_store.write_lock:
+            merged = {record.profile_id: record for record in self.profiles_data}
+            unchanged = 0
+            for record in new_records:
+                existing = merged.get(record.profile_id)
+                if existing is not None and existing.content_hash == record.content_hash:
+                    existing.scraped_at = record.scraped_at
+                    unchanged += 1
+                else:
+                    merged[record.profile_id] = record
+            
+            changes = self.profile_store.replace_all(list(merged.values()))
+            self.profile_store.save()
+        self.profile_text_cache.retain(record.profile_id for record in self.profiles_data)
+        return {"added": len(changes[ADDED]), "updated": len(changes[UPDATED]), "unchanged": unchanged}
+    
+    def _refresh_profiles(self, records: List[ProfileRecord], deadline: float) -> Dict[str, int]:
+        """Re-scrape ``records`` until ``deadline``; used by the refresh scheduler"""
+        if not self.scraping_available:
+            raise RuntimeError("LinkedIn scraping dependencies not available")
+        
+        Person, actions = self._scraper_api()
+        
+        scraped = []
+        failed = 0
+        for record in records:
+            if time.time() >= deadline:
+                break
+            print(f"🔄 Refreshing {record.name}: {record.linkedin_url}")
+            data = self._scrape_profile(record.linkedin_url, Person, actions)
+            if data is None:
+                failed += 1
+            else:
+                scraped.append(data)
+        
+        SCRAPED_PROFILES.inc(len(scraped), outcome="success")
+        SCRAPED_PROFILES.inc(failed, outcome="failed")
+        result = self._merge_scraped_profiles(scraped) if scraped else {"added": 0, "updated": 0, "unchanged": 0}
+        result["failed"] = failed
+        result["skipped_over_budget"] = len(records) - len(scraped) - failed
+        return result
+    
     def _clean_text(self, text):
         """Clean text by removing newlines"""
         if isinstance(text, str):
@@ -1424,6 +2338,9 @@ class LinkedInRAGApp:
     
     def _create_robust_chrome_driver(self):
         """Create a Chrome driver with multiple fallback options"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
         try:
             # Method 1: Try with webdriver-manager (most reliable)
             try:
@@ -1507,6 +2424,8 @@ class LinkedInRAGApp:
     
     def _get_chrome_options(self):
         """Get optimized Chrome options for LinkedIn scraping"""
+        from selenium.webdriver.chrome.options import Options
+        
         chrome_options = Options()
         
         # Basic options
@@ -1541,8 +2460,167 @@ class LinkedInRAGApp:
         
         return chrome_options
 
-# Initialize the RAG app
-rag_app = LinkedInRAGApp("linkedin_profiless_ls3.json")
+# The RAG app (the default corpus) is created on first use rather than at import time
+_rag_app = None
+_rag_app_lock = threading.Lock()
+DEFAULT_CORPUS = "default"
+
+# Further corpora, chosen per request with ?corpus=<name> or an X-Corpus header,
+# share the embedding model and LLM clients and are unloaded LRU-first when
+# their estimated memory exceeds CORPUS_MEMORY_BUDGET_MB
+shared_models = SharedModels()
+
+def _load_corpus(name: str, json_file_path: str) -> LinkedInRAGApp:
+    chroma_dir = os.path.join(os.environ.get("CHROMA_DIR", "./chroma_db"), "corpora", name)
+    corpus = LinkedInRAGApp(json_file_path, chroma_dir=chroma_dir, shared=shared_models, name=name)
+    # The budget check after the load cannot see the index still being built; re-check once it lands
+    corpus.index_manager.on_built = lambda version: corpus_manager.enforce_budget(keep=name)
+    # Reuse the index kept on disk at the last eviction; otherwise queries get the
+    # setup message until the background build finishes
+    if not corpus.reopen_vectorstore():
+        corpus.setup_vectorstore(background=True)
+    return corpus
+
+corpus_manager = CorpusManager(
+    configs=load_corpus_configs(os.environ.get("CORPORA"), os.environ.get("CORPORA_DIR")),
+    load_fn=_load_corpus,
+    memory_budget=int(float(os.environ.get("CORPUS_MEMORY_BUDGET_MB", "2048")) * 1024 * 1024),
+    max_loaded=int(os.environ.get("CORPUS_MAX_LOADED", "8"))
+)
+
+def _requested_corpus() -> Optional[str]:
+    if not has_request_context():
+        return None
+    return request.args.get("corpus") or request.headers.get("X-Corpus") or None
+
+def get_rag_app(corpus: Optional[str] = None) -> LinkedInRAGApp:
+    """Return the RAG app for a corpus (by default the request's ?corpus= / X-Corpus, else the
+    default corpus), creating it on first call"""
+    global _rag_app
+    name = corpus or _requested_corpus()
+    if name and name != DEFAULT_CORPUS:
+        if not has_request_context():
+            return corpus_manager.get(name)
+        # Pinned for the rest of the request so it cannot be evicted mid-query
+        if g.get("corpus_name") != name:
+            if g.get("corpus_name") is not None:
+                corpus_manager.release(g.corpus_name)
+            g.corpus_app = corpus_manager.acquire(name)
+            g.corpus_name = name
+        return g.corpus_app
+    if _rag_app is None:
+        with _rag_app_lock:
+            if _rag_app is None:
+                _rag_app = LinkedInRAGApp("linkedin_profiless_ls3.json", shared=shared_models)
+    return _rag_app
+
+@app.before_request
+def check_requested_corpus():
+    name = _requested_corpus()
+    if name and name != DEFAULT_CORPUS and name not in corpus_manager:
+        return jsonify({"success": False, "message": f"Unknown corpus '{name}'",
+                        "corpora": [DEFAULT_CORPUS] + corpus_manager.names()}), 404
+
+@app.teardown_request
+def release_corpus(exc):
+    name = g.pop("corpus_name", None)
+    g.pop("corpus_app", None)
+    if name is not None:
+        corpus_manager.release(name)
+
+def _index_size():
+    """Index size gauges read at scrape time"""
+    if _rag_app is None:
+        return {}
+    chunks = 0
+    if _rag_app.vectorstore is not None:
+        try:
+            chunks = _rag_app.vectorstore._collection.count()
+        except Exception:
+            pass
+    return {("profiles",): len(_rag_app.profiles_data), ("chunks",): chunks}
+
+def _circuit_state():
+    if _rag_app is None:
+        return {}
+    return {(): CIRCUIT_STATE_VALUES[_rag_app.llm_breaker.state]}
+
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+REGISTRY.gauge("rag_index_size", "Number of profiles and vector store chunks", ("kind",), callback=_index_size)
+REGISTRY.gauge(
+    "rag_llm_circuit_state", "LLM circuit breaker state (0=closed, 1=half-open, 2=open)",
+    callback=_circuit_state
+)
+
+def start_background_warm_up() -> threading.Thread:
+    """Run the RAG app's warm-up on a background thread"""
+    rag_app = get_rag_app()
+    rag_app.warmup_state["status"] = "pending"
+    thread = threading.Thread(target=rag_app.warm_up_with_retries, kwargs={
+        "attempts": int(os.environ.get("WARMUP_ATTEMPTS", "5")),
+        "delay": float(os.environ.get("WARMUP_RETRY_DELAY", "5")),
+        "max_delay": float(os.environ.get("WARMUP_RETRY_MAX_DELAY", "300")),
+    }, name="rag-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+# Opt-in request profiling: per request with "X-Profile: 1" or "?profile=1", or
+# automatically for queries slower than PROFILE_SLOW_MS (every query is then
+# sampled and only the slow ones are kept)
+PROFILED_PATHS = ("/api/query",)
+PROFILE_SLOW_MS = float(os.environ["PROFILE_SLOW_MS"]) if os.environ.get("PROFILE_SLOW_MS") else None
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL_MS", "5")) / 1000.0
+# Traces keep a hash of the question unless raw questions are explicitly allowed
+PROFILE_KEEP_QUESTIONS = os.environ.get("PROFILE_KEEP_QUESTIONS") == "1"
+# The trace endpoints are disabled unless a token is configured (sent as X-Admin-Token)
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+trace_store = TraceStore(
+    os.environ.get("PROFILE_DIR", "./profile_traces"),
+    max_traces=int(os.environ.get("PROFILE_MAX_TRACES", "50"))
+)
+
+@app.before_request
+def start_request_profiling():
+    if request.path not in PROFILED_PATHS:
+        return
+    requested = request.headers.get("X-Profile") == "1" or request.args.get("profile") == "1"
+    if requested or PROFILE_SLOW_MS is not None:
+        g.profile_requested = requested
+        g.profile_start = time.perf_counter()
+        g.profiler = SamplingProfiler(interval=PROFILE_INTERVAL).start()
+
+@app.after_request
+def finish_request_profiling(response):
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return response
+    
+    wall_ms = (time.perf_counter() - g.profile_start) * 1000.0
+    slow = PROFILE_SLOW_MS is not None and wall_ms >= PROFILE_SLOW_MS
+    body = request.get_json(silent=True) or {}
+    question = str(body.get("question", ""))
+    metadata = {
+        "wall_ms": round(wall_ms, 1),
+        "status": response.status_code,
+        "trigger": "request" if g.profile_requested else "slow",
+        "question_sha256": hashlib.sha256(question.encode("utf-8")).hexdigest()[:16],
+        "question_chars": len(question),
+    }
+    if PROFILE_KEEP_QUESTIONS:
+        metadata["question"] = question[:200]
+    trace = profiler.stop(f"{request.method} {request.path}", metadata)
+    if g.profile_requested or slow:
+        trace_store.save(trace)
+        response.headers["X-Profile-Id"] = trace.trace_id
+    return response
+
+@app.teardown_request
+def stop_request_profiling(exc):
+    # Only left over if the request failed before after_request ran
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.stop(request.path)
 
 @app.route('/')
 def index():
@@ -1553,6 +2631,16 @@ def index():
 def setup_system():
     """Setup the RAG system"""
     try:
+        rag_app = get_rag_app()
+        data = request.get_json(silent=True) or {}
+        
+        # Rebuild on a background thread; the current index keeps serving queries
+        if data.get('background') and rag_app.index_manager.active is not None:
+            rag_app._ensure_llm_clients()
+            if not rag_app.setup_vectorstore(background=True):
+                return jsonify({"success": False, "message": "An index rebuild is already in progress"})
+            return jsonify({"success": True, "message": "Index rebuild started in the background", "building": True})
+        
         # Setup vector store
         if not rag_app.setup_vectorstore():
             return jsonify({"success": False, "message": "Failed to setup vector store"})
@@ -1561,6 +2649,8 @@ def setup_system():
         if not rag_app.setup_qa_chain():
             return jsonify({"success": False, "message": "Failed to setup QA chain"})
         
+        # A failed boot warm-up no longer keeps /readyz at 503
+        rag_app.mark_ready("setup")
         return jsonify({"success": True, "message": "System setup completed successfully!"})
     except Exception as e:
         return jsonify({"success": False, "message": f"Setup failed: {str(e)}"})
@@ -1569,40 +2659,333 @@ def setup_system():
 def ask_question():
     """Ask a question to the RAG system"""
     try:
+        rag_app = get_rag_app()
         data = request.get_json()
         question = data.get('question', '').strip()
         
         if not question:
             return jsonify({"success": False, "message": "Please enter a question."})
         
-        answer = rag_app.query(question)
-        return jsonify({"success": True, "answer": answer})
+        result = rag_app.query_with_details(question)
+        return jsonify({
+            "success": True,
+            "answer": result["answer"],
+            "mode": result.get("mode"),
+            "route": result.get("route"),
+            "prompt_tokens": result.get("prompt_tokens", 0),
+            "context": result.get("context"),
+            "intent": result.get("intent")
+        })
     except Exception as e:
         return jsonify({"success": False, "message": f"Error processing query: {str(e)}"})
 
+@app.route('/api/index/status', methods=['GET'])
+def index_status():
+    """Get the active and standby index versions and build state"""
+    try:
+        rag_app = get_rag_app()
+        status = rag_app.index_manager.status()
+        status["incremental"] = rag_app.incremental_indexer.stats()
+        return jsonify({"success": True, "index": status})
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error getting index status: {str(e)}"})
+
+@app.route('/api/index/rollback', methods=['POST'])
+def index_rollback():
+    """Swap back to a standby index version"""
+    try:
+        rag_app = get_rag_app()
+        data = request.get_json(silent=True) or {}
+        version = rag_app.index_manager.rollback(data.get('version'))
+        return jsonify({"success": True, "message": f"Rolled back to index version {version.version_id}"})
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Rollback failed: {str(e)}"})
+
+@app.route('/api/llm/status', methods=['GET'])
+def llm_status():
+    """Get the state of the LLM circuit breaker"""
+    try:
+        rag_app = get_rag_app()
+        status = {"success": True, "model": rag_app.ollama_model, "circuit": rag_app.llm_breaker.stats()}
+        if rag_app.large_llm_breaker is not None:
+            status.update(large_model=rag_app.ollama_large_model, large_circuit=rag_app.large_llm_breaker.stats())
+        return jsonify(status)
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error getting LLM status: {str(e)}"})
+
+@app.route('/api/router/stats', methods=['GET'])
+def router_stats():
+    """Get per-route query counts and latencies"""
+    try:
+        rag_app = get_rag_app()
+        return jsonify({"success": True, "routes": rag_app.query_router.stats()})
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error getting router stats: {str(e)}"})
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({"status": "ok"})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: 200 once warm-up has finished (always, if warm-up is disabled), 503 before"""
+    warmup_enabled = os.environ.get("WARMUP_ON_BOOT", "0") == "1"
+    state = _rag_app.warmup_state if _rag_app is not None else {"status": "not_started"}
+    ready = state["status"] == "ready" or (not warmup_enabled and state["status"] == "not_started")
+    return jsonify({"ready": ready, "warmup": state}), (200 if ready else 503)
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics"""
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route('/api/skills/query', methods=['GET', 'POST'])
+def skills_query():
+    """People matching a boolean skill expression: ?q=python AND aws (or {"q": ...})"""
+    try:
+        rag_app = get_rag_app()
+        data = request.get_json(silent=True) or {}
+        expression = (data.get('q') or request.args.get('q') or '').strip()
+        if not expression:
+            return jsonify({"success": False, "message": "Please provide a skill expression in q."}), 400
+        try:
+            if 'limit' in request.args or 'cursor' in request.args:
+                limit = parse_limit(request.args.get('limit'))
+                result = {"query": expression, **rag_app.list_profiles(limit, request.args.get('cursor'), skills=expression)}
+            else:
+                result = rag_app.query_skills(expression)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e), "vocabulary": list(SKILL_VOCABULARY)}), 400
+        return jsonify({"success": True, **result})
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error querying skills: {str(e)}"}), 500
+
+@app.route('/api/profiles', methods=['GET'])
+def profiles_list():
+    """A page of profiles in name order: ?limit=50&cursor=<next_cursor of the previous page>,
+    optionally filtered by ?skills=python AND aws, ?company=, ?school= and ?location="""
+    try:
+        rag_app = get_rag_app()
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            page = rag_app.list_profiles(limit, request.args.get('cursor'), skills=request.args.get('skills', '').strip(),
+                                         **{kind: request.args.get(kind, '').strip() for kind in ENTITY_KINDS})
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        return jsonify({"success": True, **page})
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error listing profiles: {str(e)}"}), 500
+
+@app.route('/api/corpora', methods=['GET'])
+def corpora():
+    """Configured corpora, which are loaded, their estimated memory and the eviction budget"""
+    try:
+        stats = corpus_manager.stats()
+        stats["default"] = {"path": "linkedin_profiless_ls3.json", "loaded": _rag_app is not None,
+                            "memory_bytes": _rag_app.memory_estimate() if _rag_app is not None else None}
+        return jsonify({"success": True, **stats})
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error listing corpora: {str(e)}"}), 500
+
+@app.route('/api/entities', methods=['GET'])
+def entities_lookup():
+    """Canonical entities for ?kind=company|school|location&name=..., or index stats without a name"""
+    try:
+        rag_app = get_rag_app()
+        kind = request.args.get('kind', KIND_COMPANY)
+        if kind not in ENTITY_KINDS:
+            return jsonify({"success": False, "message": f"kind must be one of {', '.join(ENTITY_KINDS)}"}), 400
+        name = request.args.get('name', '').strip()
+        if not name:
+            return jsonify({"success": True, "stats": rag_app.profile_store.entities.stats()})
+        return jsonify({"success": True, "kind": kind, "name": name, "entities": rag_app.find_entities(kind, name)})
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error looking up entities: {str(e)}"}), 500
+
+@app.route('/api/tenure', methods=['GET'])
+def tenure_lookup():
+    """People by experience: ?skill=python|company=infosys&min_years=2&max_years=5 (or min_months/max_months),
+    ?company=infosys&current=1 for current employees, ?stats=1 for index stats"""
+    try:
+        rag_app = get_rag_app()
+        if request.args.get('stats'):
+            return jsonify({"success": True, "stats": rag_app.tenure_index.stats()})
+        
+        def bound(name: str) -> Optional[int]:
+            if request.args.get(f'{name}_months'):
+                return int(request.args[f'{name}_months'])
+            if request.args.get(f'{name}_years'):
+                return int(round(float(request.args[f'{name}_years']) * 12))
+            return None
+        
+        try:
+            min_months, max_months = bound('min'), bound('max')
+        except ValueError:
+            return jsonify({"success": False, "message": "Bounds must be numbers."}), 400
+        current = request.args.get('current') in ('1', 'true', 'yes')
+        skill = request.args.get('skill', '').strip() or None
+        company = request.args.get('company', '').strip() or None
+        if current and not company:
+            return jsonify({"success": False, "message": "current=1 needs a company."}), 400
+        
+        result = rag_app.query_tenure(skill, company, min_months, max_months, current)
+        if result is None:
+            return jsonify({"success": False, "message": f"Unknown {'skill' if skill else 'company'}."}), 404
+        return jsonify({"success": True, "min_months": min_months, "max_months": max_months, **result})
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error looking up tenure: {str(e)}"}), 500
+
+@app.route('/api/skills/stats', methods=['GET'])
+def skills_stats():
+    """Skill counts and co-occurrence (?skills=python,aws), or top skills for ?company= / ?school="""
+    try:
+        try:
+            top = int(request.args.get('top', 10))
+        except ValueError:
+            top = 0
+        if top < 1:
+            return jsonify({"success": False, "message": "top must be a positive integer."}), 400
+        
+        matrix = get_rag_app().skill_matrix
+        for kind in ("company", "school"):
+            if request.args.get(kind):
+                return jsonify({"success": True, kind: request.args[kind],
+                                "top_skills": matrix.top_skills_by(kind, request.args[kind], top)})
+        
+        skills = [skill for skill in request.args.get('skills', '').split(',') if skill.strip()]
+        try:
+            pairs = matrix.co_occurrence(skills or None, top=top)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        return jsonify({
+            "success": True,
+            "matrix": matrix.stats(),
+            "skill_counts": matrix.skill_counts(),
+            "co_occurrence": [{"skills": [first, second], "profiles": count} for first, second, count in pairs]
+        })
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error getting skill stats: {str(e)}"}), 500
+
+@app.route('/api/similar', methods=['GET'])
+def similar_profiles():
+    """Profiles similar to the one given by ?profile_id=, ?linkedin_url= or ?name= (top ?k=, default 5)"""
+    try:
+        rag_app = get_rag_app()
+        if not NUMPY_AVAILABLE:
+            return jsonify({"success": False, "message": "Similarity search requires NumPy"}), 503
+        
+        record = rag_app.resolve_profile(
+            profile_id=request.args.get('profile_id'),
+            linkedin_url=request.args.get('linkedin_url'),
+            name=request.args.get('name')
+        )
+        if record is None:
+            return jsonify({"success": False, "message": "Profile not found"}), 404
+        
+        k = max(1, min(int(request.args.get('k', 5)), 100))
+        start_time = time.perf_counter()
+        try:
+            matches = rag_app.find_similar_profiles(record, k)
+        except KeyError:
+            return jsonify({"success": False, "message": "Profile is not indexed yet"}), 404
+        except RuntimeError as e:
+            return jsonify({"success": False, "message": str(e)}), 503
+        
+        return jsonify({
+            "success": True,
+            "profile": {"profile_id": record.profile_id, "name": record.name, "linkedin_url": record.linkedin_url},
+            "similar": matches,
+            "took_ms": round((time.perf_counter() - start_time) * 1000.0, 2)
+        })
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error finding similar profiles: {str(e)}"}), 500
+
+def admin_denied():
+    """Error response unless the request carries the admin token (404 while no token is configured)"""
+    if not ADMIN_TOKEN:
+        return jsonify({"success": False, "message": "Not found"}), 404
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), ADMIN_TOKEN):
+        return jsonify({"success": False, "message": "Admin token required"}), 403
+    return None
+
+@app.route('/api/admin/traces', methods=['GET'])
+def list_traces():
+    """Stored request profiles, newest first"""
+    denied = admin_denied()
+    if denied is not None:
+        return denied
+    return jsonify({"success": True, "traces": trace_store.list()})
+
+@app.route('/api/admin/traces/<trace_id>', methods=['GET'])
+def download_trace(trace_id):
+    """Download a stored profile as speedscope JSON (default) or collapsed stacks (?format=collapsed)"""
+    denied = admin_denied()
+    if denied is not None:
+        return denied
+    trace = trace_store.load(trace_id)
+    if trace is None:
+        return jsonify({"success": False, "message": f"No trace {trace_id}"}), 404
+    
+    if request.args.get("format") == "collapsed":
+        return Response(trace.to_collapsed(), mimetype="text/plain", headers={
+            "Content-Disposition": f"attachment; filename={trace_id}.collapsed.txt"
+        })
+    return Response(json.dumps(trace.to_speedscope()), mimetype="application/json", headers={
+        "Content-Disposition": f"attachment; filename={trace_id}.speedscope.json"
+    })
+
 @app.route('/api/summary', methods=['GET'])
 def get_summary():
     """Get database summary"""
     try:
+        rag_app = get_rag_app()
         summary = rag_app.get_profile_summary()
         return jsonify({"success": True, "summary": summary})
     except Exception as e:
         return jsonify({"success": False, "message": f"Error getting summary: {str(e)}"})
 
+@app.route('/api/refresh', methods=['GET', 'POST'])
+def refresh_profiles():
+    """Freshness status (GET) or re-scrape the stalest profiles now (POST)"""
+    try:
+        rag_app = get_rag_app()
+        scheduler = rag_app.refresh_scheduler
+        if request.method == 'GET':
+            return jsonify(scheduler.stats(rag_app.profiles_data))
+        
+        if not rag_app.scraping_available:
+            return jsonify({"success": False, "message": "LinkedIn scraping dependencies not available. Please install linkedin-scraper and selenium."})
+        
+        data = request.get_json(silent=True) or {}
+        limit = data.get('limit')
+        budget = data.get('budget_seconds')
+        try:
+            result = scheduler.run_once(limit=int(limit) if limit else None,
+                                        budget_seconds=float(budget) if budget else None)
+        except RuntimeError as e:
+            return jsonify({"success": False, "message": str(e)}), 409
+        return jsonify({"success": True, **result})
+        
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Error during refresh: {str(e)}"}), 500
+
 @app.route('/api/scrape', methods=['POST'])
 def scrape_profiles():
     """Scrape LinkedIn profiles"""
     try:
+        rag_app = get_rag_app()
         data = request.get_json()
         urls = data.get('urls', [])
         
         if not urls:
             return jsonify({"success": False, "message": "No URLs provided"})
         
-        if not LINKEDIN_AVAILABLE:
+        if not rag_app.scraping_available:
             return jsonify({"success": False, "message": "LinkedIn scraping dependencies not available. Please install linkedin-scraper and selenium."})
         
-        result = rag_app.scrape_linkedin_profiles(urls)
+        result = rag_app.scrape_linkedin_profiles(urls, force=bool(data.get('force', False)))
+        SCRAPE_JOBS.inc(outcome="success" if result.get("success") else "failed")
         return jsonify(result)
         
     except Exception as e:
@@ -1610,6 +2993,11 @@ def scrape_profiles():
 
 
 
+# Under a WSGI server the module is imported rather than run, so start the
+# optional warm-up here; when run directly it is started below instead
+if __name__ != '__main__' and os.environ.get("WARMUP_ON_BOOT", "0") == "1":
+    start_background_warm_up()
+
 if __name__ == '__main__':
     # Create templates directory if it doesn't exist
     os.makedirs('templates', exist_ok=True)
@@ -1620,5 +3008,9 @@ if __name__ == '__main__':
     print("🚀 Starting LinkedIn RAG Web Application...")
     print("🌐 Open your browser and go to: http://localhost:5000")
     
+    # Only warm up in the reloader's serving process, not the watcher process
+    if os.environ.get("WARMUP_ON_BOOT", "0") == "1" and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_background_warm_up()
+    
     app.run(debug=True, host='0.0.0.0', port=5000)
 
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Load generator for the Flask app
+================================
+
+Drives ``/api/query``, ``/api/summary`` and ``/api/scrape`` with a weighted
+request mix at one or more concurrency levels and reports throughput, tail
+latency and error rate per endpoint.
+
+With ``--local`` everything runs in-process without external services: the
+stub Ollama server (``stub_ollama.py``), hash embeddings
+(``EMBEDDING_BACKEND=hash``) and the stub scraper (``SCRAPER_BACKEND=stub``)
+replace Ollama, the HuggingFace model and Chrome, and the app serves a
+temporary copy of the profiles. Without it, ``--url`` points at a running
+app (scrape requests then hit whatever scraper that app is configured with).
+
+Usage:
+    python load_test.py --local [--concurrency 1 4 16] [--duration 20] [--mix query=8 summary=2 scrape=1]
+    python load_test.py --url http://localhost:5000 --mix query=1 summary=1
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+QUESTIONS = [
+    "Who knows Python?",
+    "Who has machine learning experience?",
+    "Which people have worked as full stack developers?",
+    "Who studied at Dayananda Sagar University?",
+    "Find people with cloud computing skills",
+    "Who has experience in human resources and recruitment?",
+    "Compare the backgrounds of the robotics enthusiasts",
+]
+
+
+def http_json(method: str, url: str, payload=None, timeout: float = 120.0) -> Tuple[int, Dict]:
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read() or b"{}")
+    except urllib.error.HTTPError as e:
+        return e.code, {}
+
+
+def call_endpoint(endpoint: str, base_url: str, rng: random.Random) -> bool:
+    """Make one request; returns True if it succeeded"""
+    if endpoint == "query":
+        status, body = http_json("POST", f"{base_url}/api/query", {"question": rng.choice(QUESTIONS)})
+        return status == 200 and body.get("success", False) and not str(body.get("answer", "")).startswith("❌")
+    if endpoint == "summary":
+        status, body = http_json("GET", f"{base_url}/api/summary")
+        return status == 200 and body.get("success", False)
+    if endpoint == "scrape":
+        url = f"https://www.linkedin.com/in/loadtest-{uuid.uuid4().hex[:12]}/"
+        status, body = http_json("POST", f"{base_url}/api/scrape", {"urls": [url]})
+        return status == 200 and body.get("success", False)
+    raise ValueError(f"Unknown endpoint {endpoint}")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def run_level(base_url: str, concurrency: int, duration: float, mix: Dict[str, int], seed: int) -> Dict:
+    """Run ``concurrency`` workers for ``duration`` seconds and summarize per endpoint"""
+    endpoints = list(mix)
+    weights = [mix[endpoint] for endpoint in endpoints]
+    samples: List[Tuple[str, float, bool]] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int):
+        rng = random.Random(seed + index)
+        local = []
+        while time.perf_counter() < deadline:
+            endpoint = rng.choices(endpoints, weights)[0]
+            start = time.perf_counter()
+            try:
+                ok = call_endpoint(endpoint, base_url, rng)
+            except Exception:
+                ok = False
+            local.append((endpoint, time.perf_counter() - start, ok))
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    result = {"concurrency": concurrency, "seconds": elapsed, "endpoints": {}}
+    for endpoint in endpoints:
+        latencies = [seconds * 1000.0 for name, seconds, _ in samples if name == endpoint]
+        errors = sum(1 for name, _, ok in samples if name == endpoint and not ok)
+        result["endpoints"][endpoint] = {
+            "requests": len(latencies),
+            "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+            "error_rate": errors / len(latencies) if latencies else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": max(latencies) if latencies else 0.0,
+        }
+    result["total_rps"] = len(samples) / elapsed if elapsed else 0.0
+    return result
+
+
+def start_local_app(args, workdir: str) -> str:
+    """Start the stub Ollama server and the app on free local ports; returns the app's base URL"""
+    from stub_ollama import start_stub_server
+
+    ollama = start_stub_server(token_latency=args.token_latency, prompt_latency=args.prompt_latency,
+                               tokens=args.tokens)
+    os.environ.update({
+        "OLLAMA_BASE_URL": f"http://127.0.0.1:{ollama.server_port}",
+        "EMBEDDING_BACKEND": "hash",
+        "SCRAPER_BACKEND": "stub",
+        "STUB_SCRAPE_LATENCY": str(args.scrape_latency),
+        "CHROMA_DIR": os.path.join(workdir, "chroma_db"),
+    })
+
+    profiles_path = os.path.join(workdir, "profiles.json")
+    if args.profiles:
+        from synthetic_profiles import generate_profiles
+        with open(profiles_path, "w", encoding="utf-8") as f:
+            json.dump(generate_profiles(args.profiles), f, ensure_ascii=False)
+    else:
+        shutil.copy("linkedin_profiless_ls3.json", profiles_path)
+
+    import linkedin_rag_webapp as webapp
+    from werkzeug.serving import make_server
+
+    webapp._rag_app = webapp.LinkedInRAGApp(profiles_path)
+    server = make_server("127.0.0.1", 0, webapp.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="load-test-app", daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    status, body = http_json("POST", f"{base_url}/api/setup")
+    if status != 200 or not body.get("success"):
+        raise RuntimeError(f"Setup failed: {body.get('message')}")
+    return base_url
+
+
+def parse_mix(items: List[str]) -> Dict[str, int]:
+    mix = {}
+    for item in items:
+        endpoint, _, weight = item.partition("=")
+        mix[endpoint] = int(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test /api/query, /api/summary and /api/scrape")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running app")
+    target.add_argument("--local", action="store_true", help="Run the app in-process against local stubs")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per concurrency level")
+    parser.add_argument("--mix", nargs="+", default=["query=8", "summary=2", "scrape=1"],
+                        help="Endpoint weights, e.g. query=8 summary=2 scrape=1")
+    parser.add_argument("--profiles", type=int, default=0, help="--local: synthetic profiles (0: the repo's JSON)")
+    parser.add_argument("--token-latency", type=float, default=0.02, help="--local: stub LLM seconds per token")
+    parser.add_argument("--prompt-latency", type=float, default=0.1, help="--local: stub LLM seconds to first token")
+    parser.add_argument("--tokens", type=int, default=40, help="--local: stub LLM tokens per answer")
+    parser.add_argument("--scrape-latency", type=float, default=0.2, help="--local: stub scraper seconds per profile")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", default="load_test_results.json", help="Write results to this file")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    workdir = tempfile.mkdtemp(prefix="rag_load_") if args.local else None
+    try:
+        base_url = start_local_app(args, workdir) if args.local else args.url.rstrip("/")
+        print(f"🎯 Target: {base_url}  mix: {mix}")
+
+        levels = []
+        for concurrency in args.concurrency:
+            level = run_level(base_url, concurrency, args.duration, mix, args.seed)
+            levels.append(level)
+            print(f"📈 concurrency {concurrency}: {level['total_rps']:.1f} req/s")
+            for endpoint, stats in level["endpoints"].items():
+                print(f"   {endpoint:<8} {stats['requests']:>6} req  {stats['throughput_rps']:7.1f}/s  "
+                      f"p50 {stats['p50_ms']:7.1f} ms  p99 {stats['p99_ms']:7.1f} ms  "
+                      f"errors {stats['error_rate']:.1%}")
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"timestamp": time.time(), "target": "local" if args.local else args.url, "mix": mix,
+              "duration": args.duration, "levels": levels}
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
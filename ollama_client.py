@@ -0,0 +1,120 @@
+"""
+Ollama HTTP client
+==================
+
+A small client for the Ollama ``/api/generate`` endpoint that
+
+* reuses one pooled ``requests.Session`` (no new TCP connection per query),
+* sends an explicit ``keep_alive`` with every request so the model stays
+  resident between sporadic queries instead of being unloaded,
+* exposes streaming generation so first-token latency can be measured.
+
+It implements ``invoke(prompt)`` so it can be used wherever the app used the
+LangChain ``Ollama`` LLM.
+"""
+
+import json
+import time
+from typing import Dict, Iterator, Optional
+
+
+class OllamaClient:
+    def __init__(self, model: str, base_url: str = "http://localhost:11434",
+                 keep_alive: str = "30m", timeout: float = 30.0, connect_timeout: float = 3.0,
+                 options: Optional[Dict] = None, pool_size: int = 8):
+        """Create a client for ``model`` served by the Ollama daemon at ``base_url``"""
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.keep_alive = keep_alive
+        self.timeout = (connect_timeout, timeout)
+        self.options = options or {}
+
+        # Imported here so that importing this module stays cheap
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._request_error = requests.RequestException
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _payload(self, prompt: str, stream: bool) -> Dict:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+        }
+        if self.options:
+            payload["options"] = self.options
+        return payload
+
+    def generate(self, prompt: str) -> Dict:
+        """Generate a full response; returns Ollama's JSON (``response`` plus timing fields)"""
+        response = self.session.post(
+            f"{self.base_url}/api/generate",
+            json=self._payload(prompt, stream=False),
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def invoke(self, prompt: str) -> str:
+        """Generate a response and return its text"""
+        return self.generate(prompt).get("response", "")
+
+    def stream(self, prompt: str) -> Iterator[Dict]:
+        """Stream response chunks as they are produced"""
+        with self.session.post(
+            f"{self.base_url}/api/generate",
+            json=self._payload(prompt, stream=True),
+            timeout=self.timeout,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def timed_generate(self, prompt: str) -> Dict:
+        """Stream a response and measure time to first token and total time"""
+        start = time.perf_counter()
+        first_token_at = None
+        parts = []
+        final = {}
+        for chunk in self.stream(prompt):
+            if first_token_at is None and chunk.get("response"):
+                first_token_at = time.perf_counter()
+            parts.append(chunk.get("response", ""))
+            if chunk.get("done"):
+                final = chunk
+        end = time.perf_counter()
+        return {
+            "response": "".join(parts),
+            "first_token_seconds": (first_token_at or end) - start,
+            "total_seconds": end - start,
+            "prompt_eval_count": final.get("prompt_eval_count"),
+            "load_duration_seconds": final.get("load_duration", 0) / 1e9,
+        }
+
+    def load(self) -> bool:
+        """Ask Ollama to load the model (an empty prompt only loads it) and keep it resident"""
+        response = self.session.post(
+            f"{self.base_url}/api/generate",
+            json={"model": self.model, "keep_alive": self.keep_alive},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return True
+
+    def ping(self) -> bool:
+        """Return True if the Ollama daemon answers"""
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self.timeout)
+            return response.ok
+        except self._request_error:
+            return False
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,143 @@
+"""
+Profile similarity
+==================
+
+One L2-normalized centroid per profile (the mean of its normalized chunk
+embeddings), held as rows of a contiguous NumPy matrix. "People similar to
+X" is then a single matrix-vector product and a partial sort over people,
+which takes milliseconds even for 100k profiles. Rows are updated in place
+as profiles change, so the matrix never needs a full rebuild after a
+scrape.
+
+NumPy is optional; ``NUMPY_AVAILABLE`` says whether it can be used.
+"""
+
+import importlib.util
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+
+class ProfileCentroids:
+    def __init__(self, dimensions: int, capacity: int = 1024):
+        """An empty centroid matrix for vectors of ``dimensions`` floats"""
+        # Imported here so that importing this module stays cheap
+        import numpy
+
+        self._np = numpy
+        self.dimensions = dimensions
+        self.matrix = numpy.zeros((max(1, capacity), dimensions), dtype=numpy.float32)
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_chunks(cls, batches: Iterable[Tuple[Sequence[str], Sequence]]) -> Optional["ProfileCentroids"]:
+        """Build from ``(profile IDs, chunk embeddings)`` batches; None if there are no embeddings"""
+        centroids = None
+        sums = {}
+        for profile_ids, embeddings in batches:
+            if centroids is None and len(embeddings):
+                centroids = cls(len(embeddings[0]))
+            if centroids is None:
+                continue
+            for profile_id, vector in zip(profile_ids, centroids._normalized(embeddings)):
+                if profile_id in sums:
+                    sums[profile_id] += vector
+                else:
+                    sums[profile_id] = vector.copy()
+        if centroids is not None:
+            centroids._grow(len(sums))
+            for profile_id, total in sums.items():
+                centroids._set_row(profile_id, total)
+        return centroids
+
+    def _normalized(self, vectors):
+        array = self._np.asarray(vectors, dtype=self._np.float32)
+        if array.ndim == 1:
+            array = array[None, :]
+        norms = self._np.linalg.norm(array, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return array / norms
+
+    def _grow(self, needed: int):
+        if needed <= self.matrix.shape[0]:
+            return
+        capacity = max(needed, self.matrix.shape[0] * 2)
+        grown = self._np.zeros((capacity, self.dimensions), dtype=self._np.float32)
+        grown[:len(self.ids)] = self.matrix[:len(self.ids)]
+        self.matrix = grown
+
+    def _set_row(self, profile_id: str, total):
+        norm = self._np.linalg.norm(total)
+        row = self._rows.get(profile_id)
+        if row is None:
+            row = len(self.ids)
+            self._grow(row + 1)
+            self.ids.append(profile_id)
+            self._rows[profile_id] = row
+        self.matrix[row] = total / norm if norm else total
+
+    def upsert(self, profile_id: str, chunk_embeddings: Sequence):
+        """Set a profile's centroid from its chunk embeddings (removes it if there are none)"""
+        if not len(chunk_embeddings):
+            self.remove(profile_id)
+            return
+        with self._lock:
+            self._set_row(profile_id, self._normalized(chunk_embeddings).sum(axis=0))
+
+    def remove(self, profile_id: str):
+        """Drop a profile, moving the last row into its place to keep the matrix contiguous"""
+        with self._lock:
+            row = self._rows.pop(profile_id, None)
+            if row is None:
+                return
+            last = len(self.ids) - 1
+            if row != last:
+                moved = self.ids[last]
+                self.matrix[row] = self.matrix[last]
+                self.ids[row] = moved
+                self._rows[moved] = row
+            self.ids.pop()
+            self.matrix[last] = 0.0
+
+    def similar(self, profile_id: str, k: int = 5) -> List[Tuple[str, float]]:
+        """The ``k`` profiles closest to ``profile_id`` (excluding itself), best first"""
+        with self._lock:
+            row = self._rows.get(profile_id)
+            if row is None:
+                raise KeyError(profile_id)
+            return self._top_k(self.matrix[row], k, exclude_row=row)
+
+    def similar_to_vector(self, vector: Sequence, k: int = 5) -> List[Tuple[str, float]]:
+        """The ``k`` profiles closest to an arbitrary embedding, best first"""
+        with self._lock:
+            return self._top_k(self._normalized(vector)[0], k)
+
+    def _top_k(self, query, k: int, exclude_row: Optional[int] = None) -> List[Tuple[str, float]]:
+        np = self._np
+        size = len(self.ids)
+        scores = self.matrix[:size] @ query
+        if exclude_row is not None:
+            scores[exclude_row] = -np.inf
+        k = min(k, size - (1 if exclude_row is not None else 0))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[row], float(scores[row])) for row in top]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, profile_id: str) -> bool:
+        return profile_id in self._rows
+
+    def stats(self) -> Dict:
+        return {
+            "profiles": len(self.ids),
+            "dimensions": self.dimensions,
+            "capacity": self.matrix.shape[0],
+            "bytes": int(self.matrix.nbytes),
+        }
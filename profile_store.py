@@ -0,0 +1,323 @@
+"""
+Compact in-memory profile store
+===============================
+
+Profiles scraped with ``linkedin_scraper`` are nested dicts in which every
+experience and education entry carries a set of company metadata keys
+(``website``, ``industry``, ``type``, ``headquarters``, ``company_size``,
+``founded``) that are almost always null. Kept as dicts, that costs gigabytes
+at 100k profiles.
+
+Here each profile, experience and education entry is a ``__slots__`` record:
+
+* fields that are null are simply not stored (the slot holds None),
+* the rarely-set company metadata lives in an optional ``extra`` dict,
+* repeated strings (company and school names, URLs, dates, locations,
+  titles) are interned so each distinct value is held once.
+
+Experience and education records also carry the organization name with the
+scraper's " · Full-time" style suffix split off (``organization``, and
+``employment_type`` for experiences). ``ProfileStore.entities`` indexes the
+canonical companies, schools and locations (see ``entity_normalizer``).
+Experience dates and durations are parsed into month numbers and month
+counts (``start_month``, ``end_month``, ``is_current``, ``duration_months``;
+see ``tenure_index``).
+
+Records keep a dict-like ``get()`` / ``[]`` interface so code written against
+the raw JSON keeps working, and ``to_dict()`` reproduces the on-disk schema.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from change_feed import ADDED, REMOVED, UPDATED, ChangeFeed
+from entity_normalizer import EntityIndex, split_employment_type
+from tenure_index import is_present, parse_duration, parse_month
+from url_index import CanonicalUrlIndex, canonicalize_linkedin_url
+
+# Company metadata filled in by linkedin_scraper only when a company page is scraped
+COMPANY_META_FIELDS = ("website", "industry", "type", "headquarters", "company_size", "founded")
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _Record:
+    __slots__ = ("extra",)
+
+    # Fields (in on-disk order) and those whose values repeat across profiles
+    FIELDS: tuple = ()
+    INTERNED: frozenset = frozenset()
+
+    def _load(self, data: Dict):
+        extra = None
+        for key, value in data.items():
+            if key in self.FIELDS:
+                setattr(self, key, _intern(value) if key in self.INTERNED else value)
+            elif value is not None:
+                if extra is None:
+                    extra = {}
+                extra[key] = _intern(value) if key in COMPANY_META_FIELDS else value
+        for key in self.FIELDS:
+            if not hasattr(self, key):
+                setattr(self, key, None)
+        self.extra = extra
+
+    def get(self, key: str, default=None):
+        """dict.get() compatible access to a field"""
+        if key in self.FIELDS:
+            value = getattr(self, key)
+        elif self.extra is not None:
+            value = self.extra.get(key)
+        else:
+            value = None
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS or (self.extra is not None and key in self.extra)
+
+    def to_dict(self, compact: bool = False) -> Dict:
+        """Convert back to the JSON schema; ``compact`` drops null fields"""
+        data = {}
+        for key in self.FIELDS:
+            value = getattr(self, key)
+            if isinstance(value, tuple):
+                value = [item.to_dict(compact) for item in value]
+            if value is not None or not compact:
+                data[key] = value
+        if not compact:
+            for key in COMPANY_META_FIELDS:
+                data.setdefault(key, None)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+class ExperienceRecord(_Record):
+    FIELDS = ("institution_name", "linkedin_url", "from_date", "to_date", "description",
+              "position_title", "duration", "location")
+    INTERNED = frozenset(("institution_name", "linkedin_url", "from_date", "to_date",
+                          "position_title", "duration", "location"))
+    # Derived at ingest, not part of the on-disk schema
+    __slots__ = FIELDS + ("organization", "employment_type", "start_month", "end_month", "is_current",
+                          "duration_months")
+
+    def __init__(self, data: Dict):
+        self._load(data)
+        organization, employment_type = split_employment_type(self.institution_name)
+        self.organization = _intern(organization)
+        self.employment_type = _intern(employment_type)
+        self.start_month = parse_month(self.from_date)
+        self.is_current = is_present(self.to_date)
+        self.end_month = None if self.is_current else parse_month(self.to_date, end=True)
+        self.duration_months = parse_duration(self.duration)
+        if self.duration_months is None and self.start_month is not None and self.end_month is not None:
+            self.duration_months = self.end_month - self.start_month + 1
+
+
+class EducationRecord(_Record):
+    FIELDS = ("institution_name", "linkedin_url", "from_date", "to_date", "description", "degree")
+    INTERNED = frozenset(("institution_name", "linkedin_url", "from_date", "to_date", "degree"))
+    __slots__ = FIELDS + ("organization",)
+
+    def __init__(self, data: Dict):
+        self._load(data)
+        self.organization = _intern(split_employment_type(self.institution_name)[0])
+
+
+class ProfileRecord(_Record):
+    FIELDS = ("name", "about", "experiences", "education", "linkedin_url")
+    INTERNED = frozenset(("name",))
+    __slots__ = FIELDS + ("profile_id", "content_hash", "scraped_at")
+
+    def __init__(self, data: Dict):
+        data = dict(data)
+        # When the profile was last scraped (epoch seconds); not part of the content hash
+        self.scraped_at = data.pop("scraped_at", None)
+        experiences = tuple(ExperienceRecord(exp) for exp in data.pop("experiences", None) or ())
+        education = tuple(EducationRecord(edu) for edu in data.pop("education", None) or ())
+        self._load(data)
+        self.experiences = experiences
+        self.education = education
+        self.profile_id = make_profile_id(self.linkedin_url, self.name)
+        self.content_hash = content_hash(self.to_dict(compact=True, metadata=False))
+
+    def to_dict(self, compact: bool = False, metadata: bool = True) -> Dict:
+        """Convert back to the JSON schema; ``metadata`` adds ``scraped_at`` when known"""
+        data = {}
+        for key in self.FIELDS:
+            value = getattr(self, key)
+            if isinstance(value, tuple):
+                value = [item.to_dict(compact) for item in value]
+            if value is not None or not compact:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        if metadata and self.scraped_at is not None:
+            data["scraped_at"] = self.scraped_at
+        return data
+
+    def __repr__(self) -> str:
+        return f"ProfileRecord({self.name!r}, {self.linkedin_url!r})"
+
+
+def make_profile_id(linkedin_url: Optional[str], name: Optional[str] = None) -> str:
+    """Stable short identifier for a profile, derived from its canonical LinkedIn URL"""
+    key = canonicalize_linkedin_url(linkedin_url) if linkedin_url else f"name:{name or ''}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def content_hash(profile: Dict) -> str:
+    """Hash of a profile's content, independent of key order and null fields"""
+    canonical = json.dumps(profile, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class ProfileTextCache:
+    def __init__(self, on_lookup: Optional[Callable[[bool], None]] = None):
+        """Rendered profile text keyed by profile ID and content hash.
+
+        The lowercased form the skill matchers scan is derived from the cached
+        text on first use, and shares the text's string when lowercasing
+        changes nothing.
+
+        ``on_lookup(hit)`` is called for every lookup, e.g. to feed hit-rate metrics.
+        """
+        self._entries: Dict[str, list] = {}
+        self._on_lookup = on_lookup
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, record: "ProfileRecord", render) -> list:
+        entry = self._entries.get(record.profile_id)
+        if entry is not None and entry[0] == record.content_hash:
+            self.hits += 1
+            if self._on_lookup:
+                self._on_lookup(True)
+            return entry
+        self.misses += 1
+        if self._on_lookup:
+            self._on_lookup(False)
+        # [content hash, text, lowercased text or None until first asked for]
+        entry = [record.content_hash, render(record), None]
+        self._entries[record.profile_id] = entry
+        return entry
+
+    def get(self, record: "ProfileRecord", render) -> str:
+        """Return the rendered text, rendering with ``render(record)`` on a miss"""
+        return self._entry(record, render)[1]
+
+    def get_lower(self, record: "ProfileRecord", render) -> str:
+        """Return the lowercased rendered text, rendering with ``render(record)`` on a miss"""
+        entry = self._entry(record, render)
+        if entry[2] is None:
+            lower = entry[1].lower()
+            entry[2] = entry[1] if lower == entry[1] else lower
+        return entry[2]
+
+    def invalidate(self, profile_id: str):
+        self._entries.pop(profile_id, None)
+
+    def retain(self, profile_ids: Iterable[str]):
+        """Drop entries for profiles that are no longer in the store"""
+        keep = set(profile_ids)
+        for profile_id in [pid for pid in self._entries if pid not in keep]:
+            del self._entries[profile_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ProfileStore:
+    def __init__(self, json_file_path: str, change_feed: Optional[ChangeFeed] = None):
+        """Profiles backed by the JSON file at ``json_file_path``.
+
+        Changes made through ``replace_all`` are published to ``change_feed``.
+        The canonical-URL index is persisted next to the JSON file.
+        """
+        self.json_file_path = json_file_path
+        self.change_feed = change_feed or ChangeFeed()
+        self.url_index = CanonicalUrlIndex(CanonicalUrlIndex.path_for(json_file_path))
+        self.records: List[ProfileRecord] = []
+        self._by_id: Dict[str, ProfileRecord] = {}
+        self.entities = EntityIndex()
+        # Held by read-modify-write updates (read the records, replace_all, save)
+        # so that concurrent writers do not start from the same snapshot
+        self.write_lock = threading.Lock()
+
+    def load(self) -> List[ProfileRecord]:
+        """Load profiles from the JSON file into compact records"""
+        with open(self.json_file_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        with self.write_lock:
+            self.replace_all(data, publish=False)
+            self.url_index.load()
+            self.url_index.sync(self.records)
+            return self.records
+
+    def save(self):
+        """Write all profiles back to the JSON file in the scraper's schema"""
+        with open(self.json_file_path, "w", encoding="utf-8") as f:
+            json.dump([record.to_dict() for record in self.records], f, indent=4, ensure_ascii=False)
+        self.url_index.sync(self.records)
+        self.url_index.save()
+
+    def replace_all(self, profiles: Iterable, publish: bool = True) -> Dict[str, List[str]]:
+        """Replace the stored profiles (dicts or records) and publish what changed.
+
+        Profiles sharing a profile ID (URL variants of one person) are stored
+        once: the last one wins, in the position of the first.
+        """
+        by_id = {}
+        for profile in profiles:
+            record = to_record(profile)
+            by_id[record.profile_id] = record
+        records = list(by_id.values())
+
+        changes = {ADDED: [], UPDATED: [], REMOVED: []}
+        for profile_id, record in by_id.items():
+            previous = self._by_id.get(profile_id)
+            if previous is None:
+                changes[ADDED].append(profile_id)
+            elif previous.content_hash != record.content_hash:
+                changes[UPDATED].append(profile_id)
+        changes[REMOVED] = [profile_id for profile_id in self._by_id if profile_id not in by_id]
+
+        self.records = records
+        self._by_id = by_id
+        self.entities = EntityIndex.build(records)
+
+        if publish:
+            for kind, profile_ids in changes.items():
+                if profile_ids:
+                    self.change_feed.publish(kind, profile_ids)
+        return changes
+
+    def get(self, profile_id: str) -> Optional[ProfileRecord]:
+        return self._by_id.get(profile_id)
+
+    def get_by_url(self, linkedin_url: str) -> Optional[ProfileRecord]:
+        """Look a profile up by any variant of its LinkedIn URL"""
+        return self._by_id.get(make_profile_id(linkedin_url))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[ProfileRecord]:
+        return iter(self.records)
+
+
+def to_record(profile) -> ProfileRecord:
+    """Convert a profile dict to a ProfileRecord (records are returned unchanged)"""
+    return profile if isinstance(profile, ProfileRecord) else ProfileRecord(profile)
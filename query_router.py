@@ -0,0 +1,121 @@
+"""
+Query router
+============
+
+Chooses how a question is answered, using cheap heuristics only:
+
+* ``intent`` - deterministic lookups ("who works at X", "how many people know
+  Z", "list people in Bengaluru") answered exactly from the profile indexes,
+* ``index`` - simple skill lookups ("who knows Python") answered straight from
+  the skill analysis, no LLM call,
+* ``small`` - ordinary questions, answered by the default (small) model,
+* ``large`` - comparisons, rankings and long open-ended questions, sent to the
+  larger model when one is configured (otherwise to the small one).
+
+Per-route counts and latencies are recorded for monitoring.
+"""
+
+import re
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROUTE_INTENT = "intent"
+ROUTE_INDEX = "index"
+ROUTE_SMALL = "small"
+ROUTE_LARGE = "large"
+ROUTES = (ROUTE_INTENT, ROUTE_INDEX, ROUTE_SMALL, ROUTE_LARGE)
+
+LOOKUP_PHRASES = (
+    'who has', 'who knows', 'who can', 'find people', 'people with',
+    'who works with', 'list people', 'which people', 'anyone with', 'anyone who knows'
+)
+
+COMPLEX_PATTERN = re.compile(
+    r"\b(compare|comparison|contrast|differen\w*|versus|vs\.?|better|best|strongest|"
+    r"rank\w*|why|explain|summari[sz]e|recommend\w*|suitable|trade-?offs?|pros and cons|"
+    r"evaluate|assess|how does|how do)\b"
+)
+
+# Lookups that need more than matching skill keywords are not index-answerable
+NON_LOOKUP_PATTERN = re.compile(r"\b(not|without|except|more than|less than|at least|years?)\b")
+
+
+class QueryRouter:
+    def __init__(self, extract_skills: Callable[[str], List[str]], large_model_available: bool = False,
+                 long_question_words: int = 25, max_lookup_words: int = 12, latency_window: int = 500,
+                 parse_intent: Optional[Callable[[str], object]] = None):
+        """Create a router using ``extract_skills`` (the app's skill extractor) as the lookup signal
+        and ``parse_intent`` (returns None for non-deterministic questions) for exact lookups"""
+        self.extract_skills = extract_skills
+        self.parse_intent = parse_intent
+        self.large_model_available = large_model_available
+        self.long_question_words = long_question_words
+        self.max_lookup_words = max_lookup_words
+
+        self._lock = threading.Lock()
+        self._counts = {route: 0 for route in ROUTES}
+        self._total_seconds = {route: 0.0 for route in ROUTES}
+        self._latencies = {route: deque(maxlen=latency_window) for route in ROUTES}
+
+    def classify(self, question: str, intents: bool = True) -> str:
+        """Return the route for a question (``intents=False`` skips the intent parser)"""
+        return self.classify_with_intent(question, intents)[0]
+
+    def classify_with_intent(self, question: str, intents: bool = True) -> Tuple[str, Optional[object]]:
+        """Return the route and, for ``ROUTE_INTENT``, the parsed intent (so callers do not parse again)"""
+        if intents and self.parse_intent is not None:
+            intent = self.parse_intent(question)
+            if intent is not None:
+                return ROUTE_INTENT, intent
+        return self._classify_open(question), None
+
+    def _classify_open(self, question: str) -> str:
+        question_lower = question.lower().strip()
+        word_count = len(question_lower.split())
+
+        if COMPLEX_PATTERN.search(question_lower) or word_count > self.long_question_words:
+            return ROUTE_LARGE if self.large_model_available else ROUTE_SMALL
+
+        if (word_count <= self.max_lookup_words
+                and any(phrase in question_lower for phrase in LOOKUP_PHRASES)
+                and not NON_LOOKUP_PATTERN.search(question_lower)
+                and self._whole_word_skills(question_lower)):
+            return ROUTE_INDEX
+
+        return ROUTE_SMALL
+
+    def _whole_word_skills(self, question_lower: str) -> List[str]:
+        # The skill extractor matches substrings ('ai' in 'maintain'); only
+        # route to the index when a skill appears as a whole word
+        return [skill for skill in self.extract_skills(question_lower)
+                if re.search(r"(?<![\w])" + re.escape(skill) + r"(?![\w])", question_lower)]
+
+    def record(self, route: str, seconds: float):
+        """Record the latency of a routed query"""
+        with self._lock:
+            self._counts[route] += 1
+            self._total_seconds[route] += seconds
+            self._latencies[route].append(seconds)
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> Optional[float]:
+        if not values:
+            return None
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = {}
+            for route in ROUTES:
+                count = self._counts[route]
+                window = list(self._latencies[route])
+                stats[route] = {
+                    "count": count,
+                    "avg_seconds": self._total_seconds[route] / count if count else None,
+                    "p50_seconds": self._percentile(window, 50),
+                    "p95_seconds": self._percentile(window, 95),
+                }
+            return stats
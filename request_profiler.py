@@ -0,0 +1,260 @@
+"""
+Sampling request profiler
+=========================
+
+Captures where a slow query spends its time (embedding, Chroma, the LLM
+call, response enhancement, ...) without a profiler dependency: while a
+request runs, a background thread samples the request thread's Python stack
+every few milliseconds. Work the request hands to another thread (the circuit
+breaker's executor) is followed when it is wrapped with ``follow``: while it
+runs, the worker's stack is sampled too and grafted below the request's. The
+resulting trace is kept in a rolling buffer of
+JSON files on disk and can be exported as collapsed stacks (for
+``flamegraph.pl`` and similar tools) or as a speedscope profile.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# The profiler sampling the current request, if any
+_active: contextvars.ContextVar = contextvars.ContextVar("request_profiler", default=None)
+
+
+def follow(fn: Callable) -> Callable:
+    """Wrap ``fn`` so that the thread it runs on is sampled by the calling request's profiler"""
+    profiler = _active.get()
+    if profiler is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        with profiler.attach(sys._getframe()):
+            return fn(*args, **kwargs)
+    return run
+
+
+def _depth(frame) -> int:
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+class Trace:
+    def __init__(self, trace_id: str, name: str, started_at: float, frames: List[Dict],
+                 samples: List[List[int]], weights: List[float], metadata: Optional[Dict] = None):
+        """A sampled profile: ``samples`` are stacks (root first) of indexes into ``frames``,
+        ``weights`` the milliseconds each sample stands for"""
+        self.trace_id = trace_id
+        self.name = name
+        self.started_at = started_at
+        self.frames = frames
+        self.samples = samples
+        self.weights = weights
+        self.metadata = metadata or {}
+
+    @property
+    def duration_ms(self) -> float:
+        return sum(self.weights)
+
+    def summary(self) -> Dict:
+        return {
+            "id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 1),
+            "samples": len(self.samples),
+            **self.metadata,
+        }
+
+    def to_dict(self) -> Dict:
+        return {**self.summary(), "frames": self.frames, "stacks": self.samples, "weights": self.weights}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Trace":
+        metadata = {key: value for key, value in data.items()
+                    if key not in ("id", "name", "started_at", "duration_ms", "samples",
+                                   "frames", "stacks", "weights")}
+        return cls(data["id"], data["name"], data["started_at"], data["frames"],
+                   data["stacks"], data["weights"], metadata)
+
+    def to_collapsed(self) -> str:
+        """Collapsed stacks, one ``root;...;leaf <milliseconds>`` line per distinct stack"""
+        totals: Dict[Tuple[int, ...], float] = {}
+        for stack, weight in zip(self.samples, self.weights):
+            key = tuple(stack)
+            totals[key] = totals.get(key, 0.0) + weight
+        lines = []
+        for stack, weight in sorted(totals.items(), key=lambda item: -item[1]):
+            names = ";".join(self.frames[index]["name"].replace(";", ":") for index in stack) or "(idle)"
+            lines.append(f"{names} {max(1, int(round(weight)))}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self) -> Dict:
+        """A speedscope (https://www.speedscope.app) sampled profile"""
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": "linkedin-rag request_profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": self.duration_ms,
+                "samples": self.samples,
+                "weights": self.weights,
+            }],
+        }
+
+
+class SamplingProfiler:
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005):
+        """Sample the stack of ``thread_id`` (the calling thread by default) every ``interval`` seconds"""
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        # Attached worker thread -> number of its outermost frames to leave out
+        self._workers: Dict[int, int] = {}
+        self._workers_lock = threading.Lock()
+        self._token = None
+        self._frames: List[Dict] = []
+        self._frame_index: Dict[tuple, int] = {}
+        self._samples: List[List[int]] = []
+        self._weights: List[float] = []
+        self._stop = threading.Event()
+        self._thread = None
+        self.started_at = None
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.time()
+        if self.thread_id == threading.get_ident():
+            self._token = _active.set(self)
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    @contextmanager
+    def attach(self, frame=None):
+        """Sample the calling thread too until the block exits, starting below ``frame``"""
+        thread_id = threading.get_ident()
+        if thread_id == self.thread_id:
+            yield
+            return
+        with self._workers_lock:
+            self._workers[thread_id] = _depth(frame) if frame is not None else 0
+        try:
+            yield
+        finally:
+            with self._workers_lock:
+                self._workers.pop(thread_id, None)
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            frame = frames.get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                break
+            stack = self._stack(frame)
+            with self._workers_lock:
+                workers = list(self._workers.items())
+            # The request thread is waiting on its workers, so their stacks are where the time goes
+            stacks = [stack + self._stack(frames[thread_id])[skip:]
+                      for thread_id, skip in workers if thread_id in frames] or [stack]
+            for sample in stacks:
+                self._samples.append(sample)
+                self._weights.append((now - last) * 1000.0 / len(stacks))
+            last = now
+
+    def _stack(self, frame) -> List[int]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_filename, code.co_name, code.co_firstlineno)
+            index = self._frame_index.get(key)
+            if index is None:
+                index = len(self._frames)
+                self._frame_index[key] = index
+                self._frames.append({
+                    "name": f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})",
+                    "file": code.co_filename,
+                    "line": code.co_firstlineno,
+                })
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def stop(self, name: str, metadata: Optional[Dict] = None) -> Trace:
+        """Stop sampling and return the trace"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._token is not None:
+            try:
+                _active.reset(self._token)
+            except ValueError:
+                # Stopped from another context; that context ends with the request anyway
+                pass
+            self._token = None
+        return Trace(uuid.uuid4().hex[:12], name, self.started_at, self._frames,
+                     self._samples, self._weights, metadata)
+
+
+class TraceStore:
+    def __init__(self, directory: str, max_traces: int = 50):
+        """Keep the newest ``max_traces`` traces as JSON files in ``directory``"""
+        self.directory = directory
+        self.max_traces = max_traces
+        self._lock = threading.Lock()
+
+    def _path(self, trace_id: str) -> str:
+        return os.path.join(self.directory, f"{trace_id}.json")
+
+    def save(self, trace: Trace):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(trace.trace_id), "w", encoding="utf-8") as f:
+                json.dump(trace.to_dict(), f)
+            for old in self._files()[self.max_traces:]:
+                os.remove(old)
+
+    def _files(self) -> List[str]:
+        """Trace files, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.endswith(".json")]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def list(self) -> List[Dict]:
+        summaries = []
+        for path in self._files():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    summaries.append(Trace.from_dict(json.load(f)).summary())
+            except (OSError, ValueError, KeyError):
+                continue
+        return summaries
+
+    def load(self, trace_id: str) -> Optional[Trace]:
+        # Trace IDs are hex; anything else cannot name a trace file
+        if not trace_id.isalnum():
+            return None
+        try:
+            with open(self._path(trace_id), "r", encoding="utf-8") as f:
+                return Trace.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
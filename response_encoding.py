@@ -0,0 +1,112 @@
+"""
+API response encoding
+=====================
+
+Helpers for slimmer API responses:
+
+* ``dumps_bytes`` serializes with orjson when it is installed (several times
+  faster than ``json`` for the large profile lists), else with ``json``,
+* ``project`` trims list items to the fields a client asked for
+  (``?fields=name,linkedin_url``),
+* ``negotiate_encoding`` / ``compress_body`` pick and apply brotli or gzip
+  from the request's ``Accept-Encoding``.
+
+orjson and brotli are optional; ``ORJSON_AVAILABLE`` and ``BROTLI_AVAILABLE``
+say whether they can be used.
+"""
+
+import gzip
+import importlib.util
+import json
+from typing import Callable, Iterable, Optional, Set
+
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+
+# Response types worth compressing
+COMPRESSIBLE_MIMETYPES = frozenset((
+    "application/json", "text/html", "text/plain", "text/css", "text/csv",
+    "application/javascript", "text/javascript", "image/svg+xml",
+))
+
+
+def dumps_bytes(obj, default: Optional[Callable] = None) -> bytes:
+    """UTF-8 JSON; ``default`` converts objects neither serializer knows"""
+    if ORJSON_AVAILABLE:
+        # Imported here so that importing this module stays cheap
+        import orjson
+        return orjson.dumps(obj, default=default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def parse_fields(value: Optional[str]) -> Optional[Set[str]]:
+    """"name, linkedin_url" -> {"name", "linkedin_url"}; None when no projection was asked for"""
+    if not value:
+        return None
+    fields = {field.strip() for field in value.split(",") if field.strip()}
+    return fields or None
+
+
+def project(payload, fields: Set[str]):
+    """Keep only ``fields`` in the dicts inside lists (profiles, people, matches, ...).
+
+    Top-level keys (``success``, ``count``, ``next_cursor``, ...) are always
+    kept. Nested lists survive when their key is one of the fields, and are
+    projected the same way: ``fields=name,people`` keeps each entity's name and
+    the names of its people.
+    """
+    if isinstance(payload, dict):
+        return {key: _project_value(value, fields) for key, value in payload.items()}
+    return _project_value(payload, fields)
+
+
+def _project_value(value, fields: Set[str]):
+    if isinstance(value, list):
+        return [_project_item(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {key: _project_value(item, fields) for key, item in value.items()}
+    return value
+
+
+def _project_item(item, fields: Set[str]):
+    if isinstance(item, dict):
+        return {key: _project_value(value, fields) for key, value in item.items() if key in fields}
+    return _project_value(item, fields)
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Iterable[str] = None) -> Optional[str]:
+    """The best of ``available`` (br, then gzip) that ``Accept-Encoding`` allows, or None"""
+    if available is None:
+        available = ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, number = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_body(data: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    if encoding == "br":
+        import brotli
+        return brotli.compress(data, quality=brotli_quality)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=gzip_level)
+    raise ValueError(f"Unsupported content encoding '{encoding}'")
@@ -0,0 +1,245 @@
+"""
+Skill x profile incidence matrix
+================================
+
+For every skill in ``SKILL_VOCABULARY`` the matrix holds a bitset (a Python
+int) whose bit ``i`` is set when profile ``i`` mentions the skill as a whole
+word. Boolean skill queries, counts, co-occurrence and per-company/school
+skill rankings then become a handful of big-int AND/OR/NOT operations and
+popcounts instead of loops over every profile's text. Companies, schools
+and experience locations get bitsets too, keyed by canonical entity ID (see
+``entity_normalizer``), so "who worked at X" or "who is in Bengaluru" are
+dictionary lookups that also match alternative spellings.
+
+Expressions accepted by ``SkillMatrix.query``::
+
+    python AND aws
+    (react OR angular) AND NOT "node.js"
+    machine learning & !java            (& | ! are accepted too)
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from entity_normalizer import KIND_COMPANY, KIND_LOCATION, KIND_SCHOOL, EntityIndex, location_parts
+
+# Skills recognised in questions, counted in the summary and indexed here
+SKILL_VOCABULARY = (
+    'python', 'java', 'javascript', 'ai', 'ml', 'machine learning',
+    'deep learning', 'data science', 'web development', 'cloud',
+    'sql', 'react', 'angular', 'node.js', 'django', 'flask',
+    'artificial intelligence', 'neural networks', 'computer vision',
+    'natural language processing', 'big data', 'hadoop', 'spark',
+    'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'devops',
+    'c++', 'c#', 'php', 'ruby', 'swift', 'kotlin', 'scala',
+    'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
+    'matplotlib', 'seaborn', 'plotly', 'jupyter', 'git', 'github'
+)
+
+# Vocabulary entries naming the same skill -> the one they are counted under
+# in tenure lookups ("ML experience" is machine learning experience)
+SKILL_SYNONYMS = {
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+}
+
+TOKEN_PATTERN = re.compile(r'\s*(\(|\)|"[^"]*"|&&?|\|\|?|!|[^\s()"&|!]+)')
+OPERATORS = {"and": "AND", "&": "AND", "&&": "AND", "or": "OR", "|": "OR", "||": "OR", "not": "NOT", "!": "NOT"}
+
+
+def canonical_skill(skill: str) -> str:
+    """The canonical vocabulary name of a skill ("ML" -> "machine learning")"""
+    skill = skill.strip().lower()
+    return SKILL_SYNONYMS.get(skill, skill)
+
+
+# int.bit_count() needs Python 3.10
+_popcount = getattr(int, "bit_count", None) or (lambda bits: bin(bits).count("1"))
+
+
+class SkillMatrix:
+    def __init__(self, vocabulary: Iterable[str] = SKILL_VOCABULARY, entities: Optional[EntityIndex] = None):
+        """An empty matrix over ``vocabulary`` (lowercase skill names)"""
+        self.vocabulary = tuple(vocabulary)
+        self.entities = entities or EntityIndex()
+        self.profile_ids: List[str] = []
+        self.skill_bits: Dict[str, int] = {skill: 0 for skill in self.vocabulary}
+        self.company_bits: Dict[str, int] = {}
+        self.school_bits: Dict[str, int] = {}
+        self.location_bits: Dict[str, int] = {}
+        # Longest first so that "javascript" is preferred over "java" at the same position
+        alternatives = sorted(self.vocabulary, key=len, reverse=True)
+        self._pattern = re.compile(r"(?<![\w])(" + "|".join(map(re.escape, alternatives)) + r")(?![\w])")
+
+    @classmethod
+    def build(cls, records: Iterable, get_text_lower: Callable, vocabulary: Iterable[str] = SKILL_VOCABULARY,
+              entities: Optional[EntityIndex] = None) -> "SkillMatrix":
+        """Index ``records``; ``get_text_lower(record)`` returns its lowercased profile text.
+
+        ``entities`` is the records' entity index (built here if not given).
+        """
+        records = list(records)
+        matrix = cls(vocabulary, entities or EntityIndex.build(records))
+        resolve = matrix.entities.resolve
+        for index, record in enumerate(records):
+            bit = 1 << index
+            matrix.profile_ids.append(record.profile_id)
+            for skill in matrix.skills_in(get_text_lower(record)):
+                matrix.skill_bits[skill] |= bit
+            for experience in record.experiences:
+                matrix._set(matrix.company_bits, resolve(KIND_COMPANY, experience.organization), bit)
+                for place in location_parts(experience.location):
+                    matrix._set(matrix.location_bits, resolve(KIND_LOCATION, place), bit)
+            for education in record.education:
+                matrix._set(matrix.school_bits, resolve(KIND_SCHOOL, education.organization), bit)
+        return matrix
+
+    @staticmethod
+    def _set(groups: Dict[str, int], entity_id: Optional[str], bit: int):
+        if entity_id is not None:
+            groups[entity_id] = groups.get(entity_id, 0) | bit
+
+    def skills_in(self, text_lower: str) -> Set[str]:
+        """Vocabulary skills mentioned as whole words in lowercased text"""
+        return set(self._pattern.findall(text_lower))
+
+    @property
+    def all_bits(self) -> int:
+        return (1 << len(self.profile_ids)) - 1
+
+    def members(self, bits: int) -> List[str]:
+        """Profile IDs whose bits are set, in store order"""
+        ids = []
+        while bits:
+            lowest = bits & -bits
+            ids.append(self.profile_ids[lowest.bit_length() - 1])
+            bits ^= lowest
+        return ids
+
+    def bits_for(self, skill: str) -> int:
+        skill = skill.strip().lower()
+        if skill not in self.skill_bits:
+            raise ValueError(f"Unknown skill '{skill}'")
+        return self.skill_bits[skill]
+
+    def query(self, expression: str) -> int:
+        """Evaluate a boolean skill expression to a profile bitset"""
+        tokens = TOKEN_PATTERN.findall(expression)
+        if not tokens:
+            raise ValueError("Empty skill expression")
+        return _ExpressionParser(self, tokens).parse()
+
+    def count(self, bits: int) -> int:
+        return _popcount(bits)
+
+    def skill_counts(self, within: Optional[int] = None) -> Dict[str, int]:
+        """Profiles per skill (optionally only among ``within``), most common first"""
+        counts = {skill: _popcount(bits if within is None else bits & within)
+                  for skill, bits in self.skill_bits.items()}
+        return dict(sorted(((s, c) for s, c in counts.items() if c), key=lambda item: item[1], reverse=True))
+
+    def co_occurrence(self, skills: Optional[Iterable[str]] = None, top: int = 20) -> List[Tuple[str, str, int]]:
+        """The ``top`` skill pairs held by the most profiles together"""
+        skills = [skill.strip().lower() for skill in skills] if skills else list(self.vocabulary)
+        for skill in skills:
+            self.bits_for(skill)
+        pairs = []
+        for i, first in enumerate(skills):
+            first_bits = self.skill_bits[first]
+            if not first_bits:
+                continue
+            for second in skills[i + 1:]:
+                together = _popcount(first_bits & self.skill_bits[second])
+                if together:
+                    pairs.append((first, second, together))
+        pairs.sort(key=lambda pair: pair[2], reverse=True)
+        return pairs[:top]
+
+    def entity_bits(self, kind: str, name: str) -> Optional[int]:
+        """People who worked at (``company``), studied at (``school``) or were located in
+        (``location``) ``name`` or any spelling of it; None if no such entity is indexed"""
+        groups = {KIND_COMPANY: self.company_bits, KIND_SCHOOL: self.school_bits,
+                  KIND_LOCATION: self.location_bits}[kind]
+        entity_ids = [entity_id for entity_id in self.entities.search(kind, name) if entity_id in groups]
+        if not entity_ids:
+            return None
+        within = 0
+        for entity_id in entity_ids:
+            within |= groups[entity_id]
+        return within
+
+    def top_skills_by(self, kind: str, name: str, top: int = 10) -> Dict[str, int]:
+        """Most common skills among people who worked at (``company``) or studied at (``school``) ``name``"""
+        within = self.entity_bits(kind, name) or 0
+        return dict(list(self.skill_counts(within).items())[:top])
+
+    def stats(self) -> Dict:
+        return {
+            "profiles": len(self.profile_ids),
+            "skills": len(self.vocabulary),
+            "companies": len(self.company_bits),
+            "schools": len(self.school_bits),
+            "locations": len(self.location_bits),
+        }
+
+
+class _ExpressionParser:
+    """Recursive descent over: or := and (OR and)* ; and := not (AND not)* ; not := NOT not | atom"""
+
+    def __init__(self, matrix: SkillMatrix, tokens: List[str]):
+        self.matrix = matrix
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self) -> Optional[str]:
+        if self.position >= len(self.tokens):
+            return None
+        token = self.tokens[self.position]
+        return OPERATORS.get(token.lower(), token)
+
+    def parse(self) -> int:
+        bits = self._or()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected '{self.tokens[self.position]}' in skill expression")
+        return bits
+
+    def _or(self) -> int:
+        bits = self._and()
+        while self._peek() == "OR":
+            self.position += 1
+            bits |= self._and()
+        return bits
+
+    def _and(self) -> int:
+        bits = self._not()
+        while self._peek() == "AND":
+            self.position += 1
+            bits &= self._not()
+        return bits
+
+    def _not(self) -> int:
+        if self._peek() == "NOT":
+            self.position += 1
+            return self.matrix.all_bits & ~self._not()
+        return self._atom()
+
+    def _atom(self) -> int:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Skill expression ends unexpectedly")
+        if token == "(":
+            self.position += 1
+            bits = self._or()
+            if self._peek() != ")":
+                raise ValueError("Missing ')' in skill expression")
+            self.position += 1
+            return bits
+        if token in ("AND", "OR", ")"):
+            raise ValueError(f"Unexpected '{self.tokens[self.position]}' in skill expression")
+
+        # Consecutive bare words form one skill name ("machine learning")
+        words = []
+        while self._peek() not in (None, "AND", "OR", "NOT", "(", ")"):
+            words.append(self.tokens[self.position].strip('"'))
+            self.position += 1
+        return self.matrix.bits_for(" ".join(words))
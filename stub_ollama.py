@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Stub Ollama server
+==================
+
+A stand-in for the Ollama daemon for load tests and benchmarks. It serves
+``POST /api/generate`` (streaming and non-streaming, plus the empty-prompt
+model load) and ``GET /api/tags`` with configurable latencies, and answers
+deterministically by naming the people found in the prompt's context.
+
+Usage:
+    python stub_ollama.py [--port 11434] [--token-latency 0.02] [--prompt-latency 0.1] [--tokens 40]
+
+Point the app at it with ``OLLAMA_BASE_URL=http://localhost:<port>``.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+# Context blocks written by the context packer start with "[Name]"
+NAME_PATTERN = re.compile(r"(?:^|Context: )\[([^\]\n]+)\]", re.MULTILINE)
+
+
+class StubSettings:
+    def __init__(self, model: str = "llama3.2:1b", token_latency: float = 0.02,
+                 prompt_latency: float = 0.1, load_latency: float = 0.0, tokens: int = 40):
+        """Latencies in seconds: per generated token, before the first token, and for the first load"""
+        self.model = model
+        self.token_latency = token_latency
+        self.prompt_latency = prompt_latency
+        self.load_latency = load_latency
+        self.tokens = tokens
+        self.loaded = False
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def answer_tokens(prompt: str, count: int) -> List[str]:
+    """A deterministic answer of ``count`` tokens naming the people in the prompt"""
+    names = list(dict.fromkeys(NAME_PATTERN.findall(prompt)))
+    words = ("Based on the profiles, the most relevant people are "
+             + (", ".join(names) if names else "not found in the context") + ".").split()
+    filler = "They have relevant experience listed in their profiles .".split()
+    while len(words) < count:
+        words.extend(filler)
+    return [word + " " for word in words[:count]]
+
+
+def make_handler(settings: StubSettings):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, payload: Dict, status: int = 200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/api/tags":
+                self._send_json({"models": [{"name": settings.model}]})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+        def do_POST(self):
+            if self.path != "/api/generate":
+                self._send_json({"error": "not found"}, status=404)
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            with settings.lock:
+                settings.requests += 1
+                first_load = not settings.loaded
+                settings.loaded = True
+
+            start = time.perf_counter()
+            load_seconds = settings.load_latency if first_load else 0.0
+            time.sleep(load_seconds)
+
+            prompt = request.get("prompt")
+            if not prompt:
+                # An empty prompt only loads the model
+                self._send_json({"model": settings.model, "response": "", "done": True,
+                                 "load_duration": int(load_seconds * 1e9)})
+                return
+
+            time.sleep(settings.prompt_latency)
+            tokens = answer_tokens(prompt, settings.tokens)
+            final = {
+                "model": settings.model,
+                "done": True,
+                "prompt_eval_count": len(prompt.split()),
+                "eval_count": len(tokens),
+                "load_duration": int(load_seconds * 1e9),
+            }
+
+            if not request.get("stream", True):
+                time.sleep(settings.token_latency * len(tokens))
+                final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+                self._send_json({**final, "response": "".join(tokens).strip()})
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in tokens:
+                time.sleep(settings.token_latency)
+                self._write_chunk({"model": settings.model, "response": token, "done": False})
+            final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+            self._write_chunk({**final, "response": ""})
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _write_chunk(self, payload: Dict):
+            line = (json.dumps(payload) + "\n").encode("utf-8")
+            self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, **settings) -> ThreadingHTTPServer:
+    """Start the stub on a background thread; ``port=0`` picks a free port (see ``server.server_port``)"""
+    server = ThreadingHTTPServer((host, port), make_handler(StubSettings(**settings)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-ollama", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Ollama API with configurable latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--model", default="llama3.2:1b")
+    parser.add_argument("--token-latency", type=float, default=0.02, help="Seconds per generated token")
+    parser.add_argument("--prompt-latency", type=float, default=0.1, help="Seconds before the first token")
+    parser.add_argument("--load-latency", type=float, default=0.0, help="Extra seconds on the first request")
+    parser.add_argument("--tokens", type=int, default=40, help="Tokens per answer")
+    args = parser.parse_args()
+
+    settings = StubSettings(args.model, args.token_latency, args.prompt_latency, args.load_latency, args.tokens)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(settings))
+    print(f"🤖 Stub Ollama serving {args.model} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Stub LinkedIn scraper
+=====================
+
+Stands in for Selenium and ``linkedin_scraper`` so the scrape path can be
+load-tested without Chrome or a LinkedIn account. It mirrors the pieces the
+app uses (a driver with ``quit()``, ``actions.login`` and ``Person``) and
+returns a synthetic profile that is deterministic per URL, after a
+configurable delay.
+
+Enable in the app with ``SCRAPER_BACKEND=stub``; ``STUB_SCRAPE_LATENCY``
+sets the seconds spent per profile (default 0.2).
+"""
+
+import hashlib
+import os
+import time
+from types import SimpleNamespace
+
+from synthetic_profiles import generate_profiles
+
+
+def _latency() -> float:
+    return float(os.environ.get("STUB_SCRAPE_LATENCY", "0.2"))
+
+
+class StubDriver:
+    """What the app needs from a Selenium driver"""
+
+    def __init__(self):
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+class actions:
+    @staticmethod
+    def login(driver: StubDriver, email: str, password: str):
+        time.sleep(_latency() / 4)
+
+
+class Person:
+    def __init__(self, linkedin_url: str, driver: StubDriver = None):
+        """A synthetic profile for ``linkedin_url`` (the same URL always gives the same profile)"""
+        time.sleep(_latency())
+        seed = int.from_bytes(hashlib.sha1(linkedin_url.encode("utf-8")).digest()[:4], "big")
+        profile = generate_profiles(1, seed=seed)[0]
+        self.linkedin_url = linkedin_url
+        self.name = profile["name"]
+        self.about = profile["about"]
+        self.experiences = [SimpleNamespace(**experience) for experience in profile["experiences"]]
+        self.educations = [SimpleNamespace(**education) for education in profile["education"]]
@@ -0,0 +1,134 @@
+"""
+Synthetic LinkedIn profiles
+===========================
+
+Generates deterministic profile corpora in the ``linkedin_profiless_ls3.json``
+schema (including the null company metadata the scraper emits) for
+benchmarks and load tests.
+
+Usage:
+    python synthetic_profiles.py 10000 synthetic_10k.json
+"""
+
+import json
+import random
+import sys
+from typing import Dict, List
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Amee", "Ananya", "Arjun", "Divya", "Ishaan", "Kavya", "Meera", "Neha",
+    "Nikhil", "Pooja", "Rahul", "Riya", "Rohan", "Sanjay", "Shreya", "Tanvi", "Varun", "Vikram",
+]
+LAST_NAMES = [
+    "Bhat", "Desai", "Gupta", "Iyer", "Jain", "Kumar", "M", "Menon", "Nair", "Patel",
+    "Popat", "Rao", "Reddy", "Shah", "Sharma", "Singh", "Verma",
+]
+COMPANIES = [
+    "NxtGen Cloud Technologies Pvt Ltd", "Bharat internships", "Infosys", "Tata Consultancy Services",
+    "Wipro", "Accenture", "Flipkart", "Swiggy", "Zoho Corporation", "Entrepreneurship-Cell @DSU",
+    "Google", "Microsoft", "Amazon", "IBM", "Deloitte",
+]
+EMPLOYMENT_TYPES = ["", " · Internship", " · Full-time", " · Part-time"]
+SCHOOLS = [
+    "Dayananda Sagar University", "Dayananda Sagar College of Engineering, BANGALORE",
+    "PES University", "RV College of Engineering", "BMS College of Engineering",
+    "Indian Institute of Science (IISc)", "Christ University",
+]
+DEGREES = [
+    "Bachelor of Technology - BTech, Computer Science (AI & ML)",
+    "Bachelor of Engineering - BE, Computer Science", "Master of Technology - MTech",
+    "Bachelor of Technology - BTech", "Pre-University, PCMB",
+]
+TITLES = [
+    "Intern", "Software Engineer", "Data Scientist", "Machine Learning Engineer",
+    "Cloud Engineer", "Web Developer", "Research Assistant", "Event and Student Relations Manager",
+]
+LOCATIONS = [
+    "Bengaluru, Karnataka, India · On-site", "Remote · Remote", "Mysuru, Karnataka, India · Hybrid",
+    "Hyderabad, Telangana, India · On-site", "Pune, Maharashtra, India · Hybrid",
+]
+SKILLS = [
+    "Python (Programming Language)", "Java", "JavaScript", "Machine Learning", "Deep Learning",
+    "Artificial Intelligence (AI)", "SQL", "React.js", "Amazon Web Services (AWS)", "Docker",
+    "Kubernetes", "TensorFlow", "PyTorch", "Data Science", "Cloud Computing", "Flask", "Django",
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+NULL_COMPANY_FIELDS = {
+    "website": None, "industry": None, "type": None, "headquarters": None,
+    "company_size": None, "founded": None,
+}
+
+
+def _duration(months: int) -> str:
+    years, rest = divmod(months, 12)
+    parts = []
+    if years:
+        parts.append(f"{years} yr" + ("s" if years > 1 else ""))
+    if rest:
+        parts.append(f"{rest} mo" + ("s" if rest > 1 else ""))
+    return " ".join(parts) or "1 mo"
+
+
+def _experience(rng: random.Random) -> Dict:
+    start_year = rng.randint(2018, 2025)
+    start_month = rng.randint(0, 11)
+    length = rng.randint(1, 40)
+    end_index = start_year * 12 + start_month + length
+    current = end_index > 2025 * 12 + 8
+    skills = rng.sample(SKILLS, rng.randint(2, 5))
+    skills_text = " · ".join(skills)
+    return {
+        "institution_name": rng.choice(COMPANIES) + rng.choice(EMPLOYMENT_TYPES),
+        "linkedin_url": f"https://www.linkedin.com/company/{rng.randint(1000, 99999999)}/",
+        **NULL_COMPANY_FIELDS,
+        "from_date": f"{MONTHS[start_month]} {start_year}",
+        "to_date": "Present" if current else f"{MONTHS[end_index % 12]} {end_index // 12}",
+        "description": f"Skills: {skills_text} Skills:{skills_text}",
+        "position_title": rng.choice(TITLES),
+        "duration": _duration(length),
+        "location": rng.choice(LOCATIONS),
+    }
+
+
+def _education(rng: random.Random) -> Dict:
+    start_year = rng.randint(2015, 2024)
+    return {
+        "institution_name": rng.choice(SCHOOLS),
+        "linkedin_url": f"https://www.linkedin.com/company/{rng.randint(1000, 99999999)}/",
+        **NULL_COMPANY_FIELDS,
+        "from_date": str(start_year),
+        "to_date": str(start_year + 4),
+        "description": rng.choice(["", "Activities and societies: Coding Club, E-Cell"]),
+        "degree": rng.choice(DEGREES),
+    }
+
+
+def generate_profiles(count: int, seed: int = 42) -> List[Dict]:
+    """Generate ``count`` profiles; the same seed always yields the same corpus"""
+    rng = random.Random(seed)
+    profiles = []
+    for i in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        focus = rng.sample(SKILLS, 3)
+        about = None
+        if rng.random() < 0.7:
+            about = (f"{rng.choice(TITLES)} passionate about {focus[0]}, {focus[1]} and {focus[2]}. "
+                     f"Currently based in {rng.choice(LOCATIONS).split(' · ')[0]}.")
+        slug = name.lower().replace(" ", "-")
+        profiles.append({
+            "name": name,
+            "about": about,
+            "experiences": [_experience(rng) for _ in range(rng.randint(0, 4))],
+            "education": [_education(rng) for _ in range(rng.randint(1, 2))],
+            "linkedin_url": f"https://www.linkedin.com/in/{slug}-{i:07d}/",
+        })
+    return profiles
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python synthetic_profiles.py <count> <output.json>")
+        sys.exit(1)
+    with open(sys.argv[2], "w", encoding="utf-8") as f:
+        json.dump(generate_profiles(int(sys.argv[1])), f, indent=4, ensure_ascii=False)
+    print(f"✅ Wrote {sys.argv[1]} synthetic profiles to {sys.argv[2]}")
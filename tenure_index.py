@@ -0,0 +1,190 @@
+"""
+Experience dates and tenure index
+=================================
+
+LinkedIn stores experience dates as strings ("May 2024", "Present", "2019")
+and durations as "1 yr 4 mos". The parsers here turn them into month
+numbers (``year * 12 + month - 1``) and month counts at ingest, and
+``TenureIndex`` keeps, per skill, per company and overall, every profile's
+months of experience in a sorted array, plus the experience intervals sorted
+by start month. "More than 2 years of ML experience" or "currently employed
+at X" are then a bisect or a dictionary hit instead of an LLM call.
+
+Months of experience merge overlapping intervals, so two concurrent roles do
+not count twice, and count both end months (LinkedIn shows "May 2024 - May
+2024" as "1 mo").
+"""
+
+import bisect
+import re
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from entity_normalizer import KIND_COMPANY
+from skill_matrix import canonical_skill
+
+MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+PRESENT = frozenset(("present", "current", "now", "today"))
+
+DATE_PATTERN = re.compile(r"^(?:(?P<month>[a-z]{3})[a-z]*\.?\s+)?(?P<year>(?:19|20)\d\d)$")
+DURATION_PATTERN = re.compile(r"(\d+)\s*(yrs?|years?|mos?|months?)\b")
+
+SCOPE_TOTAL = "total"
+SCOPE_SKILL = "skill"
+SCOPE_COMPANY = KIND_COMPANY
+
+
+def current_month(now: Optional[float] = None) -> int:
+    local = time.localtime(now)
+    return local.tm_year * 12 + local.tm_mon - 1
+
+
+def is_present(text: Optional[str]) -> bool:
+    return bool(text) and text.strip().lower() in PRESENT
+
+
+@lru_cache(maxsize=4096)
+def parse_month(text: Optional[str], end: bool = False) -> Optional[int]:
+    """"May 2024" -> month number; a bare year is January (December when ``end``)"""
+    if not text:
+        return None
+    match = DATE_PATTERN.match(text.strip().lower())
+    if not match:
+        return None
+    year = int(match.group("year"))
+    month = match.group("month")
+    if month is None:
+        return year * 12 + (11 if end else 0)
+    if month not in MONTH_NAMES:
+        return None
+    return year * 12 + MONTH_NAMES.index(month)
+
+
+@lru_cache(maxsize=1024)
+def parse_duration(text: Optional[str]) -> Optional[int]:
+    """"1 yr 4 mos" -> 16"""
+    if not text:
+        return None
+    months = None
+    for amount, unit in DURATION_PATTERN.findall(text.lower()):
+        months = (months or 0) + int(amount) * (12 if unit.startswith("y") else 1)
+    return months
+
+
+def month_label(month: int) -> str:
+    return f"{MONTH_NAMES[month % 12].title()} {month // 12}"
+
+
+def format_months(months: int) -> str:
+    """16 -> "1 yr 4 mos", in LinkedIn's style"""
+    years, rest = divmod(months, 12)
+    parts = []
+    if years:
+        parts.append(f"{years} yr" + ("s" if years > 1 else ""))
+    if rest or not years:
+        parts.append(f"{rest} mo" + ("s" if rest != 1 else ""))
+    return " ".join(parts)
+
+
+def _merged_months(spans: List[Tuple[int, int]], undated: int = 0) -> int:
+    """Months covered by inclusive ``(start, end)`` spans, overlaps counted once"""
+    total = undated
+    last_end = None
+    for start, end in sorted(spans):
+        if last_end is not None and start <= last_end:
+            if end > last_end:
+                total += end - last_end
+                last_end = end
+            continue
+        total += end - start + 1
+        last_end = end
+    return total
+
+
+class TenureIndex:
+    def __init__(self, now_month: Optional[int] = None):
+        """An empty index; experiences marked "Present" run until ``now_month``"""
+        self.now_month = current_month() if now_month is None else now_month
+        # (start, end, profile ID, company entity ID), sorted by start
+        self.intervals: List[Tuple[int, int, str, Optional[str]]] = []
+        self._current: Dict[str, Set[str]] = {}
+        # (scope, key) -> (ascending months, profile IDs in the same order)
+        self._tenure: Dict[Tuple[str, str], Tuple[List[int], List[str]]] = {}
+
+    @classmethod
+    def build(cls, records: Iterable, resolve_company: Callable[[Optional[str]], Optional[str]],
+              extract_skills: Callable[[str], Iterable[str]], now_month: Optional[int] = None) -> "TenureIndex":
+        """Index ``records``' experiences.
+
+        ``resolve_company(organization)`` returns a company entity ID and
+        ``extract_skills(lowercased title and description)`` the skills an
+        experience counts towards; synonyms are folded into their canonical
+        skill (see ``skill_matrix.canonical_skill``), so months in "ML" and
+        "machine learning" roles add up under one key.
+        """
+        index = cls(now_month)
+        tenure: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+        for record in records:
+            profile_id = record.profile_id
+            # scope key -> [dated spans, undated months]
+            spans: Dict[Tuple[str, str], list] = {}
+            for experience in record.experiences:
+                company = resolve_company(experience.organization)
+                span = index._span(experience)
+                if span is not None:
+                    index.intervals.append((span[0], span[1], profile_id, company))
+                    if experience.is_current and company is not None:
+                        index._current.setdefault(company, set()).add(profile_id)
+                elif not experience.duration_months:
+                    continue
+
+                keys = [(SCOPE_TOTAL, "")]
+                if company is not None:
+                    keys.append((SCOPE_COMPANY, company))
+                text = f"{experience.position_title or ''} {experience.description or ''}".lower()
+                keys.extend((SCOPE_SKILL, skill) for skill in {canonical_skill(s) for s in extract_skills(text)})
+                for key in keys:
+                    entry = spans.setdefault(key, [[], 0])
+                    if span is not None:
+                        entry[0].append(span)
+                    else:
+                        entry[1] += experience.duration_months
+
+            for key, (key_spans, undated) in spans.items():
+                tenure.setdefault(key, []).append((_merged_months(key_spans, undated), profile_id))
+
+        index.intervals.sort(key=lambda interval: interval[0])
+        for key, entries in tenure.items():
+            entries.sort()
+            index._tenure[key] = ([months for months, _ in entries], [profile_id for _, profile_id in entries])
+        return index
+
+    def _span(self, experience) -> Optional[Tuple[int, int]]:
+        start = experience.start_month
+        end = self.now_month if experience.is_current else experience.end_month
+        if start is None or end is None or end < start:
+            return None
+        return start, end
+
+    def months(self, scope: str, key: str = "", min_months: Optional[int] = None,
+               max_months: Optional[int] = None) -> List[Tuple[str, int]]:
+        """``(profile ID, months)`` with between ``min_months`` and ``max_months`` (inclusive)
+        of experience overall, in a skill (canonical name) or at a company entity, most experienced first"""
+        months, profile_ids = self._tenure.get((scope, key), ((), ()))
+        low = bisect.bisect_left(months, min_months) if min_months is not None else 0
+        high = bisect.bisect_right(months, max_months) if max_months is not None else len(months)
+        return [(profile_ids[i], months[i]) for i in range(high - 1, low - 1, -1)]
+
+    def current_at(self, company: str) -> Set[str]:
+        """Profiles with a "Present" experience at a company entity"""
+        return self._current.get(company, set())
+
+    def stats(self) -> Dict:
+        return {
+            "now": month_label(self.now_month),
+            "intervals": len(self.intervals),
+            "current_positions": sum(len(profiles) for profiles in self._current.values()),
+            "skills": sum(1 for scope, _ in self._tenure if scope == SCOPE_SKILL),
+            "companies": sum(1 for scope, _ in self._tenure if scope == SCOPE_COMPANY),
+        }
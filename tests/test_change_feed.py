@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+
+from change_feed import ADDED, REMOVED, UPDATED, ChangeFeed, IncrementalIndexer, collapse
+
+
+class Version:
+    def __init__(self, applied_seq=0):
+        self.applied_seq = applied_seq
+
+
+def make_indexer(feed, version, batch_size=64):
+    applied, gaps = [], []
+
+    @contextmanager
+    def get_target():
+        yield version
+
+    indexer = IncrementalIndexer(feed, get_target, lambda v, upserts, removals: applied.append((upserts, removals)),
+                                 batch_window=0, batch_size=batch_size, on_gap=gaps.append)
+    return indexer, applied, gaps
+
+
+def test_collapse_keeps_the_last_event_per_profile():
+    feed = ChangeFeed()
+    feed.publish(ADDED, ["a", "b", "c"])
+    feed.publish(UPDATED, ["a"])
+    feed.publish(REMOVED, ["b"])
+    feed.publish(ADDED, ["c"])
+    feed.publish(REMOVED, ["d"])
+    assert collapse(feed.read_since(0)) == ({"a", "c"}, {"b", "d"})
+
+
+def test_read_since_is_exclusive_and_limited():
+    feed = ChangeFeed()
+    assert feed.publish(ADDED, ["a", "b", "c"]) == 3
+    assert [event.profile_id for event in feed.read_since(1)] == ["b", "c"]
+    assert [event.seq for event in feed.read_since(0, limit=2)] == [1, 2]
+    assert feed.oldest_seq == 1
+
+
+def test_indexer_applies_micro_batches_and_advances_the_version():
+    feed = ChangeFeed()
+    feed.publish(ADDED, ["a", "b", "c"])
+    version = Version()
+    indexer, applied, gaps = make_indexer(feed, version, batch_size=2)
+
+    assert indexer.run_once()
+    assert applied == [({"a", "b"}, set())] and version.applied_seq == 2
+    assert indexer.run_once()
+    assert applied[-1] == ({"c"}, set()) and version.applied_seq == 3
+    assert not indexer.run_once()
+    assert indexer.batches_applied == 2 and indexer.profiles_applied == 3 and not gaps
+
+
+def test_dropped_events_are_reported_as_a_gap():
+    feed = ChangeFeed(max_events=2)
+    feed.publish(ADDED, ["a", "b", "c", "d"])
+    version = Version(applied_seq=1)
+    indexer, applied, gaps = make_indexer(feed, version)
+
+    assert feed.oldest_seq == 3
+    assert not indexer.run_once()
+    assert gaps == [version] and not applied
+    # The version is rebuilt by on_gap, so it skips to the head of the feed
+    assert version.applied_seq == 4
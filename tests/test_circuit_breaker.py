@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CallTimeoutError, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail():
+    raise RuntimeError("boom")
+
+
+def make_breaker(clock, **kwargs):
+    options = {"failure_threshold": 3, "recovery_timeout": 30.0, "call_timeout": None}
+    options.update(kwargs)
+    return CircuitBreaker("test", clock=clock, **options)
+
+
+def test_opens_after_the_failure_threshold():
+    breaker = make_breaker(Clock())
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+        assert breaker.state == CLOSED
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+    assert breaker.stats()["total_rejections"] == 1
+
+
+def test_success_resets_the_consecutive_failure_count():
+    breaker = make_breaker(Clock())
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_a_single_probe_through():
+    clock = Clock()
+    breaker = make_breaker(clock, failure_threshold=1)
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    clock.now += 30.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_failed_probe_opens_the_circuit_again():
+    clock = Clock()
+    breaker = make_breaker(clock, failure_threshold=2)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+    clock.now += 30.0
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+
+
+def test_closed_open_half_open_closed():
+    clock = Clock()
+    breaker = make_breaker(clock, failure_threshold=1)
+    assert breaker.state == CLOSED
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    clock.now += 29.0
+    assert breaker.state == OPEN
+    clock.now += 1.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_slow_call_times_out_and_counts_as_a_failure():
+    release = threading.Event()
+    breaker = CircuitBreaker("test", failure_threshold=1, call_timeout=0.05)
+    started = time.perf_counter()
+    with pytest.raises(CallTimeoutError):
+        breaker.call(release.wait, 5)
+    release.set()
+    assert time.perf_counter() - started < 1.0
+    assert breaker.state == OPEN
+    assert breaker.stats()["total_failures"] == 1
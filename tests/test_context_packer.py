@@ -0,0 +1,40 @@
+from context_packer import ContextPacker, count_tokens, strip_overlap
+
+
+class Doc:
+    def __init__(self, text, profile_id, name, start_index=0):
+        self.page_content = text
+        self.metadata = {"profile_id": profile_id, "name": name, "start_index": start_index}
+
+
+def test_strip_overlap_removes_the_repeated_prefix():
+    previous = "Worked on data pipelines in Python and Spark for three years"
+    current = "in Python and Spark for three years. Then moved to ML platform work"
+    assert strip_overlap(previous, current) == ". Then moved to ML platform work"
+
+
+def test_strip_overlap_keeps_text_without_a_long_enough_overlap():
+    assert strip_overlap("ends with python", "python is great") == "python is great"
+    assert strip_overlap("", "anything") == "anything"
+    assert strip_overlap("the whole chunk repeated", "chunk repeated") == ""
+
+
+def test_chunks_of_one_person_are_merged_in_document_order_without_overlap():
+    first = "Alice builds data pipelines with Python and Spark at scale"
+    second = "with Python and Spark at scale, and mentors junior engineers"
+    scored = [(Doc(second, "a", "Alice", start_index=40), 0.9), (Doc(first, "a", "Alice", start_index=0), 0.8)]
+    packed = ContextPacker(token_budget=1000).pack(scored)
+    assert packed.people == ["Alice"]
+    assert packed.chunks_used == 2
+    assert packed.text == "[Alice]\n" + first + "\n, and mentors junior engineers"
+
+
+def test_people_are_added_by_relevance_until_the_budget_is_used():
+    scored = [(Doc(f"{name} " + "skill " * 40, name.lower(), name), 1.0 - rank / 10)
+              for rank, name in enumerate(("Alice", "Bob", "Carol"))]
+    budget = 100
+    packed = ContextPacker(token_budget=budget).pack(scored)
+    assert packed.people == ["Alice", "Bob"]
+    assert packed.chunks_dropped == 1
+    assert packed.tokens <= budget
+    assert packed.tokens == count_tokens(packed.text)
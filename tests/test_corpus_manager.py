@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from corpus_manager import CorpusManager, load_corpus_configs
+
+
+class Corpus:
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.closed = False
+
+
+def make_manager(sizes, memory_budget=100, max_loaded=8):
+    closed = []
+
+    def close(corpus):
+        corpus.closed = True
+        closed.append(corpus.name)
+
+    manager = CorpusManager({name: f"/data/{name}.json" for name in sizes},
+                            lambda name, path: Corpus(name, sizes[name]), memory_budget, max_loaded,
+                            size_fn=lambda corpus: corpus.size, close_fn=close)
+    return manager, closed
+
+
+def test_least_recently_used_idle_corpus_is_evicted_first():
+    manager, closed = make_manager({"a": 40, "b": 40, "c": 40})
+    a = manager.get("a")
+    manager.get("b")
+    assert manager.get("a") is a
+    manager.get("c")
+
+    assert closed == ["b"]
+    assert manager.stats()["lru_order"] == ["a", "c"]
+    assert (manager.loads, manager.evictions) == (3, 1)
+
+
+def test_pinned_corpora_are_not_evicted():
+    manager, closed = make_manager({"a": 60, "b": 60})
+    manager.acquire("a")
+    manager.get("b")
+    # Over budget, but "a" is serving a request and "b" was just loaded
+    assert closed == [] and manager.stats()["lru_order"] == ["a", "b"]
+
+    assert not manager.evict("a")
+    manager.release("a")
+    manager.enforce_budget()
+    assert closed == ["a"]
+
+
+def test_budget_is_rechecked_when_a_corpus_grows():
+    manager, closed = make_manager({"a": 10, "b": 10})
+    manager.get("a")
+    b = manager.get("b")
+    assert not closed
+
+    # e.g. b's vector index finished building in the background
+    b.size = 95
+    manager.enforce_budget(keep="b")
+    assert closed == ["a"]
+
+
+def test_max_loaded_and_concurrent_loads():
+    manager, closed = make_manager({"a": 1, "b": 1, "c": 1}, max_loaded=2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get("a"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert manager.loads == 1 and all(corpus is results[0] for corpus in results)
+
+    manager.get("b")
+    manager.get("c")
+    assert closed == ["a"]
+    with pytest.raises(KeyError):
+        manager.get("missing")
+
+
+def test_corpus_configs(tmp_path):
+    (tmp_path / "pool-a.json").write_text("[]")
+    (tmp_path / "bad name.json").write_text("[]")
+    assert load_corpus_configs("pool-b=/data/b.json", str(tmp_path)) == {
+        "pool-a": str(tmp_path / "pool-a.json"), "pool-b": "/data/b.json"}
+    with pytest.raises(ValueError):
+        load_corpus_configs("../x=/data/x.json")
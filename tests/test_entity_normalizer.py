@@ -0,0 +1,34 @@
+from entity_normalizer import KIND_COMPANY, KIND_SCHOOL, EntityIndex, is_typo_variant
+
+MADRAS = "Indian Institute of Technology Madras"
+MANDI = "Indian Institute of Technology Mandi"
+
+
+def test_near_duplicate_institutions_stay_separate_in_either_order():
+    for names in ((MADRAS, MANDI), (MANDI, MADRAS)):
+        index = EntityIndex()
+        first, second = (index.resolve(KIND_SCHOOL, name, create=True) for name in names)
+        assert first != second
+        assert index.name(first) == names[0]
+        assert index.name(second) == names[1]
+
+
+def test_query_for_one_institution_does_not_match_its_near_duplicate():
+    index = EntityIndex()
+    madras = index.resolve(KIND_SCHOOL, MADRAS, create=True)
+    assert index.resolve(KIND_SCHOOL, MANDI) is None
+    assert madras not in index.search(KIND_SCHOOL, "IIT Mandi")
+    assert index.search(KIND_SCHOOL, MANDI) == []
+
+
+def test_typos_still_fold_into_the_known_entity():
+    index = EntityIndex()
+    infosys = index.resolve(KIND_COMPANY, "Infosys Technologies", create=True)
+    assert index.resolve(KIND_COMPANY, "Infosys Tecnologies") == infosys
+    assert index.resolve(KIND_COMPANY, "Infosys Tecnologies Ltd", create=True) == infosys
+
+
+def test_typo_variant_rejects_whole_word_differences():
+    assert is_typo_variant("infosys technologies", "infosys tecnologies")
+    assert not is_typo_variant("indian institute of technology madras", "indian institute of technology mandi")
+    assert not is_typo_variant("iit delhi", "iim delhi")
@@ -0,0 +1,50 @@
+import pytest
+
+from freshness import RefreshScheduler, stalest
+
+
+class Record:
+    def __init__(self, name, scraped_at, linkedin_url="https://www.linkedin.com/in/x"):
+        self.name = name
+        self.scraped_at = scraped_at
+        self.linkedin_url = linkedin_url
+
+
+RECORDS = [Record("fresh", 990.0), Record("old", 100.0), Record("never", None),
+           Record("older", 50.0), Record("no-url", None, linkedin_url="")]
+
+
+def test_stalest_picks_the_oldest_first_and_never_scraped_before_all():
+    assert [r.name for r in stalest(RECORDS, 3, now=1000.0)] == ["never", "older", "old"]
+
+
+def test_stalest_skips_recent_profiles_and_profiles_without_a_url():
+    assert [r.name for r in stalest(RECORDS, 10, min_age=60, now=1000.0)] == ["never", "older", "old"]
+    assert stalest(RECORDS, 0, now=1000.0) == []
+
+
+def test_run_once_hands_the_batch_and_deadline_to_the_refresh():
+    calls = []
+
+    def refresh(records, deadline):
+        calls.append(([r.name for r in records], deadline))
+        return {"refreshed": len(records)}
+
+    scheduler = RefreshScheduler(lambda: RECORDS, refresh, batch_size=2, budget_seconds=30)
+    result = scheduler.run_once()
+
+    assert calls[0][0] == ["never", "older"]
+    assert calls[0][1] == pytest.approx(result["finished_at"] - result["seconds"] + 30, abs=1)
+    assert result["selected"] == 2 and result["refreshed"] == 2
+    assert scheduler.runs == 1 and scheduler.last_run is result
+
+
+def test_concurrent_runs_are_rejected():
+    def refresh(records, deadline):
+        with pytest.raises(RuntimeError):
+            scheduler.run_once()
+        return {}
+
+    scheduler = RefreshScheduler(lambda: RECORDS, refresh)
+    scheduler.run_once()
+    assert not scheduler.running
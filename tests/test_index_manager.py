@@ -0,0 +1,140 @@
+import os
+
+import pytest
+
+from index_manager import IndexManager, IndexVersion
+
+
+class FakeStore:
+    def __init__(self):
+        self.deleted = False
+
+    def delete_collection(self):
+        self.deleted = True
+
+
+def make_version(manager, version_id=None):
+    new_id, path = manager.new_version_path()
+    os.makedirs(path)
+    return IndexVersion(version_id or new_id, path, FakeStore(), chunk_count=3)
+
+
+def test_swap_keeps_replaced_versions_for_rollback(tmp_path):
+    manager = IndexManager(str(tmp_path), keep_versions=1)
+    first, second, third = (make_version(manager) for _ in range(3))
+
+    manager.swap(first)
+    manager.swap(second)
+    assert manager.active is second and manager.standby == [first]
+
+    manager.swap(third)
+    assert manager.standby == [second]
+    # Pushed out of standby with nothing in flight: deleted right away
+    assert first.retiring and first.vectorstore is None and not os.path.isdir(first.path)
+
+
+def test_retired_version_is_deleted_once_its_queries_drain(tmp_path):
+    manager = IndexManager(str(tmp_path), keep_versions=0)
+    old, new = make_version(manager), make_version(manager)
+    store = old.vectorstore
+    manager.swap(old)
+
+    with manager.acquire() as pinned:
+        assert pinned is old
+        manager.swap(new)
+        assert old.retiring and os.path.isdir(old.path)
+        with manager.acquire() as current:
+            assert current is new
+
+    assert store.deleted and not os.path.isdir(old.path)
+
+
+def test_rollback_swaps_back_to_standby(tmp_path):
+    manager = IndexManager(str(tmp_path), keep_versions=2)
+    first, second = make_version(manager), make_version(manager)
+    manager.swap(first)
+    manager.swap(second)
+
+    assert manager.rollback() is first
+    assert manager.active is first and manager.standby == [second]
+    assert manager.rollback(second.version_id) is second
+
+    with pytest.raises(ValueError):
+        manager.rollback("v-missing")
+
+
+def test_failed_build_keeps_the_active_version(tmp_path):
+    manager = IndexManager(str(tmp_path))
+    active = make_version(manager)
+    manager.swap(active)
+    built = []
+
+    def build(version_id, path):
+        os.makedirs(path)
+        built.append(IndexVersion(version_id, path, FakeStore()))
+        return built[-1]
+
+    def validate(version):
+        raise ValueError("empty index")
+
+    with pytest.raises(ValueError):
+        manager.build(build, validate)
+    assert manager.active is active
+    assert manager.build_status["state"] == "failed"
+    assert not os.path.isdir(built[0].path)
+
+
+def test_close_keeps_the_active_version_for_reopen(tmp_path):
+    manager = IndexManager(str(tmp_path))
+    old, active = make_version(manager), make_version(manager)
+    manager.swap(old)
+    manager.swap(active)
+
+    manager.close(keep_active=True, metadata={"fingerprint": "abc"})
+    assert manager.active is None and not os.path.isdir(old.path)
+    assert os.path.isdir(active.path)
+
+    def open_version(version_id, path, manifest):
+        assert manifest["fingerprint"] == "abc"
+        return IndexVersion(version_id, path, FakeStore())
+
+    # A closed manager stays closed; the next load of the corpus reopens with a new one
+    reloaded = IndexManager(str(tmp_path))
+    reopened = reloaded.reopen(open_version)
+    assert reopened.version_id == active.version_id and reloaded.active is reopened
+    assert reloaded.reopen(open_version) is None
+
+
+def test_build_reports_to_on_built(tmp_path):
+    built = []
+    manager = IndexManager(str(tmp_path), on_built=built.append)
+
+    def build(version_id, path):
+        os.makedirs(path)
+        return IndexVersion(version_id, path, FakeStore())
+
+    version = manager.build(build, lambda version: None)
+    assert manager.active is version and built == [version]
+
+
+def test_build_finishing_after_close_is_discarded(tmp_path):
+    built = []
+    manager = IndexManager(str(tmp_path), on_built=built.append)
+    versions = []
+
+    def build(version_id, path):
+        os.makedirs(path)
+        versions.append(IndexVersion(version_id, path, FakeStore()))
+        # The corpus is evicted while the embeddings are computed
+        manager.close(keep_active=True)
+        return versions[-1]
+
+    with pytest.raises(RuntimeError):
+        manager.build(build, lambda version: None)
+    assert manager.active is None and not built
+    assert versions[0].vectorstore is None and not os.path.isdir(versions[0].path)
+    assert manager.build_status["state"] == "cancelled"
+
+    with pytest.raises(RuntimeError):
+        manager.build(build, lambda version: None)
+    assert len(versions) == 1
@@ -0,0 +1,52 @@
+import pytest
+
+from intent_parser import (INTENT_COMPANY, INTENT_COMPANY_TENURE, INTENT_CURRENT_COMPANY, INTENT_LOCATION,
+                           INTENT_SCHOOL, INTENT_SKILL, INTENT_SKILL_TENURE, INTENT_TOTAL_TENURE, parse_intent)
+
+
+@pytest.mark.parametrize("question, kind, argument", [
+    ("Who works at Infosys?", INTENT_COMPANY, "Infosys"),
+    ("people who worked for the Reserve Bank of India", INTENT_COMPANY, "Reserve Bank of India"),
+    ("Who studied at IIT Madras", INTENT_SCHOOL, "IIT Madras"),
+    ("alumni of PES University", INTENT_SCHOOL, "PES University"),
+    ("who knows Python?", INTENT_SKILL, "Python"),
+    ("who has experience with machine learning", INTENT_SKILL, "machine learning"),
+    ("list people in Bengaluru", INTENT_LOCATION, "Bengaluru"),
+    ("who is currently working at TCS", INTENT_CURRENT_COMPANY, "TCS"),
+    ("people working at Wipro right now", INTENT_CURRENT_COMPANY, "Wipro"),
+])
+def test_lookups(question, kind, argument):
+    intent = parse_intent(question)
+    assert (intent.kind, intent.argument, intent.count_only) == (kind, argument, False)
+
+
+def test_how_many_asks_for_the_count_only():
+    intent = parse_intent("How many people know  React ?")
+    assert (intent.kind, intent.argument, intent.count_only) == (INTENT_SKILL, "React", True)
+
+
+@pytest.mark.parametrize("question, kind, argument, bounds, quantity", [
+    ("who has more than 2 years of ML experience", INTENT_SKILL_TENURE, "ML", (25, None), "more than 2 years"),
+    ("people with at least 18 months of experience in python", INTENT_SKILL_TENURE, "python", (18, None),
+     "at least 18 months"),
+    ("who worked at Infosys for at least one year", INTENT_COMPANY_TENURE, "Infosys", (12, None), "at least one year"),
+    ("people with over 5 years of experience", INTENT_TOTAL_TENURE, "", (61, None), "over 5 years"),
+    ("who has less than 1 year of experience", INTENT_TOTAL_TENURE, "", (None, 11), "less than 1 year"),
+    ("who has 3+ yrs of java experience", INTENT_SKILL_TENURE, "java", (36, None), "3+ yrs"),
+])
+def test_tenure_questions(question, kind, argument, bounds, quantity):
+    intent = parse_intent(question)
+    assert (intent.kind, intent.argument) == (kind, argument)
+    assert (intent.min_months, intent.max_months) == bounds
+    assert intent.quantity == quantity
+
+
+@pytest.mark.parametrize("question", [
+    "Compare the Python developers",
+    "Why do people leave Infosys?",
+    "who knows the best frameworks",
+    "Summarise the candidates",
+    "",
+])
+def test_open_ended_questions_are_left_to_the_llm(question):
+    assert parse_intent(question) is None
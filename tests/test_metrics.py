@@ -0,0 +1,58 @@
+from metrics import STAGE_SECONDS, MetricsRegistry, cache_hit_ratios, record_cache, stage_timer
+
+
+def test_counter_renders_one_line_per_label_set():
+    registry = MetricsRegistry()
+    jobs = registry.counter("jobs_total", "Jobs", ("outcome",))
+    jobs.inc(outcome="ok")
+    jobs.inc(2, outcome="ok")
+    jobs.inc(outcome="failed")
+    text = registry.render()
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{outcome="ok"} 3' in text
+    assert 'jobs_total{outcome="failed"} 1' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_count 3" in lines
+    assert latency.snapshot() == (5.55, 3)
+
+
+def test_gauge_callback_is_read_at_render_time():
+    registry = MetricsRegistry()
+    values = {("profiles",): 1}
+    registry.gauge("index_size", "Index size", ("kind",), callback=lambda: values)
+    values[("profiles",)] = 7
+    assert 'index_size{kind="profiles"} 7' in registry.render()
+
+
+def test_registering_a_name_twice_returns_the_existing_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("a_total", "A") is registry.counter("a_total", "A")
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("q_total", "Q", ("text",)).inc(text='say "hi"\n')
+    assert 'q_total{text="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_stage_timer_records_the_stage():
+    before = STAGE_SECONDS.snapshot(stage="test_stage")[1]
+    with stage_timer("test_stage"):
+        pass
+    assert STAGE_SECONDS.snapshot(stage="test_stage")[1] == before + 1
+
+
+def test_cache_hit_ratio():
+    for hit in (True, True, True, False):
+        record_cache("test_cache", hit)
+    assert cache_hit_ratios()[("test_cache",)] == 0.75
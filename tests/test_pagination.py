@@ -0,0 +1,59 @@
+import pytest
+
+from pagination import DEFAULT_LIMIT, MAX_LIMIT, ProfileOrder, decode_cursor, encode_cursor, parse_limit
+
+
+class Record:
+    def __init__(self, name, profile_id):
+        self.name = name
+        self.profile_id = profile_id
+
+
+def make_order(count=10):
+    return ProfileOrder([Record(f"Person {index % 4}", f"{index:04d}") for index in range(count)])
+
+
+def test_pages_cover_every_profile_once_in_a_stable_order():
+    order = make_order()
+    seen, after = [], None
+    while True:
+        page, after = order.page(after, limit=3)
+        seen.extend(record.profile_id for record in page)
+        if after is None:
+            break
+    assert len(seen) == len(set(seen)) == 10
+    assert seen == [profile_id for _, profile_id in order.keys]
+
+
+def test_filtered_pages_only_contain_rows_in_the_bitset():
+    order = make_order()
+    within = sum(1 << row for row in (1, 4, 7))
+    page, after = order.page(limit=2, within=within)
+    rest, end = order.page(after, limit=2, within=within)
+    assert {record.profile_id for record in page + rest} == {"0001", "0004", "0007"}
+    assert end is None
+
+
+def test_page_rejects_a_non_positive_limit():
+    with pytest.raises(ValueError):
+        make_order().page(limit=0)
+
+
+def test_parse_limit():
+    assert parse_limit(None) == parse_limit("") == DEFAULT_LIMIT
+    assert parse_limit("25") == 25 and parse_limit(str(MAX_LIMIT)) == MAX_LIMIT
+
+
+@pytest.mark.parametrize("value", ["0", "-3", str(MAX_LIMIT + 1), "ten", "2.5"])
+def test_parse_limit_rejects_values_out_of_range_or_not_integers(value):
+    with pytest.raises(ValueError, match=f"limit must be between 1 and {MAX_LIMIT}"):
+        parse_limit(value)
+
+
+def test_cursor_round_trips_and_is_tied_to_its_listing():
+    cursor = encode_cursor(("person 1", "0005"), "skills=python")
+    assert decode_cursor(cursor, "skills=python") == ("person 1", "0005")
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "skills=java")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,48 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from profile_similarity import ProfileCentroids  # noqa: E402
+
+
+def make_centroids():
+    return ProfileCentroids.from_chunks([
+        (["a", "a", "b"], [[1, 0, 0], [0.8, 0.2, 0], [0, 1, 0]]),
+        (["c"], [[0.9, 0.1, 0]]),
+    ])
+
+
+def test_similar_ranks_by_cosine_and_excludes_the_profile_itself():
+    centroids = make_centroids()
+    assert len(centroids) == 3
+    assert [pid for pid, _ in centroids.similar("a", k=2)] == ["c", "b"]
+    assert centroids.similar("a", k=10)[0][1] == pytest.approx(1.0, abs=0.02)
+    with pytest.raises(KeyError):
+        centroids.similar("missing")
+
+
+def test_upsert_updates_in_place_and_grows_past_capacity():
+    centroids = ProfileCentroids(3, capacity=1)
+    centroids.upsert("a", [[1, 0, 0]])
+    centroids.upsert("b", [[0, 1, 0]])
+    assert centroids.matrix.shape[0] >= 2 and centroids.ids == ["a", "b"]
+
+    centroids.upsert("a", [[0, 1, 0], [0, 2, 0]])
+    assert centroids.ids == ["a", "b"]
+    assert centroids.similar("b", k=1)[0] == ("a", pytest.approx(1.0))
+    np.testing.assert_allclose(np.linalg.norm(centroids.matrix[:2], axis=1), 1.0, rtol=1e-6)
+
+
+def test_remove_moves_the_last_row_into_the_gap():
+    centroids = make_centroids()
+    c_row = centroids.matrix[centroids.ids.index("c")].copy()
+
+    centroids.remove("a")
+    assert centroids.ids == ["c", "b"] and "a" not in centroids
+    np.testing.assert_array_equal(centroids.matrix[0], c_row)
+    assert not centroids.matrix[2].any()
+    assert [pid for pid, _ in centroids.similar_to_vector([1, 0, 0], k=5)] == ["c", "b"]
+
+    centroids.remove("a")
+    centroids.upsert("b", [])
+    assert centroids.ids == ["c"] and centroids.similar("c") == []
@@ -0,0 +1,82 @@
+import json
+
+from profile_store import ProfileRecord, ProfileStore, ProfileTextCache
+
+PROFILE = {
+    "name": "Asha Rao",
+    "about": "Backend engineer",
+    "linkedin_url": "https://www.linkedin.com/in/asha-rao",
+    "experiences": [{
+        "institution_name": "Infosys · Full-time", "linkedin_url": None, "from_date": "Jan 2020",
+        "to_date": "Present", "description": "Python services", "position_title": "Engineer",
+        "duration": "4 yrs", "location": "Bengaluru, Karnataka, India", "website": None, "industry": "IT",
+        "type": None, "headquarters": None, "company_size": None, "founded": None,
+    }],
+    "education": [{
+        "institution_name": "PES University", "linkedin_url": None, "from_date": "2015", "to_date": "2019",
+        "description": None, "degree": "BE", "website": None, "industry": None, "type": None,
+        "headquarters": None, "company_size": None, "founded": None,
+    }],
+}
+
+
+def test_to_dict_round_trips_the_scraper_schema():
+    record = ProfileRecord(PROFILE)
+    assert record.to_dict() == PROFILE
+    assert ProfileRecord(record.to_dict()).content_hash == record.content_hash
+
+
+def test_compact_to_dict_drops_nulls_but_keeps_the_content_hash():
+    record = ProfileRecord(PROFILE)
+    compact = record.to_dict(compact=True)
+    assert "founded" not in compact["experiences"][0]
+    assert compact["experiences"][0]["industry"] == "IT"
+    assert ProfileRecord(compact).content_hash == record.content_hash
+
+
+def test_derived_experience_fields():
+    experience = ProfileRecord(PROFILE).experiences[0]
+    assert experience.organization == "Infosys"
+    assert experience.employment_type == "Full-time"
+    assert experience.is_current and experience.duration_months == 48
+
+
+def test_scraped_at_is_metadata_not_content():
+    record = ProfileRecord({**PROFILE, "scraped_at": 123.0})
+    assert record.to_dict()["scraped_at"] == 123.0
+    assert record.content_hash == ProfileRecord(PROFILE).content_hash
+
+
+def test_url_variants_of_one_profile_are_stored_once(tmp_path):
+    variant = {**PROFILE, "about": "Updated", "linkedin_url": "https://in.linkedin.com/in/Asha-Rao/"}
+    other = {**PROFILE, "name": "Ravi K", "linkedin_url": "https://www.linkedin.com/in/ravi-k"}
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps([PROFILE, other, variant]), encoding="utf-8")
+
+    store = ProfileStore(str(path))
+    records = store.load()
+    assert [record.name for record in records] == ["Asha Rao", "Ravi K"]
+    assert records[0].about == "Updated"
+    assert store.get(records[0].profile_id) is records[0]
+
+    store.save()
+    assert len(json.loads(path.read_text(encoding="utf-8"))) == 2
+
+
+def test_text_cache_renders_once_per_content_hash():
+    renders = []
+
+    def render(record):
+        renders.append(record.profile_id)
+        return f"{record.name} | Python"
+
+    cache = ProfileTextCache()
+    record = ProfileRecord(PROFILE)
+    assert cache.get(record, render) == "Asha Rao | Python"
+    assert cache.get_lower(record, render) == "asha rao | python"
+    assert cache.get(record, render) == "Asha Rao | Python"
+    assert len(renders) == 1 and (cache.hits, cache.misses) == (2, 1)
+
+    edited = ProfileRecord({**PROFILE, "name": "Asha R"})
+    assert cache.get_lower(edited, render) == "asha r | python"
+    assert len(renders) == 2 and len(cache) == 1
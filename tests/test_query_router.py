@@ -0,0 +1,59 @@
+from intent_parser import INTENT_COMPANY, parse_intent
+from query_router import ROUTE_INDEX, ROUTE_INTENT, ROUTE_LARGE, ROUTE_SMALL, QueryRouter
+from skill_matrix import SKILL_VOCABULARY
+
+
+def extract_skills(question):
+    question = question.lower()
+    return [skill for skill in SKILL_VOCABULARY if skill in question]
+
+
+def make_router(large_model_available=True, **kwargs):
+    return QueryRouter(extract_skills, large_model_available=large_model_available, **kwargs)
+
+
+def test_simple_skill_lookups_go_to_the_index():
+    router = make_router()
+    assert router.classify("Who knows Python?") == ROUTE_INDEX
+    assert router.classify("people with docker and kubernetes") == ROUTE_INDEX
+
+
+def test_skill_lookups_need_a_whole_word_skill():
+    # "ai" is a substring of "maintain", but not a skill mentioned here
+    assert make_router().classify("who has to maintain the website") == ROUTE_SMALL
+
+
+def test_lookups_with_conditions_are_not_index_answerable():
+    assert make_router().classify("who has python but not java") == ROUTE_SMALL
+    assert make_router().classify("who has at least 3 years of python") == ROUTE_SMALL
+
+
+def test_complex_questions_go_to_the_large_model_when_there_is_one():
+    question = "Compare the backend experience of the candidates"
+    assert make_router().classify(question) == ROUTE_LARGE
+    assert make_router(large_model_available=False).classify(question) == ROUTE_SMALL
+    long_question = " ".join(["word"] * 30)
+    assert make_router().classify(long_question) == ROUTE_LARGE
+
+
+def test_ordinary_questions_go_to_the_small_model():
+    assert make_router().classify("Tell me about the profiles") == ROUTE_SMALL
+
+
+def test_intents_are_routed_first_and_returned_with_the_route():
+    router = make_router(parse_intent=parse_intent)
+    route, intent = router.classify_with_intent("Who works at Infosys?")
+    assert route == ROUTE_INTENT
+    assert intent.kind == INTENT_COMPANY and intent.argument == "Infosys"
+    assert router.classify("Who works at Infosys?", intents=False) != ROUTE_INTENT
+    assert router.classify_with_intent("Explain the best candidate for ML") == (ROUTE_LARGE, None)
+
+
+def test_latencies_are_recorded_per_route():
+    router = make_router()
+    router.record(ROUTE_SMALL, 0.5)
+    router.record(ROUTE_SMALL, 1.5)
+    stats = router.stats()
+    assert stats[ROUTE_SMALL]["count"] == 2
+    assert stats[ROUTE_SMALL]["avg_seconds"] == 1.0
+    assert stats[ROUTE_LARGE]["p50_seconds"] is None
@@ -0,0 +1,53 @@
+import threading
+import time
+
+from circuit_breaker import CircuitBreaker
+from request_profiler import SamplingProfiler, Trace, TraceStore, follow
+
+
+def llm_generation(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+    return "answer"
+
+
+def test_work_on_the_breaker_executor_is_sampled():
+    breaker = CircuitBreaker("test", call_timeout=5.0)
+    profiler = SamplingProfiler(interval=0.002).start()
+    try:
+        assert breaker.call(follow(llm_generation), 0.2) == "answer"
+    finally:
+        trace = profiler.stop("query")
+
+    generation_lines = [line for line in trace.to_collapsed().splitlines() if "llm_generation" in line]
+    assert generation_lines
+    # Grafted below the request's own stack, without the executor's thread frames
+    assert all("test_work_on_the_breaker_executor_is_sampled" in line for line in generation_lines)
+    assert not any("_bootstrap" in line.split("llm_generation")[0] for line in generation_lines)
+
+
+def test_follow_is_a_no_op_without_an_active_profiler():
+    assert follow(llm_generation) is llm_generation
+
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("fn", follow(llm_generation)))
+    profiler = SamplingProfiler().start()
+    try:
+        # The profiler belongs to this thread's context, not to other threads
+        thread.start()
+        thread.join()
+    finally:
+        profiler.stop("query")
+    assert result["fn"] is llm_generation
+    assert follow(llm_generation) is llm_generation
+
+
+def test_trace_store_keeps_the_newest_traces(tmp_path):
+    store = TraceStore(str(tmp_path), max_traces=2)
+    for index in range(3):
+        store.save(Trace(f"t{index}", "query", float(index), [{"name": "f"}], [[0]], [1.0]))
+        time.sleep(0.01)
+    assert [summary["id"] for summary in store.list()] == ["t2", "t1"]
+    assert store.load("t0") is None and store.load("../t1") is None
+    assert store.load("t2").to_collapsed() == "f 1\n"
@@ -0,0 +1,66 @@
+import gzip
+import json
+
+import pytest
+
+from response_encoding import compress_body, dumps_bytes, negotiate_encoding, parse_fields, project
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("*", "br"),
+    ("*;q=0.1, br;q=0", "gzip"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("gzip;q=abc", None),
+    ("", None),
+    (None, None),
+])
+def test_negotiate_encoding(accept, expected):
+    assert negotiate_encoding(accept, available=("br", "gzip")) == expected
+
+
+def test_brotli_is_only_offered_when_available():
+    assert negotiate_encoding("br", available=("gzip",)) is None
+
+
+def test_gzip_round_trip():
+    data = b'{"profiles": []}' * 100
+    assert gzip.decompress(compress_body(data, "gzip")) == data
+    with pytest.raises(ValueError):
+        compress_body(data, "deflate")
+
+
+def test_parse_fields():
+    assert parse_fields(" name, linkedin_url ,") == {"name", "linkedin_url"}
+    assert parse_fields("") is None and parse_fields(" , ") is None
+
+
+def test_project_trims_list_items_and_keeps_top_level_keys():
+    payload = {
+        "success": True,
+        "next_cursor": "abc",
+        "profiles": [{"name": "Asha", "linkedin_url": "u1", "about": "long", "people": [{"name": "x", "id": 1}]}],
+        "facets": {"companies": [{"name": "Acme", "count": 3}]},
+    }
+    assert project(payload, {"name", "people"}) == {
+        "success": True,
+        "next_cursor": "abc",
+        "profiles": [{"name": "Asha", "people": [{"name": "x"}]}],
+        "facets": {"companies": [{"name": "Acme"}]},
+    }
+    assert project([{"name": "a", "b": 1}, "text"], {"name"}) == [{"name": "a"}, "text"]
+
+
+def test_dumps_bytes_is_compact_utf8_json():
+    data = dumps_bytes({"name": "Zoë", "n": 1})
+    assert json.loads(data.decode("utf-8")) == {"name": "Zoë", "n": 1}
+    assert b" " not in data
+
+    class Point:
+        pass
+
+    assert json.loads(dumps_bytes({"p": Point()}, default=lambda obj: "point")) == {"p": "point"}
@@ -0,0 +1,58 @@
+import pytest
+
+from skill_matrix import SkillMatrix
+
+TEXTS = {
+    "p0": "python developer on aws",
+    "p1": "react and node.js frontend",
+    "p2": "machine learning with python and java",
+    "p3": "javascript, angular and aws",
+}
+
+
+class Record:
+    def __init__(self, profile_id):
+        self.profile_id = profile_id
+        self.experiences = []
+        self.education = []
+
+
+def make_matrix():
+    return SkillMatrix.build([Record(pid) for pid in TEXTS], lambda record: TEXTS[record.profile_id])
+
+
+def members(matrix, expression):
+    return matrix.members(matrix.query(expression))
+
+
+def test_skills_match_whole_words_only():
+    matrix = make_matrix()
+    assert matrix.skills_in("javascript") == {"javascript"}
+    assert members(matrix, "java") == ["p2"]
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("python AND aws", ["p0"]),
+    ("python and not aws", ["p2"]),
+    ("(react OR angular) AND NOT \"node.js\"", ["p3"]),
+    ("machine learning & !java", []),
+    ("python | react", ["p0", "p1", "p2"]),
+    ("NOT NOT aws", ["p0", "p3"]),
+    ("aws OR react AND node.js", ["p0", "p1", "p3"]),
+])
+def test_boolean_expressions(expression, expected):
+    assert members(make_matrix(), expression) == expected
+
+
+@pytest.mark.parametrize("expression", ["", "python AND", "(python", "python )", "AND aws", "cobol"])
+def test_invalid_expressions_raise_value_error(expression):
+    with pytest.raises(ValueError):
+        make_matrix().query(expression)
+
+
+def test_counts_and_co_occurrence():
+    matrix = make_matrix()
+    assert matrix.count(matrix.query("python OR aws")) == 3
+    assert matrix.skill_counts()["python"] == 2
+    assert matrix.skill_counts(within=matrix.query("aws"))["python"] == 1
+    assert ("python", "aws", 1) in matrix.co_occurrence(["python", "aws", "java"])
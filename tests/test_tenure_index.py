@@ -0,0 +1,53 @@
+from profile_store import ProfileRecord
+from skill_matrix import SkillMatrix, canonical_skill
+from tenure_index import SCOPE_COMPANY, SCOPE_SKILL, SCOPE_TOTAL, TenureIndex, format_months, parse_duration
+
+NOW = 2024 * 12 + 11  # Dec 2024
+
+
+def experience(organization, title, start, end, description=""):
+    return {"institution_name": organization, "position_title": title, "from_date": start, "to_date": end,
+            "description": description, "duration": None, "location": None}
+
+
+def record(name, *experiences):
+    return ProfileRecord({"name": name, "linkedin_url": f"https://www.linkedin.com/in/{name}",
+                          "experiences": list(experiences), "education": []})
+
+
+RECORDS = [
+    record("asha",
+           experience("Acme", "ML Engineer", "Jan 2020", "Dec 2021"),
+           experience("Globex", "Machine Learning Lead", "Jan 2022", "Present")),
+    record("ravi",
+           experience("Acme", "Java Developer", "Jan 2023", "Dec 2023"),
+           experience("Initech", "AI intern", "Jun 2023", "Nov 2023", "overlaps the Acme role")),
+]
+
+
+def build():
+    return TenureIndex.build(RECORDS, lambda organization: organization and organization.lower(),
+                             SkillMatrix().skills_in, now_month=NOW)
+
+
+def test_synonyms_count_towards_one_skill():
+    index = build()
+    asha = RECORDS[0].profile_id
+    assert index.months(SCOPE_SKILL, canonical_skill("ML")) == [(asha, 60)]
+    assert index.months(SCOPE_SKILL, "ml") == []
+    assert index.months(SCOPE_SKILL, canonical_skill("AI")) == [(RECORDS[1].profile_id, 6)]
+
+
+def test_overlapping_roles_count_once_and_bounds_are_inclusive():
+    index = build()
+    asha, ravi = RECORDS[0].profile_id, RECORDS[1].profile_id
+    assert index.months(SCOPE_TOTAL) == [(asha, 60), (ravi, 12)]
+    assert index.months(SCOPE_TOTAL, min_months=12, max_months=12) == [(ravi, 12)]
+    assert index.months(SCOPE_COMPANY, "acme", min_months=25) == []
+    assert index.current_at("globex") == {asha}
+
+
+def test_duration_parsing_and_formatting():
+    assert parse_duration("1 yr 4 mos") == 16
+    assert format_months(16) == "1 yr 4 mos"
+    assert format_months(1) == "1 mo" and format_months(24) == "2 yrs"
@@ -0,0 +1,23 @@
+from profile_store import make_profile_id
+from url_index import canonicalize_linkedin_url
+
+
+def test_variants_of_a_profile_url_share_one_canonical_form():
+    canonical = "https://www.linkedin.com/in/john-smith"
+    for url in ("https://in.linkedin.com/in/John-Smith/",
+                "linkedin.com/in/john-smith?trk=public_profile",
+                "https://www.linkedin.com/in/john-smith/details/experience/"):
+        assert canonicalize_linkedin_url(url) == canonical
+
+
+def test_legacy_pub_urls_keep_their_member_id():
+    first = canonicalize_linkedin_url("https://www.linkedin.com/pub/john-smith/12/345/678")
+    second = canonicalize_linkedin_url("https://www.linkedin.com/pub/john-smith/98/765/432")
+    assert first == "https://www.linkedin.com/pub/john-smith/12/345/678"
+    assert second == "https://www.linkedin.com/pub/john-smith/98/765/432"
+    assert make_profile_id(first) != make_profile_id(second)
+
+
+def test_legacy_pub_urls_drop_sub_pages():
+    url = "https://uk.linkedin.com/pub/john-smith/12/345/678/recent-activity/"
+    assert canonicalize_linkedin_url(url) == "https://www.linkedin.com/pub/john-smith/12/345/678"
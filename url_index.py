@@ -0,0 +1,133 @@
+"""
+LinkedIn URL canonicalization and dedupe index
+==============================================
+
+The same profile shows up under many URLs: with or without a trailing slash,
+with tracking query strings, on locale subdomains (``in.linkedin.com``),
+in different letter case, or pointing at a sub-page such as
+``/details/experience``. ``canonicalize_linkedin_url`` maps all of them to
+one form, and ``CanonicalUrlIndex`` remembers which canonical URLs are
+already in the store (and when they were scraped) so they can be skipped
+before a scrape is scheduled. The index is persisted next to the profiles
+JSON file.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import unquote, urlsplit
+
+CANONICAL_HOST = "www.linkedin.com"
+
+# Path prefixes whose second segment identifies the entity
+ENTITY_PREFIXES = ("in", "company", "school", "pub")
+
+# Legacy public-profile URLs (/pub/john-smith/12/345/678) carry the member ID
+# in up to three short hex segments after the name
+PUB_ID_SEGMENT = re.compile(r"^[0-9a-f]{1,3}$")
+
+
+def canonicalize_linkedin_url(url: str) -> str:
+    """Return the canonical form of a LinkedIn URL (unchanged if it is not a LinkedIn URL)"""
+    if not url:
+        return ""
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if not (host == "linkedin.com" or host.endswith(".linkedin.com")):
+        return url.rstrip("/")
+
+    segments = [segment for segment in unquote(parts.path).lower().split("/") if segment]
+    if len(segments) >= 2 and segments[0] in ENTITY_PREFIXES:
+        # Drop sub-pages like /details/experience or /recent-activity
+        ids = []
+        if segments[0] == "pub":
+            for segment in segments[2:5]:
+                if not PUB_ID_SEGMENT.match(segment):
+                    break
+                ids.append(segment)
+        segments = segments[:2] + ids
+    return f"https://{CANONICAL_HOST}/" + "/".join(segments)
+
+
+class CanonicalUrlIndex:
+    def __init__(self, path: str):
+        """Canonical URL -> {profile_id, scraped_at}, persisted as JSON at ``path``"""
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def path_for(json_file_path: str) -> str:
+        """Where the index for a profiles file lives"""
+        base, _ = os.path.splitext(json_file_path)
+        return base + ".url_index.json"
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                with self._lock:
+                    self._entries = entries
+            except Exception as e:
+                print(f"⚠️ Could not read URL index {self.path}: {e}")
+
+    def save(self):
+        with self._lock:
+            entries = dict(self._entries)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def sync(self, records: Iterable):
+        """Make the index match the profiles in the store, keeping known scrape times"""
+        with self._lock:
+            entries = {}
+            for record in records:
+                canonical = canonicalize_linkedin_url(record.linkedin_url or "")
+                if not canonical:
+                    continue
+                previous = self._entries.get(canonical, {})
+                entries[canonical] = {
+                    "profile_id": record.profile_id,
+                    "scraped_at": getattr(record, "scraped_at", None) or previous.get("scraped_at"),
+                }
+            self._entries = entries
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get(canonicalize_linkedin_url(url))
+
+    def add(self, url: str, profile_id: str, scraped_at: Optional[float] = None):
+        with self._lock:
+            self._entries[canonicalize_linkedin_url(url)] = {
+                "profile_id": profile_id,
+                "scraped_at": scraped_at if scraped_at is not None else time.time(),
+            }
+
+    def needs_scrape(self, url: str, max_age_seconds: Optional[float]) -> bool:
+        """True if the URL is unknown, or known but scraped longer than ``max_age_seconds`` ago.
+
+        Profiles without a recorded scrape time count as fresh.
+        """
+        entry = self.lookup(url)
+        if entry is None:
+            return True
+        scraped_at = entry.get("scraped_at")
+        if max_age_seconds is None or scraped_at is None:
+            return False
+        return time.time() - scraped_at > max_age_seconds
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return self.lookup(url) is not None